@@ -0,0 +1,64 @@
+"""
+Benchmarks of drawing workflows from an asyncio event loop: time to the first
+SVG chunk compared with the whole document, and longest event loop stall.
+
+Run with ``pytest benchmarks -s`` from the repository root.
+"""
+
+import asyncio
+import time
+
+import pytest
+from bench_workflow import make_workflow_dict
+
+from ewoksdraw.async_render import AsyncRenderer
+
+
+async def _measure_stalls(done: asyncio.Event) -> float:
+    """
+    Returns the longest time the event loop did not run this coroutine.
+    """
+    longest = 0.0
+    last = time.perf_counter()
+    while not done.is_set():
+        await asyncio.sleep(0.001)
+        now = time.perf_counter()
+        longest = max(longest, now - last - 0.001)
+        last = now
+    return longest
+
+
+@pytest.mark.parametrize("nb_nodes", [1000, 5000])
+def bench_stream_svg(nb_nodes):
+    workflow = make_workflow_dict(nb_nodes, window=10)
+
+    async def stream():
+        renderer = AsyncRenderer()
+        done = asyncio.Event()
+        stalls = asyncio.create_task(_measure_stalls(done))
+        start = time.perf_counter()
+        canvas = await renderer.render_workflow(workflow)
+        rendered = time.perf_counter()
+        first_chunk = None
+        size = 0
+        async for chunk in renderer.iter_svg(canvas, minify=True):
+            if first_chunk is None:
+                first_chunk = time.perf_counter()
+            size += len(chunk)
+        end = time.perf_counter()
+        done.set()
+        return (
+            rendered - start,
+            first_chunk - rendered,
+            end - rendered,
+            size,
+            (await stalls),
+        )
+
+    render_time, first_chunk, serialize_time, size, stall = asyncio.run(stream())
+    print(
+        f"\n{nb_nodes} nodes: render {render_time * 1000:.0f} ms, first chunk "
+        f"after {first_chunk * 1000:.1f} ms, whole document ({size / 1024:.0f} KiB) "
+        f"after {serialize_time * 1000:.0f} ms, longest event loop stall "
+        f"{stall * 1000:.1f} ms"
+    )
@@ -0,0 +1,34 @@
+"""
+Benchmarks of the batch rendering against the number of worker processes.
+
+Run with ``pytest benchmarks -s`` from the repository root.
+"""
+
+import json
+import os
+import time
+
+import pytest
+from bench_workflow import make_workflow_dict
+
+from ewoksdraw.batch import render_batch
+
+
+@pytest.mark.parametrize("jobs", sorted({1, 4, os.cpu_count() or 1}))
+def bench_render_batch(tmp_path, jobs):
+    nb_files = 200
+    sources = []
+    for i in range(nb_files):
+        source = tmp_path / f"workflow{i}.json"
+        source.write_text(json.dumps(make_workflow_dict(20, seed=i, window=5)))
+        sources.append(source)
+
+    start = time.perf_counter()
+    results = list(render_batch(sources, tmp_path / "out", jobs=jobs))
+    elapsed = time.perf_counter() - start
+
+    assert all(result.ok for result in results)
+    print(
+        f"\n{nb_files} workflows with {jobs} jobs: {elapsed:.3f}s "
+        f"({elapsed / nb_files * 1e3:.1f} ms/workflow)"
+    )
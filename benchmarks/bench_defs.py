@@ -0,0 +1,43 @@
+"""
+Benchmarks of the size of SVG documents sharing their repeated shapes in <defs>.
+
+Run with ``pytest benchmarks -s`` from the repository root.
+"""
+
+import io
+import time
+
+import pytest
+from bench_workflow import make_workflow_dict
+from workload import make_canvas
+
+from ewoksdraw.render import render_workflow
+from ewoksdraw.svg import SvgCanvas
+
+
+def _report_sizes(name: str, canvas: SvgCanvas) -> None:
+    sizes = {}
+    for use_defs in (False, True):
+        stream = io.StringIO()
+        start = time.perf_counter()
+        canvas.write(stream, indent=None, use_defs=use_defs)
+        elapsed = time.perf_counter() - start
+        sizes[use_defs] = len(stream.getvalue().encode())
+        print(
+            f"\n{name}, use_defs={use_defs}: {sizes[use_defs] / 1024:.0f} KiB "
+            f"in {elapsed * 1000:.0f} ms"
+        )
+    print(f"{name}: {100 * sizes[True] / sizes[False]:.0f}% of the size")
+
+
+@pytest.mark.parametrize("nb_nodes", [1000, 5000])
+def bench_defs_workflow(nb_nodes):
+    # Task titles are unique: only the anchors and task parts are shared
+    canvas = render_workflow(make_workflow_dict(nb_nodes, window=10))
+    _report_sizes(f"{nb_nodes} nodes workflow", canvas)
+
+
+@pytest.mark.parametrize("nb_signatures", [10, 100])
+def bench_defs_repeated_tasks(nb_signatures):
+    canvas = make_canvas(5000, nb_signatures=nb_signatures)
+    _report_sizes(f"5000 tasks of {nb_signatures} signatures", canvas)
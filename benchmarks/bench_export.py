@@ -0,0 +1,48 @@
+"""
+Benchmarks of the PDF and PNG export of large drawings.
+
+Run with ``pytest benchmarks -s`` from the repository root.
+"""
+
+import io
+import time
+import tracemalloc
+
+import pytest
+from bench_workflow import make_workflow_dict
+
+from ewoksdraw.render import render_workflow
+
+
+@pytest.mark.parametrize("nb_nodes", [1000, 5000])
+@pytest.mark.parametrize("output_format", ["pdf", "png"])
+def bench_export(nb_nodes, output_format):
+    if output_format == "png":
+        pytest.importorskip("PIL")
+    canvas = render_workflow(make_workflow_dict(nb_nodes, window=10))
+
+    def export() -> io.BytesIO:
+        stream = io.BytesIO()
+        if output_format == "pdf":
+            canvas.write_pdf(stream)
+        else:
+            # Thumbnail of at most 4000 pixels wide
+            canvas.write_png(stream, scale=min(1.0, 4000 / canvas.width))
+        return stream
+
+    start = time.perf_counter()
+    export()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    stream = export()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    size = len(stream.getvalue())
+    print(
+        f"\n{output_format} of {nb_nodes} tasks ({canvas.width}x{canvas.height}): "
+        f"{elapsed:.2f}s, {size / 2**20:.1f} MiB written, "
+        f"{(peak - size) / 2**20:.1f} MiB peak Python allocations besides the "
+        "output"
+    )
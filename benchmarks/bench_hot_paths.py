@@ -0,0 +1,126 @@
+"""
+Benchmarks of the text fitting, task construction and serialization hot paths,
+on deterministic workloads (see `workload`).
+
+Run with ``pytest benchmarks -s`` from the repository root.
+"""
+
+import random
+
+import pytest
+from workload import make_canvas, make_label, make_task_signatures, time_per_call
+
+from ewoksdraw.svg import SvgTask
+from ewoksdraw.svg.font_metrics import get_font_registry
+from ewoksdraw.svg.svg_canvas import pretty_print_xml
+from ewoksdraw.svg.svg_task_io import SvgTaskIOGroup
+from ewoksdraw.svg.svg_text import SvgText
+from ewoksdraw.svg.task_layout_cache import get_task_layout_cache
+
+LABEL_LENGTHS = [8, 32, 128]
+IO_COUNTS = [0, 4, 16]
+TASK_COUNTS = [10, 100, 1000]
+
+
+def _report(name: str, seconds: float) -> None:
+    print(f"\n{name}: {seconds * 1e6:.1f} us")
+
+
+@pytest.mark.parametrize("label_length", LABEL_LENGTHS)
+def bench_modify_text_to_fit_width(label_length):
+    label = make_label(label_length, random.Random(0))
+    text = SvgText(label, 0, 0, "task_title")
+
+    def fit():
+        text.text = label
+        text.set_font_size(9)
+        text.modify_text_to_fit_width(100, min_font_size=7)
+
+    _report(
+        f"SvgText.modify_text_to_fit_width, {label_length} chars",
+        time_per_call(fit, 1000),
+    )
+
+
+@pytest.mark.parametrize("label_length", LABEL_LENGTHS)
+@pytest.mark.parametrize("nb_io", IO_COUNTS[1:])
+def bench_decrease_size_to_fit_width(nb_io, label_length):
+    _, names, _ = make_task_signatures(1, nb_io, label_length)[0]
+    group = SvgTaskIOGroup(names, "input")
+
+    def fit():
+        group.reset()
+        group.decrease_size_to_fit_width(90)
+
+    _report(
+        f"SvgTaskIOGroup.decrease_size_to_fit_width, {nb_io} IO of "
+        f"{label_length} chars",
+        time_per_call(fit, 200),
+    )
+
+
+@pytest.mark.parametrize("label_length", LABEL_LENGTHS)
+@pytest.mark.parametrize("nb_io", IO_COUNTS)
+def bench_svg_task(nb_io, label_length):
+    signatures = make_task_signatures(100, nb_io, label_length)
+    cache = get_task_layout_cache()
+    index = 0
+
+    def create():
+        nonlocal index
+        # Measure the fitting, not the task layout cache
+        cache.clear()
+        SvgTask(*signatures[index % len(signatures)])
+        index += 1
+
+    _report(f"SvgTask, {nb_io} IO of {label_length} chars", time_per_call(create, 100))
+
+
+@pytest.mark.parametrize("nb_tasks", TASK_COUNTS)
+def bench_generate_xml_svg(nb_tasks):
+    canvas = make_canvas(nb_tasks)
+    _report(
+        f"SvgCanvas._generate_xml_svg, {nb_tasks} tasks",
+        time_per_call(canvas._generate_xml_svg, max(1, 1000 // nb_tasks)),
+    )
+
+
+@pytest.mark.parametrize("nb_tasks", TASK_COUNTS)
+def bench_pretty_print_xml(nb_tasks):
+    xml = make_canvas(nb_tasks).xml
+    _report(
+        f"pretty_print_xml, {nb_tasks} tasks",
+        time_per_call(lambda: pretty_print_xml(xml), max(1, 1000 // nb_tasks)),
+    )
+
+
+@pytest.mark.parametrize("nb_tasks", TASK_COUNTS)
+def bench_canvas_dict(nb_tasks):
+    canvas = make_canvas(nb_tasks)
+
+    def generate():
+        # Drop the cached representations to measure their generation
+        canvas._changed()
+        return canvas.dict
+
+    _report(
+        f"SvgCanvas.dict, {nb_tasks} tasks",
+        time_per_call(generate, max(1, 1000 // nb_tasks)),
+    )
+
+
+@pytest.mark.parametrize("label_length", LABEL_LENGTHS)
+def bench_measure_text(label_length):
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+
+    label = make_label(label_length, random.Random(0))
+    font = get_font_registry().get("Helvetica")
+
+    _report(
+        f"FontMetrics.text_units, {label_length} chars",
+        time_per_call(lambda: font.text_units(label), 10000),
+    )
+    _report(
+        f"reportlab stringWidth, {label_length} chars",
+        time_per_call(lambda: stringWidth(label, "Helvetica", 1000), 10000),
+    )
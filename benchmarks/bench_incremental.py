@@ -0,0 +1,39 @@
+"""
+Benchmarks of re-rendering a large drawing after editing one task.
+
+Run with ``pytest benchmarks -s`` from the repository root.
+"""
+
+import time
+from io import StringIO
+
+import pytest
+from bench_workflow import make_workflow_dict
+
+from ewoksdraw.render import build_svg_tasks
+from ewoksdraw.svg import SvgCanvas
+from ewoksdraw.workflow import load_workflow
+
+
+@pytest.mark.parametrize("incremental", [False, True], ids=["full", "incremental"])
+def bench_edit_one_task(incremental):
+    nb_nodes = 2000
+    tasks = build_svg_tasks(load_workflow(make_workflow_dict(nb_nodes)))
+    canvas = SvgCanvas(1000, 1000, incremental=incremental)
+    for i, task in enumerate(tasks.values()):
+        task.set_translation(x=(i % 50) * 250, y=(i // 50) * 120)
+        canvas.add_element(task)
+    canvas.write(StringIO())
+
+    task = next(iter(tasks.values()))
+    nb_edits = 20
+    start = time.perf_counter()
+    for i in range(nb_edits):
+        task.set_title(f"edited title {i}")
+        canvas.write(StringIO())
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"\n{nb_nodes} tasks, {'incremental' if incremental else 'full'}: "
+        f"{elapsed / nb_edits * 1e3:.1f} ms per edit and render"
+    )
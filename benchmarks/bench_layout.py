@@ -0,0 +1,33 @@
+"""
+Benchmarks of the layered layout against graph size.
+
+Run with ``pytest benchmarks -s`` from the repository root.
+"""
+
+import time
+
+import pytest
+from bench_workflow import make_workflow_dict
+
+from ewoksdraw.layout import LayeredLayout
+from ewoksdraw.render import build_svg_tasks
+from ewoksdraw.workflow import load_workflow
+
+
+@pytest.mark.parametrize("window", [10, None], ids=["local", "random"])
+@pytest.mark.parametrize("nb_nodes", [100, 1000, 5000])
+def bench_layered_layout(nb_nodes, window):
+    workflow = load_workflow(make_workflow_dict(nb_nodes, window=window))
+    tasks = build_svg_tasks(workflow)
+    edges = [(link.source, link.target) for link in workflow.links]
+
+    layout = LayeredLayout()
+    start = time.perf_counter()
+    width, height = layout.apply(tasks, edges)
+    elapsed = time.perf_counter() - start
+
+    assert width > 0 and height > 0
+    print(
+        f"\n{nb_nodes} nodes, {len(edges)} links: {elapsed:.3f}s "
+        f"({elapsed / nb_nodes * 1e6:.0f} us/node), {layout.crossings} crossings"
+    )
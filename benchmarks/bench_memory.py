@@ -0,0 +1,76 @@
+"""
+Benchmarks of the memory footprint of the drawing elements.
+
+Run with ``pytest benchmarks -s`` from the repository root.
+"""
+
+import gc
+import os
+import tracemalloc
+
+import pytest
+from bench_workflow import make_workflow_dict
+
+from ewoksdraw.render import render_workflow, write_workflow
+from ewoksdraw.svg import SvgGroup
+from ewoksdraw.workflow import load_workflow
+
+
+def _count_nodes(nodes) -> int:
+    count = 0
+    for node in nodes:
+        count += 1
+        if isinstance(node, SvgGroup):
+            count += _count_nodes(node.elements)
+    return count
+
+
+@pytest.mark.parametrize("nb_nodes", [1000, 10000])
+def bench_task_memory(nb_nodes):
+    workflow = load_workflow(make_workflow_dict(nb_nodes, window=10))
+    # Measure the drawing only, not the caches filled by the first render
+    render_workflow(make_workflow_dict(10), links=None)
+    gc.collect()
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    canvas = render_workflow(workflow, links=None)
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    nb_elements = _count_nodes(canvas.elements)
+    print(
+        f"\n{nb_nodes} tasks, {nb_elements} elements and groups: "
+        f"{allocated / 2**20:.1f} MiB, {allocated / nb_nodes / 1024:.1f} KiB/task, "
+        f"{allocated / nb_elements:.0f} B/element"
+    )
+
+
+def _peak_memory(draw) -> int:
+    gc.collect()
+    tracemalloc.start()
+    draw()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+@pytest.mark.parametrize("nb_nodes", [5000, 20000])
+def bench_streamed_drawing_memory(nb_nodes):
+    workflow = load_workflow(make_workflow_dict(nb_nodes, window=10))
+    with open(os.devnull, "w") as stream:
+        # Measure the drawing only, not the caches filled by the first render
+        write_workflow(make_workflow_dict(10), stream)
+        canvas_peak = _peak_memory(
+            lambda: render_workflow(workflow).write(stream, minify=True)
+        )
+        streamed_peak = _peak_memory(
+            lambda: write_workflow(workflow, stream, minify=True)
+        )
+    print(
+        f"\n{nb_nodes} tasks, peak memory: canvas {canvas_peak / 2**20:.1f} MiB, "
+        f"streamed {streamed_peak / 2**20:.1f} MiB "
+        f"({streamed_peak / nb_nodes / 1024:.2f} KiB/task)"
+    )
@@ -0,0 +1,43 @@
+"""
+Benchmarks of the size and writing time of rounded, minified and gzip
+compressed SVG documents.
+
+Run with ``pytest benchmarks -s`` from the repository root.
+"""
+
+import io
+import time
+
+import pytest
+from bench_workflow import make_workflow_dict
+
+from ewoksdraw.render import render_workflow
+
+OUTPUT_MODES = {
+    "indented": {},
+    "compact": {"indent": None},
+    "precision=1": {"indent": None, "precision": 1},
+    "minify": {"minify": True, "precision": 1},
+    "minify+defs": {"minify": True, "precision": 1, "use_defs": True},
+}
+
+
+@pytest.mark.parametrize("nb_nodes", [1000, 5000])
+def bench_output_modes(nb_nodes):
+    canvas = render_workflow(make_workflow_dict(nb_nodes, window=10))
+    for name, options in OUTPUT_MODES.items():
+        for compressed in (False, True):
+            stream = io.BytesIO()
+            start = time.perf_counter()
+            if compressed:
+                canvas.write_svgz(stream, **options)
+            else:
+                text_stream = io.TextIOWrapper(stream, encoding="utf-8")
+                canvas.write(text_stream, **options)
+                text_stream.flush()
+            elapsed = time.perf_counter() - start
+            suffix = "svgz" if compressed else "svg"
+            print(
+                f"\n{nb_nodes} nodes, {name} {suffix}: "
+                f"{len(stream.getvalue()) / 1024:.0f} KiB in {elapsed * 1000:.0f} ms"
+            )
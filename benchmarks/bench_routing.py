@@ -0,0 +1,33 @@
+"""
+Benchmarks of the link routing against workflow size.
+
+Run with ``pytest benchmarks -s`` from the repository root.
+"""
+
+import time
+
+import pytest
+from bench_workflow import make_workflow_dict
+
+from ewoksdraw.layout import LayeredLayout
+from ewoksdraw.render import build_svg_links, build_svg_tasks
+from ewoksdraw.workflow import load_workflow
+
+
+@pytest.mark.parametrize("nb_nodes", [100, 1000, 5000])
+def bench_link_routing(nb_nodes):
+    workflow = load_workflow(make_workflow_dict(nb_nodes, window=10))
+    tasks = build_svg_tasks(workflow)
+    LayeredLayout().apply(
+        tasks, [(link.source, link.target) for link in workflow.links]
+    )
+
+    start = time.perf_counter()
+    links = build_svg_links(workflow, tasks)
+    elapsed = time.perf_counter() - start
+
+    assert links
+    print(
+        f"\n{nb_nodes} nodes, {len(links)} links: {elapsed:.3f}s "
+        f"({elapsed / len(links) * 1e6:.0f} us/link)"
+    )
@@ -0,0 +1,70 @@
+"""
+Benchmarks of drawing workflows through the render server, compared with one
+``ewoksdraw`` process per workflow.
+
+Run with ``pytest benchmarks -s`` from the repository root.
+"""
+
+import http.client
+import json
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from bench_workflow import make_workflow_dict
+
+from ewoksdraw.server import create_server
+
+NB_REQUESTS = 20
+
+
+def bench_cli_per_workflow(tmp_path):
+    source = tmp_path / "workflow.json"
+    source.write_text(json.dumps(make_workflow_dict(20)))
+    start = time.perf_counter()
+    for i in range(5):
+        subprocess.run(
+            [sys.executable, "-m", "ewoksdraw.main", str(tmp_path / f"{i}.svg")]
+            + ["--workflow", str(source)],
+            check=True,
+        )
+    elapsed = (time.perf_counter() - start) / 5
+    print(f"\n20 nodes, one process per workflow: {elapsed * 1000:.0f} ms/workflow")
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+@pytest.mark.parametrize("nb_nodes", [20, 500])
+def bench_server_requests(nb_nodes, jobs):
+    body = json.dumps(make_workflow_dict(nb_nodes))
+    server = create_server(port=0, jobs=jobs, quiet=True)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    host, port = server.server_address[:2]
+
+    def render(_):
+        connection = http.client.HTTPConnection(host, port)
+        connection.request("POST", "/render", body=body)
+        connection.getresponse().read()
+
+    try:
+        # Starts and warms up the workers
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            list(executor.map(render, range(jobs)))
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(render, range(NB_REQUESTS)))
+        elapsed = time.perf_counter() - start
+        stats = server.stats.summary()
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+    print(
+        f"\n{nb_nodes} nodes, {jobs} workers: {NB_REQUESTS / elapsed:.1f} workflows/s, "
+        f"latency p50 {stats['latency_ms']['p50']:.1f} ms, "
+        f"p99 {stats['latency_ms']['p99']:.1f} ms, "
+        f"render p50 {stats['render_ms']['p50']:.1f} ms"
+    )
@@ -0,0 +1,51 @@
+"""
+Benchmarks of creating tasks with repeated signatures, with and without the
+task layout cache.
+
+Run with ``pytest benchmarks -s`` from the repository root.
+"""
+
+import random
+import time
+
+import pytest
+
+from ewoksdraw.svg import SvgTask
+from ewoksdraw.svg.task_layout_cache import get_task_layout_cache
+
+
+def _signatures(nb_classes: int, seed: int = 0):
+    rng = random.Random(seed)
+
+    def name(nb_words):
+        return "_".join(f"word{rng.randrange(1000)}" for _ in range(nb_words))
+
+    return [
+        (
+            name(rng.randint(1, 12)),
+            [name(rng.randint(1, 6)) for _ in range(rng.randint(0, 6))],
+            [name(rng.randint(1, 6)) for _ in range(rng.randint(0, 6))],
+        )
+        for _ in range(nb_classes)
+    ]
+
+
+@pytest.mark.parametrize("cached", [False, True], ids=["uncached", "cached"])
+def bench_repeated_tasks(cached):
+    nb_tasks = 5000
+    signatures = _signatures(50)
+    cache = get_task_layout_cache()
+    cache.clear()
+
+    start = time.perf_counter()
+    for i in range(nb_tasks):
+        if not cached:
+            cache.clear()
+        SvgTask(*signatures[i % len(signatures)])
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"\n{nb_tasks} tasks of {len(signatures)} classes, "
+        f"{'cached' if cached else 'uncached'}: "
+        f"{elapsed:.3f}s ({elapsed / nb_tasks * 1e6:.0f} us/task)"
+    )
@@ -0,0 +1,32 @@
+"""
+Benchmarks of the tiled rendering of large drawings.
+
+Run with ``pytest benchmarks -s`` from the repository root.
+"""
+
+import time
+from io import StringIO
+
+import pytest
+from bench_workflow import make_workflow_dict
+
+from ewoksdraw.render import render_workflow
+
+
+@pytest.mark.parametrize("scale", [1.0, 0.25])
+def bench_draw_tiles(tmp_path, scale):
+    canvas = render_workflow(make_workflow_dict(5000, window=10))
+    stream = StringIO()
+    canvas.write(stream)
+    whole_size = len(stream.getvalue())
+
+    start = time.perf_counter()
+    filenames = canvas.draw_tiles(tmp_path, 2000, scale=scale)
+    elapsed = time.perf_counter() - start
+
+    sizes = [filename.stat().st_size for filename in filenames]
+    print(
+        f"\nscale {scale}: whole drawing {whole_size / 2**20:.1f} MiB, "
+        f"{len(filenames)} tiles in {elapsed:.2f}s, largest tile "
+        f"{max(sizes) / 2**10:.0f} KiB, all tiles {sum(sizes) / 2**20:.1f} MiB"
+    )
@@ -0,0 +1,75 @@
+"""
+Benchmarks of drawing large Ewoks workflows.
+
+Run with ``pytest benchmarks -s`` from the repository root.
+"""
+
+import random
+import time
+from typing import Optional
+
+import pytest
+from workload import WORDS
+
+from ewoksdraw.render import render_workflow
+from ewoksdraw.workflow import load_workflow
+
+
+def make_workflow_dict(
+    nb_nodes: int, seed: int = 0, window: Optional[int] = None
+) -> dict:
+    """
+    Generates a reproducible workflow where each node receives data from up to
+    two of the previous nodes, or of the `window` previous nodes.
+    """
+    rng = random.Random(seed)
+    nodes = []
+    links = []
+    for index in range(nb_nodes):
+        name = "_".join(rng.choice(WORDS) for _ in range(rng.randint(1, 6)))
+        nodes.append(
+            {
+                "id": f"node{index}",
+                "label": f"{name}_{index}",
+                "task_type": "class",
+                "task_identifier": f"tasks.{name}",
+                "default_inputs": [
+                    {"name": rng.choice(WORDS), "value": 0}
+                    for _ in range(rng.randint(0, 3))
+                ],
+            }
+        )
+        first = 0 if window is None else max(index - window, 0)
+        for source in rng.sample(range(first, index), min(index - first, 2)):
+            links.append(
+                {
+                    "source": f"node{source}",
+                    "target": f"node{index}",
+                    "data_mapping": [
+                        {
+                            "source_output": rng.choice(WORDS),
+                            "target_input": f"{rng.choice(WORDS)}_{source}",
+                        }
+                    ],
+                }
+            )
+    return {"graph": {"id": f"bench{nb_nodes}"}, "nodes": nodes, "links": links}
+
+
+@pytest.mark.parametrize("nb_nodes", [100, 1000, 5000])
+def bench_render_workflow(nb_nodes):
+    graph = make_workflow_dict(nb_nodes)
+
+    start = time.perf_counter()
+    workflow = load_workflow(graph)
+    loaded = time.perf_counter()
+    canvas = render_workflow(workflow)
+    rendered = time.perf_counter()
+
+    nb_links = sum(len(link.data_mapping) or 1 for link in workflow.links)
+    assert len(canvas.elements) == nb_nodes + nb_links + 1
+    print(
+        f"\n{nb_nodes} nodes: load {loaded - start:.3f}s, "
+        f"tasks, layout and links {rendered - loaded:.3f}s "
+        f"({(rendered - start) / nb_nodes * 1e6:.0f} us/node)"
+    )
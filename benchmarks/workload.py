@@ -0,0 +1,90 @@
+"""
+Deterministic workloads and timing helpers shared by the benchmarks.
+
+The workloads only depend on their parameters and seed, unlike the Faker based
+mock workflows of the CLI, so that timings are comparable across commits.
+"""
+
+import random
+import time
+from typing import Callable, List, Optional, Tuple
+
+from ewoksdraw.svg import SvgBackground, SvgCanvas, SvgTask
+
+WORDS = ["sum", "data", "image", "scan", "result", "integrate", "mask", "energy"]
+
+TaskSignature = Tuple[str, List[str], List[str]]
+
+
+def make_label(length: int, rng: random.Random) -> str:
+    """
+    Returns a label of words joined by underscores, of exactly `length`
+    characters.
+    """
+    words = []
+    size = 0
+    while size < length:
+        word = rng.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return "_".join(words)[:length]
+
+
+def make_task_signatures(
+    nb_tasks: int, nb_io: int, label_length: int, seed: int = 0
+) -> List[TaskSignature]:
+    """
+    Returns distinct task (title, input names, output names), each task having
+    `nb_io` inputs and `nb_io` outputs.
+    """
+    rng = random.Random(seed)
+    return [
+        (
+            f"{make_label(label_length, rng)}_{index}",
+            [make_label(label_length, rng) for _ in range(nb_io)],
+            [make_label(label_length, rng) for _ in range(nb_io)],
+        )
+        for index in range(nb_tasks)
+    ]
+
+
+def make_canvas(
+    nb_tasks: int,
+    nb_io: int = 3,
+    label_length: int = 12,
+    seed: int = 0,
+    nb_signatures: Optional[int] = None,
+) -> SvgCanvas:
+    """
+    Returns a canvas with a background and tasks placed on a grid. With
+    `nb_signatures`, the tasks cycle through that many distinct signatures,
+    like workflows reusing the same task classes.
+    """
+    columns = max(1, int(nb_tasks**0.5))
+    canvas = SvgCanvas(width=columns * 250, height=(nb_tasks // columns + 1) * 150)
+    canvas.add_element(SvgBackground(canvas.width, canvas.height))
+    signatures = make_task_signatures(
+        nb_tasks if nb_signatures is None else nb_signatures,
+        nb_io,
+        label_length,
+        seed,
+    )
+    for index in range(nb_tasks):
+        task = SvgTask(*signatures[index % len(signatures)])
+        task.translate(x=(index % columns) * 250, y=(index // columns) * 150)
+        canvas.add_element(task)
+    return canvas
+
+
+def time_per_call(function: Callable[[], object], number: int, repeat: int = 5):
+    """
+    Returns the best, over `repeat` runs, of the mean time of `number` calls of
+    a function, in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
@@ -0,0 +1,183 @@
+import asyncio
+import threading
+import weakref
+from concurrent.futures import Executor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Literal, Mapping, Optional, Union
+
+from . import render
+from .svg import SvgCanvas
+from .svg.svg_canvas import SVG_CHUNK_SIZE
+from .workflow import Workflow
+
+DEFAULT_CONCURRENCY = 4
+
+
+class AsyncRenderer:
+    """
+    Draws workflows from asyncio code without blocking the event loop: the
+    layout and the serialization run in a thread pool, at most
+    `max_concurrency` at a time, the other ones waiting for their turn.
+
+    Cancelling a render stops waiting for it. A render already running cannot be
+    interrupted: it keeps its slot until it ends and its canvas is dropped.
+    Streamed documents are written one chunk at a time, so that a cancelled or
+    abandoned stream is not written further.
+
+    :param max_concurrency: The maximum number of renders and chunk writes
+                            running at the same time.
+    :param executor: The thread pool running them, by default one of
+                     `max_concurrency` threads created on first use. Canvases
+                     are not sent between processes, so it cannot be a process
+                     pool.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_CONCURRENCY,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError(
+                f"max_concurrency must be at least 1, got {max_concurrency}"
+            )
+        self._max_concurrency = max_concurrency
+        self._executor = executor
+        self._executor_lock = threading.Lock()
+        # asyncio semaphores cannot be shared between event loops
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    @property
+    def max_concurrency(self) -> int:
+        return self._max_concurrency
+
+    @property
+    def executor(self) -> Executor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_concurrency,
+                    thread_name_prefix="ewoksdraw",
+                )
+            return self._executor
+
+    async def render_workflow(
+        self,
+        workflow: Union[Workflow, str, Path, Mapping[str, Any]],
+        *,
+        layout: Literal["layered", "grid"] = "layered",
+        links: Optional[Literal["orthogonal", "spline"]] = "orthogonal",
+    ) -> SvgCanvas:
+        """
+        Creates the SVG canvas drawing a workflow, see `render.render_workflow`.
+        """
+        return await self._run(
+            render.render_workflow, workflow, layout=layout, links=links
+        )
+
+    async def iter_svg(
+        self, canvas: SvgCanvas, chunk_size: int = SVG_CHUNK_SIZE, **options: Any
+    ) -> AsyncIterator[str]:
+        """
+        Serializes an SVG canvas in chunks, each written in the thread pool
+        when the previous one is consumed, see `SvgCanvas.iter_svg`.
+
+        :param options: The keyword arguments of `SvgCanvas.write`.
+        """
+        chunks = canvas.iter_svg(chunk_size, **options)
+        while True:
+            chunk = await self._run(next, chunks, None)
+            if chunk is None:
+                return
+            yield chunk
+
+    async def stream_svg(
+        self,
+        workflow: Union[Workflow, str, Path, Mapping[str, Any]],
+        *,
+        layout: Literal["layered", "grid"] = "layered",
+        links: Optional[Literal["orthogonal", "spline"]] = "orthogonal",
+        chunk_size: int = SVG_CHUNK_SIZE,
+        **options: Any,
+    ) -> AsyncIterator[str]:
+        """
+        Draws a workflow and serializes it in chunks, see `render_workflow` and
+        `iter_svg`.
+        """
+        canvas = await self.render_workflow(workflow, layout=layout, links=links)
+        async for chunk in self.iter_svg(canvas, chunk_size, **options):
+            yield chunk
+
+    async def _run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Calls a function in the thread pool once a slot is free.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(
+                self._max_concurrency
+            )
+        await semaphore.acquire()
+        try:
+            future = self.executor.submit(func, *args, **kwargs)
+        except BaseException:
+            semaphore.release()
+            raise
+        # The slot is freed when the call ends, not when the caller is cancelled
+        future.add_done_callback(lambda _: _release(loop, semaphore))
+        return await asyncio.wrap_future(future)
+
+
+def _release(loop: asyncio.AbstractEventLoop, semaphore: asyncio.Semaphore) -> None:
+    try:
+        loop.call_soon_threadsafe(semaphore.release)
+    except RuntimeError:
+        # The event loop was closed while the call was running
+        pass
+
+
+_ASYNC_RENDERER = AsyncRenderer()
+
+
+def get_async_renderer() -> AsyncRenderer:
+    """
+    Returns the process-wide asynchronous renderer, used by the functions of
+    this module.
+    """
+    return _ASYNC_RENDERER
+
+
+async def render_workflow(
+    workflow: Union[Workflow, str, Path, Mapping[str, Any]],
+    *,
+    layout: Literal["layered", "grid"] = "layered",
+    links: Optional[Literal["orthogonal", "spline"]] = "orthogonal",
+) -> SvgCanvas:
+    """
+    Creates the SVG canvas drawing a workflow without blocking the event loop,
+    see `AsyncRenderer.render_workflow`.
+    """
+    return await get_async_renderer().render_workflow(
+        workflow, layout=layout, links=links
+    )
+
+
+def iter_svg(
+    canvas: SvgCanvas, chunk_size: int = SVG_CHUNK_SIZE, **options: Any
+) -> AsyncIterator[str]:
+    """
+    Serializes an SVG canvas in chunks without blocking the event loop, see
+    `AsyncRenderer.iter_svg`.
+    """
+    return get_async_renderer().iter_svg(canvas, chunk_size, **options)
+
+
+def stream_svg(
+    workflow: Union[Workflow, str, Path, Mapping[str, Any]], **options: Any
+) -> AsyncIterator[str]:
+    """
+    Draws a workflow and serializes it in chunks without blocking the event
+    loop, see `AsyncRenderer.stream_svg`.
+    """
+    return get_async_renderer().stream_svg(workflow, **options)
@@ -0,0 +1,218 @@
+import glob
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Iterable, Iterator, List, Literal, NamedTuple, Optional, Union
+
+from .render import render_workflow, save_canvas
+from .render_cache import DEFAULT_MAX_SIZE, get_render_cache
+from .svg.font_metrics import get_font_registry
+from .svg.svg_style import get_all_css_styles
+
+WORKFLOW_SUFFIXES = (".json", ".yml", ".yaml")
+
+
+class BatchResult(NamedTuple):
+    """
+    Outcome of rendering one workflow file of a batch.
+
+    :param source: The workflow file.
+    :param output: The file written, or that would have been written on
+                   failure.
+    :param elapsed: The time spent loading, rendering and writing, in seconds.
+    :param error: The error message if rendering failed, None on success.
+    :param cached: True if the document came from the render cache, None
+                   without render cache.
+    """
+
+    source: Path
+    output: Path
+    elapsed: float
+    error: Optional[str] = None
+    cached: Optional[bool] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def find_workflow_files(pattern: Union[str, Path]) -> List[Path]:
+    """
+    Returns the workflow files of a batch, sorted by name.
+
+    :param pattern: A directory, searched recursively for JSON and YAML files,
+                    a glob pattern (``**`` matches sub-directories) or a file.
+    """
+    path = Path(pattern)
+    if path.is_dir():
+        files = (
+            file
+            for file in path.rglob("*")
+            if file.suffix.lower() in WORKFLOW_SUFFIXES and file.is_file()
+        )
+    elif path.is_file():
+        files = iter([path])
+    else:
+        files = (
+            Path(file)
+            for file in glob.glob(str(pattern), recursive=True)
+            if os.path.isfile(file)
+        )
+    return sorted(files)
+
+
+def output_filenames(
+    sources: Iterable[Path], output_dir: Union[str, Path], output_format: str = "svg"
+) -> List[Path]:
+    """
+    Returns the output file names of the workflow files, with the suffix of the
+    output format. The directory structure of the sources, relative to their
+    common directory, is kept in the output directory so that workflows with the
+    same name do not overwrite each other. Workflows differing only by their
+    suffix, like ``a.json`` and ``a.yaml``, keep it: ``a.json.svg`` and
+    ``a.yaml.svg``.
+    """
+    sources = [Path(source).resolve() for source in sources]
+    if not sources:
+        return []
+    base = Path(os.path.commonpath([source.parent for source in sources]))
+    relative_paths = [source.relative_to(base) for source in sources]
+    stems = Counter(path.with_suffix("") for path in relative_paths)
+    return [
+        Path(output_dir)
+        / (
+            path.with_name(f"{path.name}.{output_format}")
+            if stems[path.with_suffix("")] > 1
+            else path.with_suffix(f".{output_format}")
+        )
+        for path in relative_paths
+    ]
+
+
+def warm_up() -> None:
+    """
+    Loads the stylesheets and the metrics of their fonts, so that the first
+    render of a process does not pay for it.
+    """
+    fonts = get_font_registry()
+    fonts.resolve(())
+    for style in get_all_css_styles():
+        fonts.resolve(style.font_families)
+
+
+def render_file(
+    source: Path,
+    output: Path,
+    layout: Literal["layered", "grid"] = "layered",
+    links: Optional[Literal["orthogonal", "spline"]] = "orthogonal",
+    cache_dir: Optional[Union[str, Path]] = None,
+    cache_size: int = DEFAULT_MAX_SIZE,
+    precision: Optional[int] = None,
+    minify: bool = False,
+) -> BatchResult:
+    """
+    Renders one workflow file to an SVG, SVGZ, PDF or PNG file, depending on the
+    output suffix. Errors are reported in the result
+    instead of being raised.
+
+    :param cache_dir: The directory of the render cache, None to always render.
+    :param cache_size: The maximum size of the render cache, in bytes.
+    :param precision: The number of decimals of the SVG coordinates, None to not
+                      round them.
+    :param minify: If True, SVG documents are written as small as possible.
+    """
+    start = time.perf_counter()
+    cached = None
+    write_options = {"precision": precision, "minify": minify}
+    try:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        if cache_dir is None:
+            canvas = render_workflow(source, layout=layout, links=links)
+            save_canvas(canvas, output, **write_options)
+        else:
+            cache = get_render_cache(cache_dir, cache_size)
+            cached = cache.draw(
+                source, output, layout=layout, links=links, **write_options
+            )
+    except Exception as e:
+        return BatchResult(
+            source, output, time.perf_counter() - start, f"{type(e).__name__}: {e}"
+        )
+    return BatchResult(source, output, time.perf_counter() - start, cached=cached)
+
+
+def render_batch(
+    sources: Iterable[Union[str, Path]],
+    output_dir: Union[str, Path],
+    *,
+    jobs: Optional[int] = None,
+    layout: Literal["layered", "grid"] = "layered",
+    links: Optional[Literal["orthogonal", "spline"]] = "orthogonal",
+    cache_dir: Optional[Union[str, Path]] = None,
+    cache_size: int = DEFAULT_MAX_SIZE,
+    output_format: str = "svg",
+    precision: Optional[int] = None,
+    minify: bool = False,
+) -> Iterator[BatchResult]:
+    """
+    Renders workflow files to SVG, SVGZ, PDF or PNG files in an output directory,
+    in parallel.
+
+    Each worker process is warmed up once (see `warm_up`) and keeps its caches
+    for all the files it renders. A failing file does not stop the batch.
+
+    :param sources: The workflow files.
+    :param output_dir: The directory of the output files.
+    :param jobs: The number of worker processes, defaults to the number of CPUs.
+                 With 1, the files are rendered in the current process.
+    :param layout: The placement of the workflow tasks.
+    :param links: The drawing of the links, None to not draw them.
+    :param cache_dir: The directory of the render cache shared by the workers,
+                      None to always render.
+    :param cache_size: The maximum size of the render cache, in bytes.
+    :param output_format: "svg", "svgz", "pdf" or "png".
+    :param precision: The number of decimals of the SVG coordinates, None to not
+                      round them.
+    :param minify: If True, SVG documents are written as small as possible.
+    :return: The results, in order of completion.
+    """
+    sources = [Path(source) for source in sources]
+    outputs = output_filenames(sources, output_dir, output_format)
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, len(sources))
+
+    if jobs <= 1:
+        warm_up()
+        for source, output in zip(sources, outputs):
+            yield render_file(
+                source,
+                output,
+                layout,
+                links,
+                cache_dir,
+                cache_size,
+                precision,
+                minify,
+            )
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=warm_up) as executor:
+        futures = [
+            executor.submit(
+                render_file,
+                source,
+                output,
+                layout,
+                links,
+                cache_dir,
+                cache_size,
+                precision,
+                minify,
+            )
+            for source, output in zip(sources, outputs)
+        ]
+        for future in as_completed(futures):
+            yield future.result()
@@ -1,3 +1,9 @@
+"""
+Layout constants of the drawings. They are all part of the task layout and
+render cache keys, so settings that do not change the drawing belong to the
+modules using them.
+"""
+
 ANCHOR_LINKS_RADIUS = 2.5
 BOX_MIN_WIDTH = 20
 BOX_MAX_WIDTH = 200
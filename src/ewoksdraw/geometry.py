@@ -0,0 +1,209 @@
+import math
+from typing import Dict, Generic, Iterable, List, NamedTuple, Set, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Boxes covering more grid cells are kept out of the grid and tested by every
+# query, so that a few huge boxes, like a background, do not fill the grid
+MAX_COVERED_CELLS = 256
+
+
+class BoundingBox(NamedTuple):
+    """
+    Axis-aligned rectangle, in SVG coordinates (y pointing down).
+    """
+
+    x_min: float
+    y_min: float
+    x_max: float
+    y_max: float
+
+    @classmethod
+    def from_size(
+        cls, x: float, y: float, width: float, height: float
+    ) -> "BoundingBox":
+        return cls(x, y, x + width, y + height)
+
+    @classmethod
+    def from_points(cls, points: Iterable[Tuple[float, float]]) -> "BoundingBox":
+        xs, ys = zip(*points)
+        return cls(min(xs), min(ys), max(xs), max(ys))
+
+    @property
+    def width(self) -> float:
+        return self.x_max - self.x_min
+
+    @property
+    def height(self) -> float:
+        return self.y_max - self.y_min
+
+    @property
+    def center(self) -> Tuple[float, float]:
+        return (self.x_min + self.x_max) / 2, (self.y_min + self.y_max) / 2
+
+    def contains(self, x: float, y: float) -> bool:
+        """
+        Returns True if the point is inside the box or on its border.
+        """
+        return self.x_min <= x <= self.x_max and self.y_min <= y <= self.y_max
+
+    def intersects(self, other: "BoundingBox") -> bool:
+        """
+        Returns True if the interiors of the boxes overlap. Boxes that only touch
+        do not intersect.
+        """
+        return (
+            self.x_min < other.x_max
+            and other.x_min < self.x_max
+            and self.y_min < other.y_max
+            and other.y_min < self.y_max
+        )
+
+    def overlaps(self, other: "BoundingBox") -> bool:
+        """
+        Returns True if the boxes overlap or touch.
+        """
+        return (
+            self.x_min <= other.x_max
+            and other.x_min <= self.x_max
+            and self.y_min <= other.y_max
+            and other.y_min <= self.y_max
+        )
+
+    def translated(self, dx: float, dy: float) -> "BoundingBox":
+        return BoundingBox(
+            self.x_min + dx, self.y_min + dy, self.x_max + dx, self.y_max + dy
+        )
+
+    def union(self, other: "BoundingBox") -> "BoundingBox":
+        return BoundingBox(
+            min(self.x_min, other.x_min),
+            min(self.y_min, other.y_min),
+            max(self.x_max, other.x_max),
+            max(self.y_max, other.y_max),
+        )
+
+
+class SpatialIndex(Generic[T]):
+    """
+    Uniform grid index of bounding boxes. Queries only look at the grid cells
+    covered by the query box, so their cost depends on the local density of boxes
+    rather than on the total number of boxes. Boxes much larger than the cells
+    are kept in a separate list tested by every query.
+
+    :param cell_size: The width and height of a grid cell. A good value is the
+                      typical size of the indexed boxes.
+    """
+
+    def __init__(self, cell_size: float):
+        if cell_size <= 0:
+            raise ValueError(f"cell_size must be positive, got {cell_size}")
+        self._cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        self._items: List[T] = []
+        self._boxes: List[BoundingBox] = []
+        self._large: List[int] = []
+
+    @classmethod
+    def from_boxes(cls, items: Iterable[Tuple[T, BoundingBox]]) -> "SpatialIndex[T]":
+        """
+        Creates an index with a cell size equal to the median size of the boxes.
+        """
+        items = list(items)
+        sizes = sorted(max(box.width, box.height) for _, box in items)
+        cell_size = sizes[len(sizes) // 2] if sizes else 1.0
+        index = cls(cell_size if cell_size > 0 else 1.0)
+        for item, box in items:
+            index.insert(item, box)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def insert(self, item: T, box: BoundingBox) -> None:
+        """
+        Adds an item with its bounding box.
+        """
+        item_id = len(self._items)
+        self._items.append(item)
+        self._boxes.append(box)
+        if self._nb_covered_cells(box) > MAX_COVERED_CELLS:
+            self._large.append(item_id)
+            return
+        for cell in self._covered_cells(box):
+            self._cells.setdefault(cell, []).append(item_id)
+
+    def query(self, box: BoundingBox, *, strict: bool = True) -> List[T]:
+        """
+        Returns the items whose bounding box intersects the given box, in
+        insertion order.
+
+        :param box: The query box.
+        :param strict: If True, items whose box only touches the query box are
+                       not returned.
+        """
+        return [self._items[item_id] for item_id in self._query_ids(box, strict)]
+
+    def query_boxes(
+        self, box: BoundingBox, *, strict: bool = True
+    ) -> List[Tuple[T, BoundingBox]]:
+        """
+        Returns the (item, bounding box) pairs intersecting the given box.
+        """
+        return [
+            (self._items[item_id], self._boxes[item_id])
+            for item_id in self._query_ids(box, strict)
+        ]
+
+    def intersects_any(self, box: BoundingBox, *, strict: bool = True) -> bool:
+        """
+        Returns True if the box intersects at least one indexed box. Stops at the
+        first intersection found.
+
+        :param box: The query box.
+        :param strict: If True, boxes that only touch the query box are ignored.
+        """
+        test = box.intersects if strict else box.overlaps
+        boxes = self._boxes
+        for item_id in self._large:
+            if test(boxes[item_id]):
+                return True
+        for bucket in self._covered_buckets(box):
+            for item_id in bucket:
+                if test(boxes[item_id]):
+                    return True
+        return False
+
+    def _query_ids(self, box: BoundingBox, strict: bool) -> List[int]:
+        seen: Set[int] = set(self._large)
+        for bucket in self._covered_buckets(box):
+            seen.update(bucket)
+        test = box.intersects if strict else box.overlaps
+        boxes = self._boxes
+        return sorted(item_id for item_id in seen if test(boxes[item_id]))
+
+    def _covered_buckets(self, box: BoundingBox) -> Iterable[List[int]]:
+        """
+        Yields the non-empty cells covered by the box.
+        """
+        size = self._cell_size
+        cells = self._cells
+        j_range = range(math.floor(box.y_min / size), math.floor(box.y_max / size) + 1)
+        for i in range(math.floor(box.x_min / size), math.floor(box.x_max / size) + 1):
+            for j in j_range:
+                bucket = cells.get((i, j))
+                if bucket:
+                    yield bucket
+
+    def _nb_covered_cells(self, box: BoundingBox) -> int:
+        size = self._cell_size
+        columns = math.floor(box.x_max / size) - math.floor(box.x_min / size) + 1
+        rows = math.floor(box.y_max / size) - math.floor(box.y_min / size) + 1
+        return columns * rows
+
+    def _covered_cells(self, box: BoundingBox) -> Iterable[Tuple[int, int]]:
+        size = self._cell_size
+        j_range = range(math.floor(box.y_min / size), math.floor(box.y_max / size) + 1)
+        for i in range(math.floor(box.x_min / size), math.floor(box.x_max / size) + 1):
+            for j in j_range:
+                yield i, j
@@ -0,0 +1,477 @@
+import math
+from typing import Dict, Iterable, List, Mapping, Protocol, Sequence, Tuple
+
+CANVAS_MARGIN = 20
+TASK_SPACING = 40
+LAYER_SPACING = 80
+NODE_SPACING = 30
+EDGE_SPACING = 10
+
+
+class LayoutNode(Protocol):
+    """
+    What the layouts need of a task to place it: its size and a way to move it.
+    Implemented by `SvgTask` and by `render.TaskFootprint`.
+    """
+
+    @property
+    def width(self) -> float:
+        """
+        The width of the task box.
+        """
+
+    @property
+    def height(self) -> float:
+        """
+        The height of the task, with its inputs and outputs.
+        """
+
+    def set_translation(self, x: float = 0, y: float = 0) -> None:
+        """
+        Sets the translation of the task, placing its top-left corner.
+        """
+
+
+def grid_layout(
+    tasks: Sequence[LayoutNode],
+    *,
+    margin: float = CANVAS_MARGIN,
+    spacing: float = TASK_SPACING,
+) -> Tuple[float, float]:
+    """
+    Places the tasks row by row on a square grid, in linear time. Each column is
+    as wide as its widest task and each row as high as its highest task.
+
+    :param tasks: The tasks to place.
+    :param margin: The space around the grid.
+    :param spacing: The space between rows and columns.
+    :return: The (width, height) needed to draw all the tasks.
+    """
+    if not tasks:
+        return 2 * margin, 2 * margin
+
+    nb_columns = math.ceil(math.sqrt(len(tasks)))
+    column_widths = [0.0] * nb_columns
+    row_heights = [0.0] * math.ceil(len(tasks) / nb_columns)
+    for index, task in enumerate(tasks):
+        row, column = divmod(index, nb_columns)
+        column_widths[column] = max(column_widths[column], task.width)
+        row_heights[row] = max(row_heights[row], task.height)
+
+    column_positions = _cumulative_positions(column_widths, margin, spacing)
+    row_positions = _cumulative_positions(row_heights, margin, spacing)
+    for index, task in enumerate(tasks):
+        row, column = divmod(index, nb_columns)
+        task.set_translation(x=column_positions[column], y=row_positions[row])
+
+    width = column_positions[-1] + column_widths[-1] + margin
+    height = row_positions[-1] + row_heights[-1] + margin
+    return width, height
+
+
+class LayeredLayout:
+    """
+    Places tasks in columns following the direction of the links between them
+    (Sugiyama-style layered layout):
+
+    1. cycles are broken by reversing the back edges of a depth-first search,
+    2. tasks are assigned to layers by longest path, links spanning several
+       layers get one dummy node per crossed layer,
+    3. crossings are reduced by barycenter sweeps, keeping the ordering with the
+       fewest crossings,
+    4. each layer is a column as wide as its widest task, and vertical positions
+       are the closest to the neighbour barycenters that keep the spacing, solved
+       by isotonic regression.
+
+    Each step is linear in the number of nodes and edges (including dummy nodes),
+    except for the sorting and crossing counting of the sweeps, which add a
+    logarithmic factor.
+
+    :param layer_spacing: The horizontal space between two layers.
+    :param node_spacing: The vertical space between two tasks of a layer.
+    :param edge_spacing: The vertical space reserved around links crossing a layer.
+    :param margin: The space around the drawing.
+    :param sweeps: The maximum number of barycenter sweeps.
+    :param refinements: The number of vertical position refinement passes.
+    """
+
+    def __init__(
+        self,
+        *,
+        layer_spacing: float = LAYER_SPACING,
+        node_spacing: float = NODE_SPACING,
+        edge_spacing: float = EDGE_SPACING,
+        margin: float = CANVAS_MARGIN,
+        sweeps: int = 8,
+        refinements: int = 2,
+    ):
+        self._layer_spacing = layer_spacing
+        self._node_spacing = node_spacing
+        self._edge_spacing = edge_spacing
+        self._margin = margin
+        self._sweeps = sweeps
+        self._refinements = refinements
+        self.crossings = 0
+
+    def apply(
+        self,
+        tasks: Mapping[str, LayoutNode],
+        edges: Iterable[Tuple[str, str]],
+    ) -> Tuple[float, float]:
+        """
+        Computes the positions of the tasks and translates them accordingly.
+
+        :param tasks: The tasks to place, by node identifier.
+        :param edges: The (source, target) node identifiers of the links.
+        :return: The (width, height) needed to draw all the tasks.
+        """
+        node_ids = list(tasks)
+        if not node_ids:
+            return 2 * self._margin, 2 * self._margin
+
+        index = {node_id: i for i, node_id in enumerate(node_ids)}
+        nb_nodes = len(node_ids)
+        widths = [tasks[node_id].width for node_id in node_ids]
+        heights = [tasks[node_id].height for node_id in node_ids]
+
+        successors = _unique_edges(nb_nodes, index, edges)
+        successors = _remove_cycles(successors)
+        layer_of = _assign_layers(successors)
+        successors = _add_dummy_nodes(successors, layer_of, widths, heights)
+
+        predecessors: List[List[int]] = [[] for _ in successors]
+        for source, targets in enumerate(successors):
+            for target in targets:
+                predecessors[target].append(source)
+
+        layers, self.crossings = self._order_layers(successors, predecessors, layer_of)
+
+        layer_x, width = self._layer_positions(layers, widths)
+        tops, height = self._vertical_positions(
+            layers, successors, predecessors, heights, nb_nodes
+        )
+
+        for i, node_id in enumerate(node_ids):
+            tasks[node_id].set_translation(x=layer_x[layer_of[i]], y=tops[i])
+        return width, height
+
+    def _order_layers(
+        self,
+        successors: List[List[int]],
+        predecessors: List[List[int]],
+        layer_of: List[int],
+    ) -> Tuple[List[List[int]], int]:
+        nb_layers = max(layer_of) + 1
+        layers: List[List[int]] = [[] for _ in range(nb_layers)]
+        for node in _depth_first_order(successors, predecessors):
+            layers[layer_of[node]].append(node)
+
+        best = [list(layer) for layer in layers]
+        best_crossings = _count_all_crossings(layers, successors)
+        sweeps_without_improvement = 0
+        for sweep in range(self._sweeps):
+            if best_crossings == 0 or sweeps_without_improvement == 2:
+                break
+            if sweep % 2 == 0:
+                for i in range(1, nb_layers):
+                    _barycenter_sort(layers[i], layers[i - 1], predecessors)
+            else:
+                for i in range(nb_layers - 2, -1, -1):
+                    _barycenter_sort(layers[i], layers[i + 1], successors)
+            crossings = _count_all_crossings(layers, successors)
+            if crossings < best_crossings:
+                best = [list(layer) for layer in layers]
+                best_crossings = crossings
+                sweeps_without_improvement = 0
+            else:
+                sweeps_without_improvement += 1
+        return best, best_crossings
+
+    def _layer_positions(
+        self, layers: List[List[int]], widths: List[float]
+    ) -> Tuple[List[float], float]:
+        layer_x = []
+        x = self._margin
+        for layer in layers:
+            layer_x.append(x)
+            x += max(widths[node] for node in layer) + self._layer_spacing
+        return layer_x, x - self._layer_spacing + self._margin
+
+    def _vertical_positions(
+        self,
+        layers: List[List[int]],
+        successors: List[List[int]],
+        predecessors: List[List[int]],
+        heights: List[float],
+        nb_nodes: int,
+    ) -> Tuple[List[float], float]:
+        tops = [0.0] * len(heights)
+        for layer in layers:
+            top = 0.0
+            for node in layer:
+                tops[node] = top
+                top += heights[node] + self._spacing(node, nb_nodes)
+
+        nb_layers = len(layers)
+        for _ in range(self._refinements):
+            for i in range(1, nb_layers):
+                self._align_layer(layers[i], predecessors, tops, heights, nb_nodes)
+            for i in range(nb_layers - 2, -1, -1):
+                self._align_layer(layers[i], successors, tops, heights, nb_nodes)
+
+        shift = self._margin - min(tops)
+        bottom = 0.0
+        for node in range(len(tops)):
+            tops[node] += shift
+            bottom = max(bottom, tops[node] + heights[node])
+        return tops, bottom + self._margin
+
+    def _align_layer(
+        self,
+        layer: List[int],
+        neighbours: List[List[int]],
+        tops: List[float],
+        heights: List[float],
+        nb_nodes: int,
+    ) -> None:
+        desired = []
+        gaps = []
+        for node in layer:
+            adjacent = neighbours[node]
+            if adjacent:
+                center = sum(tops[n] + heights[n] / 2 for n in adjacent) / len(adjacent)
+                desired.append(center - heights[node] / 2)
+            else:
+                desired.append(tops[node])
+            gaps.append(heights[node] + self._spacing(node, nb_nodes))
+
+        for node, top in zip(layer, _spaced_isotonic_fit(desired, gaps)):
+            tops[node] = top
+
+    def _spacing(self, node: int, nb_nodes: int) -> float:
+        return self._node_spacing if node < nb_nodes else self._edge_spacing
+
+
+def _cumulative_positions(
+    sizes: Sequence[float], margin: float, spacing: float
+) -> List[float]:
+    positions = []
+    position = margin
+    for size in sizes:
+        positions.append(position)
+        position += size + spacing
+    return positions
+
+
+def _unique_edges(
+    nb_nodes: int, index: Dict[str, int], edges: Iterable[Tuple[str, str]]
+) -> List[List[int]]:
+    successors: List[Dict[int, None]] = [{} for _ in range(nb_nodes)]
+    for source, target in edges:
+        source_index = index[source]
+        target_index = index[target]
+        if source_index != target_index:
+            successors[source_index][target_index] = None
+    return [list(targets) for targets in successors]
+
+
+def _remove_cycles(successors: List[List[int]]) -> List[List[int]]:
+    """
+    Reverses the back edges of an iterative depth-first search.
+    """
+    nb_nodes = len(successors)
+    state = [0] * nb_nodes  # 0: not visited, 1: on the stack, 2: done
+    acyclic: List[List[int]] = [[] for _ in range(nb_nodes)]
+    for root in range(nb_nodes):
+        if state[root]:
+            continue
+        state[root] = 1
+        stack = [(root, iter(successors[root]))]
+        while stack:
+            node, targets = stack[-1]
+            for target in targets:
+                if state[target] == 1:
+                    acyclic[target].append(node)
+                    continue
+                acyclic[node].append(target)
+                if state[target] == 0:
+                    state[target] = 1
+                    stack.append((target, iter(successors[target])))
+                    break
+            else:
+                state[node] = 2
+                stack.pop()
+
+    return [list(dict.fromkeys(targets)) for targets in acyclic]
+
+
+def _assign_layers(successors: List[List[int]]) -> List[int]:
+    """
+    Assigns layers by longest path from the sources, then moves the sources next
+    to their closest successor to shorten their links.
+    """
+    nb_nodes = len(successors)
+    in_degree = [0] * nb_nodes
+    for targets in successors:
+        for target in targets:
+            in_degree[target] += 1
+
+    order = [node for node in range(nb_nodes) if in_degree[node] == 0]
+    layer_of = [0] * nb_nodes
+    for node in order:
+        for target in successors[node]:
+            layer_of[target] = max(layer_of[target], layer_of[node] + 1)
+            in_degree[target] -= 1
+            if in_degree[target] == 0:
+                order.append(target)
+
+    has_predecessor = [False] * nb_nodes
+    for targets in successors:
+        for target in targets:
+            has_predecessor[target] = True
+    for node in reversed(order):
+        if not has_predecessor[node] and successors[node]:
+            layer_of[node] = min(layer_of[target] for target in successors[node]) - 1
+    return layer_of
+
+
+def _add_dummy_nodes(
+    successors: List[List[int]],
+    layer_of: List[int],
+    widths: List[float],
+    heights: List[float],
+) -> List[List[int]]:
+    """
+    Replaces the edges spanning several layers by chains of dummy nodes, so that
+    all edges join consecutive layers. Extends the node lists in place.
+    """
+    result: List[List[int]] = [[] for _ in successors]
+    for source in range(len(successors)):
+        for target in successors[source]:
+            previous = source
+            for layer in range(layer_of[source] + 1, layer_of[target]):
+                dummy = len(result)
+                result.append([])
+                layer_of.append(layer)
+                widths.append(0.0)
+                heights.append(0.0)
+                result[previous].append(dummy)
+                previous = dummy
+            result[previous].append(target)
+    return result
+
+
+def _depth_first_order(
+    successors: List[List[int]], predecessors: List[List[int]]
+) -> List[int]:
+    """
+    Returns the nodes in depth-first order from the sources, which gives an
+    initial ordering of the layers with few crossings.
+    """
+    visited = [False] * len(successors)
+    order = []
+    roots = [node for node in range(len(successors)) if not predecessors[node]]
+    for root in roots + list(range(len(successors))):
+        if visited[root]:
+            continue
+        visited[root] = True
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            for target in reversed(successors[node]):
+                if not visited[target]:
+                    visited[target] = True
+                    stack.append(target)
+    return order
+
+
+def _barycenter_sort(
+    layer: List[int], fixed_layer: List[int], neighbours: List[List[int]]
+) -> None:
+    position = {node: i for i, node in enumerate(fixed_layer)}
+    keys = {}
+    for i, node in enumerate(layer):
+        adjacent = neighbours[node]
+        if adjacent:
+            keys[node] = sum(position[n] for n in adjacent) / len(adjacent)
+        else:
+            keys[node] = i * len(fixed_layer) / max(len(layer), 1)
+    layer.sort(key=keys.__getitem__)
+
+
+def _count_all_crossings(layers: List[List[int]], successors: List[List[int]]) -> int:
+    return sum(
+        _count_crossings(layers[i], layers[i + 1], successors)
+        for i in range(len(layers) - 1)
+    )
+
+
+def _count_crossings(
+    layer: List[int], next_layer: List[int], successors: List[List[int]]
+) -> int:
+    """
+    Counts the crossings between two consecutive layers in O(E log V) with a
+    Fenwick tree (Barth, Juenger and Mutzel, 2002).
+    """
+    position = {node: i for i, node in enumerate(next_layer)}
+    targets = []
+    for node in layer:
+        node_targets = successors[node]
+        if len(node_targets) == 1:
+            targets.append(position[node_targets[0]])
+        elif node_targets:
+            targets.extend(sorted([position[target] for target in node_targets]))
+
+    size = len(next_layer)
+    tree = [0] * (size + 1)
+    crossings = 0
+    for count, target in enumerate(targets):
+        # Number of previous edges ending strictly after this target
+        i = target + 1
+        smaller_or_equal = 0
+        while i > 0:
+            smaller_or_equal += tree[i]
+            i -= i & -i
+        crossings += count - smaller_or_equal
+        i = target + 1
+        while i <= size:
+            tree[i] += 1
+            i += i & -i
+    return crossings
+
+
+def _spaced_isotonic_fit(desired: List[float], gaps: List[float]) -> List[float]:
+    """
+    Finds the positions closest to the desired ones (least squares) such that
+    each position is at least `gaps[k]` after the previous one, with the pool
+    adjacent violators algorithm, in linear time.
+    """
+    offsets = []
+    offset = 0.0
+    for gap in gaps:
+        offsets.append(offset)
+        offset += gap
+
+    # Blocks of (mean, weight) of the shifted targets, kept non-decreasing
+    means: List[float] = []
+    weights: List[int] = []
+    for target, offset in zip(desired, offsets):
+        mean = target - offset
+        weight = 1
+        while means and means[-1] >= mean:
+            previous_weight = weights.pop()
+            mean = (means.pop() * previous_weight + mean * weight) / (
+                previous_weight + weight
+            )
+            weight += previous_weight
+        means.append(mean)
+        weights.append(weight)
+
+    positions = []
+    k = 0
+    for mean, weight in zip(means, weights):
+        for _ in range(weight):
+            positions.append(mean + offsets[k])
+            k += 1
+    return positions
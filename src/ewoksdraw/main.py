@@ -1,12 +1,23 @@
+import argparse
 import random
 import sys
+import time
+from typing import List, Optional
 
-from faker import Faker
-
+from .profiling import profile
+from .render import (
+    EXPORT_FORMATS,
+    draw_workflow,
+    export_format,
+    render_workflow,
+    save_canvas,
+)
 from .svg import SvgBackground, SvgCanvas, SvgTask
 
 
 def generate_random_names() -> list:
+    from faker import Faker
+
     nb_names = abs(int(random.gauss(mu=4, sigma=3)))
     fake = Faker()
     return [
@@ -19,6 +30,8 @@ def generate_random_name() -> str:
     nb_words = abs(int(random.gauss(mu=4, sigma=3)))
     if nb_words < 1:
         nb_words = 1
+    from faker import Faker
+
     fake = Faker()
     name = ""
     for _ in range(nb_words):
@@ -26,9 +39,9 @@ def generate_random_name() -> str:
     return f"{'_'.join(fake.word() for _ in range(nb_words))}"
 
 
-def main():
-    filename = sys.argv[1]
-
+def draw_mock_workflow(
+    filename: str, *, precision: Optional[int] = None, minify: bool = False
+) -> None:
     canvas_width = 500
     canvas_height = 500
 
@@ -51,10 +64,291 @@ def main():
 
         canvas.add_element(svg_task)
 
-    canvas.draw(filename)
+    save_canvas(canvas, filename, precision=precision, minify=minify)
     print(canvas.dict)
     print(canvas.xml)
 
 
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="ewoksdraw",
+        description="Draw an Ewoks workflow as SVG, PDF or PNG",
+        epilog="Run 'ewoksdraw serve --help' to draw workflows posted to a local "
+        "render server instead. As first argument, 'serve' is reserved for the "
+        "server: to draw a file named serve, write './serve' or put '--' before it.",
+    )
+    parser.add_argument(
+        "output",
+        help="Name of the output file, drawn as PDF or PNG with a .pdf or .png "
+        "suffix and as SVG otherwise, or directory with --batch. A first argument "
+        "'serve' runs the render server instead (see below)",
+    )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument(
+        "-w",
+        "--workflow",
+        help="Ewoks workflow file (JSON or YAML). Without it, a random mock "
+        "workflow is drawn.",
+    )
+    source.add_argument(
+        "-b",
+        "--batch",
+        metavar="SOURCES",
+        help="Directory or glob pattern of workflow files to draw in the output "
+        "directory",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of worker processes with --batch (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=EXPORT_FORMATS,
+        default="svg",
+        help="Format of the files drawn with --batch (default: svg)",
+    )
+    parser.add_argument(
+        "--precision",
+        type=int,
+        help="Round the SVG coordinates to this number of decimals",
+    )
+    parser.add_argument(
+        "--minify",
+        action="store_true",
+        help="Write the SVG files as small as possible: compact, without default "
+        "attribute values, with short class names",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Write the drawing of --workflow to the SVG file task by task, "
+        "without keeping it in memory, for huge workflows",
+    )
+    parser.add_argument(
+        "--tile-size",
+        type=float,
+        help="Split the drawing of --workflow into square SVG tiles of this size, "
+        "written in the output directory",
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="Size of the tiles in pixels per drawing unit, IO labels too small "
+        "to be read are not drawn (default: 1)",
+    )
+    parser.add_argument(
+        "--layout",
+        choices=("layered", "grid"),
+        default="layered",
+        help="Placement of the workflow tasks (default: layered)",
+    )
+    parser.add_argument(
+        "--links",
+        choices=("orthogonal", "spline", "none"),
+        default="orthogonal",
+        help="Drawing of the links between tasks (default: orthogonal)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory of the render cache, reusing the drawings of unchanged "
+        "workflows",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=float,
+        default=256,
+        help="Maximum size of the render cache in MiB (default: 256)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print the time spent per rendering phase and the number of text "
+        "measurements per task (--batch then runs in a single process)",
+    )
+    return parser.parse_args(argv)
+
+
+def parse_serve_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="ewoksdraw serve",
+        description="Draw the Ewoks workflows posted as JSON to a local HTTP server, "
+        "keeping the stylesheets and text measurements cached between requests",
+    )
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Host name or address to listen on (default: 127.0.0.1)",
+    )
+    parser.add_argument(
+        "-p",
+        "--port",
+        type=int,
+        default=8000,
+        help="Port to listen on, 0 for any free port (default: 8000)",
+    )
+    parser.add_argument(
+        "--socket",
+        help="Path of a Unix socket to listen on instead of a TCP port. A socket left "
+        "there is replaced, any other file is an error",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "-q",
+        "--quiet",
+        action="store_true",
+        help="Do not log the requests",
+    )
+    return parser.parse_args(argv)
+
+
+def serve(argv: Optional[List[str]] = None) -> int:
+    """
+    Runs the render server of the ``ewoksdraw serve`` command line until
+    interrupted.
+
+    :return: The exit code.
+    """
+    args = parse_serve_args(argv)
+    # Imported on use, like the batch mode, to start the CLI fast
+    from .server import serve as serve_forever
+
+    serve_forever(
+        args.host, args.port, socket_path=args.socket, jobs=args.jobs, quiet=args.quiet
+    )
+    return 0
+
+
+def draw_batch(args: argparse.Namespace) -> int:
+    """
+    Draws all the workflows of a batch, printing the time spent on each file and
+    the failures.
+
+    :return: The exit code, 1 if any workflow failed.
+    """
+    # Imported on use, like Faker and the render cache, to start the CLI fast
+    from .batch import find_workflow_files, render_batch
+    from .render_cache import RenderCache
+
+    sources = find_workflow_files(args.batch)
+    if not sources:
+        print(f"No workflow files found for '{args.batch}'", file=sys.stderr)
+        return 1
+
+    links = None if args.links == "none" else args.links
+    start = time.perf_counter()
+    failed = hits = 0
+    for result in render_batch(
+        sources,
+        args.output,
+        jobs=1 if args.profile else args.jobs,
+        layout=args.layout,
+        links=links,
+        cache_dir=args.cache_dir,
+        cache_size=_cache_size(args),
+        output_format=args.format,
+        precision=args.precision,
+        minify=args.minify,
+    ):
+        hits += bool(result.cached)
+        if result.ok:
+            print(f"{result.elapsed:8.3f}s {result.source} -> {result.output}")
+        else:
+            failed += 1
+            print(
+                f"{result.elapsed:8.3f}s {result.source} FAILED: {result.error}",
+                file=sys.stderr,
+            )
+
+    print(
+        f"{len(sources) - failed} drawn, {failed} failed "
+        f"in {time.perf_counter() - start:.3f}s"
+    )
+    if args.cache_dir:
+        stats = RenderCache(args.cache_dir).stats()
+        print(
+            f"Render cache: {hits} hits, {len(sources) - hits - failed} misses, "
+            f"{stats.entries} entries, {stats.size / 1024:.1f} KiB"
+        )
+    return 1 if failed else 0
+
+
+def _cache_size(args: argparse.Namespace) -> int:
+    return int(args.cache_size * 1024 * 1024)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv[:1] == ["serve"]:
+        return serve(argv[1:])
+    args = parse_args(argv)
+    if not args.profile:
+        return draw(args)
+    with profile() as profiler:
+        exit_code = draw(args)
+    print(profiler.report(), file=sys.stderr)
+    return exit_code
+
+
+def draw(args: argparse.Namespace) -> int:
+    """
+    Draws the mock workflow, the workflow or the batch of workflows of the
+    command line.
+
+    :return: The exit code.
+    """
+    if args.batch:
+        return draw_batch(args)
+    if args.workflow:
+        links = None if args.links == "none" else args.links
+        if args.tile_size:
+            canvas = render_workflow(args.workflow, layout=args.layout, links=links)
+            tiles = canvas.draw_tiles(args.output, args.tile_size, scale=args.scale)
+            print(f"{len(tiles)} tiles written in {args.output}")
+        elif args.stream:
+            if export_format(args.output) not in ("svg", "svgz"):
+                print("--stream only draws SVG and SVGZ files", file=sys.stderr)
+                return 1
+            draw_workflow(
+                args.workflow,
+                args.output,
+                layout=args.layout,
+                links=links,
+                precision=args.precision,
+                minify=args.minify,
+            )
+        elif args.cache_dir:
+            from .render_cache import RenderCache
+
+            cache = RenderCache(args.cache_dir, max_size=_cache_size(args))
+            cache.draw(
+                args.workflow,
+                args.output,
+                layout=args.layout,
+                links=links,
+                precision=args.precision,
+                minify=args.minify,
+            )
+            print(f"Render cache: {cache.stats()}")
+        else:
+            canvas = render_workflow(args.workflow, layout=args.layout, links=links)
+            save_canvas(
+                canvas, args.output, precision=args.precision, minify=args.minify
+            )
+    else:
+        draw_mock_workflow(args.output, precision=args.precision, minify=args.minify)
+    return 0
+
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,157 @@
+import time
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+# Returned by `timer` when profiling is off, a reusable context doing nothing
+_NO_TIMER = nullcontext()
+
+_active: Optional["Profiler"] = None
+
+
+class TimerStats(NamedTuple):
+    """
+    Time spent in a named phase.
+
+    :param calls: The number of times the phase ran.
+    :param total: The total time spent in the phase, in seconds.
+    """
+
+    calls: int
+    total: float
+
+
+class Profiler:
+    """
+    Collects the time spent in named phases of the rendering and the counts of
+    named events, like text measurements.
+
+    Phases nest: the time of a phase includes the time of the phases it runs,
+    like ``render.tasks`` includes ``task.fit_texts``.
+    """
+
+    def __init__(self):
+        self._timers: Dict[str, List[float]] = {}
+        self._counters: Dict[str, int] = {}
+        self._start = time.perf_counter()
+        self._stop: Optional[float] = None
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """
+        Times a phase, adding the time spent in the `with` block to the phase.
+        """
+        stats = self._timers.get(name)
+        if stats is None:
+            stats = self._timers[name] = [0, 0.0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stats[0] += 1
+            stats[1] += time.perf_counter() - start
+
+    def count(self, name: str, increment: int = 1) -> None:
+        """
+        Counts occurrences of an event.
+        """
+        self._counters[name] = self._counters.get(name, 0) + increment
+
+    def stop(self) -> None:
+        """
+        Stops the clock of the total elapsed time.
+        """
+        if self._stop is None:
+            self._stop = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        """
+        Returns the time since the profiler was created, until it was stopped.
+        """
+        stop = self._stop if self._stop is not None else time.perf_counter()
+        return stop - self._start
+
+    @property
+    def timers(self) -> Dict[str, TimerStats]:
+        """
+        Returns the statistics of the timed phases, in order of first run.
+        """
+        return {
+            name: TimerStats(int(calls), total)
+            for name, (calls, total) in self._timers.items()
+        }
+
+    @property
+    def counters(self) -> Dict[str, int]:
+        """
+        Returns the counts of the events, in order of first occurrence.
+        """
+        return dict(self._counters)
+
+    def report(self) -> str:
+        """
+        Returns a table of the time spent per phase and of the event counts.
+        The counts are also given per task when tasks were created.
+        """
+        elapsed = self.elapsed
+        lines = [
+            f"Profile: {elapsed:.3f}s",
+            f"{'Phase':<32} {'Calls':>9} {'Total ms':>11} {'%':>6}",
+        ]
+        for name, (calls, total) in self.timers.items():
+            percent = 100 * total / elapsed if elapsed else 0.0
+            lines.append(f"{name:<32} {calls:>9} {total * 1000:>11.2f} {percent:>6.1f}")
+
+        nb_tasks = self._counters.get("tasks", 0)
+        lines.append(f"{'Counter':<32} {'Count':>9} {'Per task':>11}")
+        for name, value in self._counters.items():
+            per_task = f"{value / nb_tasks:>11.1f}" if nb_tasks else f"{'':>11}"
+            lines.append(f"{name:<32} {value:>9} {per_task}")
+        return "\n".join(lines)
+
+
+@contextmanager
+def profile() -> Iterator[Profiler]:
+    """
+    Enables the instrumentation of the rendering in the `with` block.
+
+    .. code-block:: python
+
+        with profile() as profiler:
+            render_workflow("workflow.json").draw("workflow.svg")
+        print(profiler.report())
+    """
+    global _active
+    previous = _active
+    profiler = Profiler()
+    _active = profiler
+    try:
+        yield profiler
+    finally:
+        _active = previous
+        profiler.stop()
+
+
+def get_profiler() -> Optional[Profiler]:
+    """
+    Returns the profiler enabled by `profile`, or None when profiling is off.
+    """
+    return _active
+
+
+def timer(name: str) -> AbstractContextManager:
+    """
+    Returns a context manager timing a phase in the enabled profiler, or doing
+    nothing when profiling is off.
+    """
+    if _active is None:
+        return _NO_TIMER
+    return _active.timer(name)
+
+
+def count(name: str, increment: int = 1) -> None:
+    """
+    Counts occurrences of an event in the enabled profiler, if any.
+    """
+    if _active is not None:
+        _active.count(name, increment)
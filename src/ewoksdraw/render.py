@@ -0,0 +1,384 @@
+import gzip
+import math
+from io import TextIOWrapper
+from pathlib import Path
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    TextIO,
+    Tuple,
+    Union,
+)
+
+from .geometry import BoundingBox
+from .layout import LayeredLayout, grid_layout
+from .profiling import timer
+from .routing import LinkRouter
+from .svg import SvgBackground, SvgCanvas, SvgStyle, SvgTask, SvgTaskLink
+from .svg.svg_canvas import svg_attributes
+from .svg.svg_style import get_css_style
+from .svg.svg_writer import SvgWriter
+from .workflow import Workflow, load_workflow
+
+EXPORT_FORMATS = ("svg", "svgz", "pdf", "png")
+
+
+def iter_svg_tasks(workflow: Workflow) -> Iterator[Tuple[str, SvgTask]]:
+    """
+    Creates one SvgTask per workflow node, each when the previous one is
+    consumed.
+
+    :param workflow: The workflow to draw.
+    :return: The node identifiers and their tasks, in the order of the workflow
+             nodes.
+    """
+    for node_id, node in workflow.nodes.items():
+        yield node_id, SvgTask(
+            task_name=node.label,
+            input_names=node.input_names,
+            output_names=node.output_names,
+        )
+
+
+def build_svg_tasks(workflow: Workflow) -> Dict[str, SvgTask]:
+    """
+    Creates one SvgTask per workflow node.
+
+    :param workflow: The workflow to draw.
+    :return: The tasks by node identifier, in the order of the workflow nodes.
+    """
+    return dict(iter_svg_tasks(workflow))
+
+
+class TaskFootprint:
+    """
+    The size and anchor positions of a task, standing for the task in the
+    layouts and the link routing when the task itself is not kept.
+
+    :param task: The task, not translated.
+    :param anchors: If False, the anchor positions are not kept, for drawings
+                    without links.
+    """
+
+    __slots__ = ("width", "height", "translation", "_input_anchors", "_output_anchors")
+
+    def __init__(self, task: SvgTask, anchors: bool = True):
+        self.width = task.width
+        self.height = task.height
+        self.translation: Tuple[float, float] = (0, 0)
+        self._input_anchors: Dict[str, Tuple[float, float]] = {}
+        self._output_anchors: Dict[str, Tuple[float, float]] = {}
+        if anchors:
+            for name in task.input_names:
+                self._input_anchors[name] = task.input_anchor_position(name)
+            for name in task.output_names:
+                self._output_anchors[name] = task.output_anchor_position(name)
+
+    def set_translation(self, x: float = 0, y: float = 0) -> None:
+        self.translation = (x, y)
+
+    @property
+    def absolute_position(self) -> Tuple[float, float]:
+        return self.translation
+
+    def input_anchor_position(self, name: Optional[str] = None) -> Tuple[float, float]:
+        """
+        See `SvgTask.input_anchor_position`.
+        """
+        return self._anchor_position(self._input_anchors, name, 0)
+
+    def output_anchor_position(self, name: Optional[str] = None) -> Tuple[float, float]:
+        """
+        See `SvgTask.output_anchor_position`.
+        """
+        return self._anchor_position(self._output_anchors, name, self.width)
+
+    def _anchor_position(
+        self,
+        anchors: Mapping[str, Tuple[float, float]],
+        name: Optional[str],
+        default_x: float,
+    ) -> Tuple[float, float]:
+        x, y = self.translation
+        anchor = anchors.get(name) if name is not None else None
+        if anchor is None:
+            return x + default_x, y + self.height / 2
+        return x + anchor[0], y + anchor[1]
+
+
+def place_tasks(
+    workflow: Workflow,
+    tasks: Mapping[str, Union[SvgTask, TaskFootprint]],
+    layout: Literal["layered", "grid"] = "layered",
+) -> Tuple[float, float]:
+    """
+    Translates the tasks, or their footprints, to their place in the drawing.
+
+    :param workflow: The workflow to draw.
+    :param tasks: The tasks by node identifier.
+    :param layout: "layered" to place the tasks following the links, "grid" to
+                   place them on a grid in the order of the workflow nodes.
+    :return: The (width, height) needed to draw all the tasks.
+    """
+    if layout == "layered":
+        edges = ((link.source, link.target) for link in workflow.links)
+        return LayeredLayout().apply(tasks, edges)
+    if layout == "grid":
+        return grid_layout(list(tasks.values()))
+    raise ValueError(f"layout must be 'layered' or 'grid', got '{layout}'")
+
+
+def task_bounding_box(task: Union[SvgTask, TaskFootprint]) -> BoundingBox:
+    """
+    Returns the bounding box of a task box, in canvas coordinates.
+    """
+    x, y = task.absolute_position
+    return BoundingBox.from_size(x, y, task.width, task.height)
+
+
+def iter_svg_links(
+    workflow: Workflow,
+    tasks: Mapping[str, Union[SvgTask, TaskFootprint]],
+    routing: Literal["orthogonal", "spline"] = "orthogonal",
+) -> Iterator[SvgTaskLink]:
+    """
+    Creates the links between the placed tasks, or their footprints, routed
+    around the task boxes, each when the previous one is consumed. See
+    `build_svg_links`.
+    """
+    router = LinkRouter(task_bounding_box(task) for task in tasks.values())
+    for link in workflow.links:
+        source, target = tasks[link.source], tasks[link.target]
+        mapping = link.data_mapping or [(None, None)]
+        for source_output, target_input in mapping:
+            points = router.route(
+                source.output_anchor_position(source_output),
+                target.input_anchor_position(target_input),
+            )
+            yield SvgTaskLink(points, routing)
+
+
+def build_svg_links(
+    workflow: Workflow,
+    tasks: Mapping[str, SvgTask],
+    routing: Literal["orthogonal", "spline"] = "orthogonal",
+) -> List[SvgTaskLink]:
+    """
+    Creates the links between the placed tasks, routed around the task boxes.
+
+    Each data mapping of a workflow link is drawn from the output anchor to the
+    input anchor. Links without data mapping are drawn between the sides of the
+    task boxes.
+
+    :param workflow: The workflow to draw.
+    :param tasks: The placed tasks by node identifier.
+    :param routing: "orthogonal" or "spline" drawing of the routes.
+    """
+    return list(iter_svg_links(workflow, tasks, routing))
+
+
+def render_workflow(
+    workflow: Union[Workflow, str, Path, Mapping[str, Any]],
+    *,
+    layout: Literal["layered", "grid"] = "layered",
+    links: Optional[Literal["orthogonal", "spline"]] = "orthogonal",
+) -> SvgCanvas:
+    """
+    Creates the SVG canvas drawing a workflow.
+
+    :param workflow: The workflow, a workflow file name or a workflow description.
+    :param layout: "layered" to place the tasks following the links, "grid" to
+                   place them on a grid in the order of the workflow nodes.
+    :param links: "orthogonal" or "spline" drawing of the links, None to not
+                  draw them.
+    """
+    if not isinstance(workflow, Workflow):
+        with timer("render.load"):
+            workflow = load_workflow(workflow)
+
+    with timer("render.tasks"):
+        tasks = build_svg_tasks(workflow)
+    with timer("render.layout"):
+        width, height = place_tasks(workflow, tasks, layout)
+
+    canvas = SvgCanvas(width=0, height=0)
+    canvas.add_element(SvgBackground(0, 0))
+    if links is not None:
+        with timer("render.links"):
+            svg_links = build_svg_links(workflow, tasks, links)
+        for svg_link in svg_links:
+            canvas.add_element(svg_link)
+    for task in tasks.values():
+        canvas.add_element(task)
+    canvas.grow_to_fit(math.ceil(width), math.ceil(height))
+    return canvas
+
+
+def write_workflow(
+    workflow: Union[Workflow, str, Path, Mapping[str, Any]],
+    stream: TextIO,
+    *,
+    layout: Literal["layered", "grid"] = "layered",
+    links: Optional[Literal["orthogonal", "spline"]] = "orthogonal",
+    indent: Optional[str] = "  ",
+    precision: Optional[int] = None,
+    minify: bool = False,
+) -> None:
+    """
+    Draws a workflow straight to a text stream as an SVG document, the same as
+    written by `render_workflow` and `SvgCanvas.write`, without keeping the
+    drawing in memory.
+
+    The tasks are created a first time to place them and route the links, only
+    keeping their `TaskFootprint`. The stylesheets are written first, then each
+    link and each task, created again, as soon as it is drawn. The second
+    creation of a task reuses the fitting of its texts from the task layout
+    cache, unless the workflow has more task signatures than the cache holds.
+
+    :param workflow: The workflow, a workflow file name or a workflow description.
+    :param stream: The text stream to write the SVG document to.
+    :param layout: "layered" or "grid" placement of the tasks.
+    :param links: "orthogonal" or "spline" drawing of the links, None to not
+                  draw them.
+    :param indent: The indentation of one nesting level, None for compact output.
+    :param precision: The number of decimals of the SVG coordinates, None to not
+                      round them.
+    :param minify: If True, the document is written as small as possible.
+    """
+    if not isinstance(workflow, Workflow):
+        with timer("render.load"):
+            workflow = load_workflow(workflow)
+
+    task_styles: Dict[str, SvgStyle] = {}
+    footprints: Dict[str, TaskFootprint] = {}
+    with timer("render.tasks"):
+        for node_id, task in iter_svg_tasks(workflow):
+            for style in task.styles:
+                task_styles.setdefault(style.css_class, style)
+            footprints[node_id] = TaskFootprint(task, anchors=links is not None)
+    with timer("render.layout"):
+        width, height = place_tasks(workflow, footprints, layout)
+    width, height = math.ceil(width), math.ceil(height)
+
+    # The styles in order of first use, as gathered by SvgCanvas
+    background = SvgBackground(width, height)
+    styles = [background.style]
+    if links is not None and workflow.links:
+        styles.append(get_css_style("task_link"))
+    styles.extend(task_styles.values())
+    styles = list({style.css_class: style for style in styles if style}.values())
+
+    def elements():
+        yield background
+        if links is not None:
+            yield from iter_svg_links(workflow, footprints, links)
+        for node_id, task in iter_svg_tasks(workflow):
+            task.set_translation(*footprints[node_id].translation)
+            yield task
+
+    with timer("serialize.svg"):
+        writer = SvgWriter(stream, indent=indent, precision=precision, minify=minify)
+        writer.write_document(svg_attributes(width, height), styles, elements())
+
+
+def draw_workflow(
+    workflow: Union[Workflow, str, Path, Mapping[str, Any]],
+    filename: Union[str, Path],
+    **options: Any,
+) -> None:
+    """
+    Draws a workflow straight to an SVG file, gzip compressed while it is
+    written if the file name ends with ``.svgz``, see `write_workflow`.
+
+    :param options: The keyword arguments of `write_workflow`.
+    """
+    output_format = export_format(filename)
+    if output_format not in ("svg", "svgz"):
+        raise ValueError(
+            f"workflows are drawn straight to SVG files only, got '{filename}'"
+        )
+
+    def write(binary_stream: BinaryIO) -> None:
+        stream = TextIOWrapper(binary_stream, encoding="utf-8")
+        write_workflow(workflow, stream, **options)
+        stream.flush()
+        stream.detach()
+
+    with open(filename, "wb") as file:
+        if output_format == "svg":
+            write(file)
+            return
+        with gzip.GzipFile(filename="", fileobj=file, mode="wb", mtime=0) as compressed:
+            write(compressed)
+
+
+def export_format(filename: Union[str, Path]) -> str:
+    """
+    Returns the export format of a file from its suffix: "svgz", "pdf", "png", or
+    "svg" for any other suffix.
+    """
+    suffix = Path(filename).suffix.lower().lstrip(".")
+    return suffix if suffix in EXPORT_FORMATS else "svg"
+
+
+def write_canvas(
+    canvas: SvgCanvas,
+    stream: BinaryIO,
+    output_format: str = "svg",
+    *,
+    precision: Optional[int] = None,
+    minify: bool = False,
+):
+    """
+    Writes a canvas to a binary stream as an SVG document, possibly gzip
+    compressed, a PDF document or a PNG image.
+
+    :param output_format: One of `EXPORT_FORMATS`.
+    :param precision: The number of decimals of the SVG coordinates, None to not
+                      round them.
+    :param minify: If True, SVG documents are written as small as possible.
+    """
+    if output_format == "svg":
+        text_stream = TextIOWrapper(stream, encoding="utf-8")
+        canvas.write(text_stream, precision=precision, minify=minify)
+        text_stream.flush()
+        text_stream.detach()
+    elif output_format == "svgz":
+        canvas.write_svgz(stream, precision=precision, minify=minify)
+    elif output_format == "pdf":
+        canvas.write_pdf(stream)
+    elif output_format == "png":
+        canvas.write_png(stream)
+    else:
+        raise ValueError(
+            f"output_format must be one of {EXPORT_FORMATS}, got '{output_format}'"
+        )
+
+
+def save_canvas(
+    canvas: SvgCanvas,
+    filename: Union[str, Path],
+    *,
+    precision: Optional[int] = None,
+    minify: bool = False,
+) -> None:
+    """
+    Saves a canvas to a file, in the format given by the file suffix (see
+    `export_format`).
+
+    :param precision: The number of decimals of the SVG coordinates, None to not
+                      round them.
+    :param minify: If True, SVG documents are written as small as possible.
+    """
+    output_format = export_format(filename)
+    if output_format in ("svg", "svgz"):
+        canvas.draw(filename, precision=precision, minify=minify)
+        return
+    with open(filename, "wb") as file:
+        write_canvas(canvas, file, output_format)
@@ -0,0 +1,298 @@
+import hashlib
+import json
+import os
+import tempfile
+from functools import lru_cache
+from io import BytesIO
+from importlib import metadata
+from importlib.resources import files
+from pathlib import Path
+from typing import Any, Dict, Mapping, NamedTuple, Optional, Tuple, Union
+
+from .config import constants
+from .render import export_format, render_workflow, write_canvas
+from .svg.font_metrics import get_font_registry
+
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+# Number of stores between two scans of the cache directory, which catch the
+# entries added by other processes
+_RESCAN_INTERVAL = 64
+
+
+class RenderCacheStats(NamedTuple):
+    """
+    Statistics of a render cache.
+
+    :param hits: The number of renders served from the cache.
+    :param misses: The number of renders not found in the cache.
+    :param evictions: The number of entries removed to stay within the size bound.
+    :param entries: The number of entries in the cache directory.
+    :param size: The total size of the entries, in bytes.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size: int
+
+    def __str__(self) -> str:
+        lookups = self.hits + self.misses
+        ratio = self.hits / lookups if lookups else 0.0
+        return (
+            f"{self.hits} hits, {self.misses} misses ({ratio:.0%} hit rate), "
+            f"{self.evictions} evictions, {self.entries} entries, "
+            f"{self.size / 1024:.1f} KiB"
+        )
+
+
+@lru_cache(maxsize=None)
+def environment_digest() -> str:
+    """
+    Returns a hash of everything, besides the workflow, that changes the drawing:
+    the ewoksdraw version, the CSS stylesheets, the bundled font metrics and the
+    layout constants. It is computed once per process, so it does not cover the
+    fonts registered at run time (see `RenderCache.key`).
+    """
+    digest = hashlib.sha256()
+    try:
+        digest.update(metadata.version("ewoksdraw").encode())
+    except metadata.PackageNotFoundError:
+        pass
+
+    for directory, suffix in (("css_styles", ".css"), ("fonts", ".json")):
+        data_files = sorted(
+            (files("ewoksdraw") / directory).iterdir(), key=lambda file: file.name
+        )
+        for data_file in data_files:
+            if data_file.name.endswith(suffix):
+                digest.update(data_file.name.encode())
+                digest.update(data_file.read_bytes())
+
+    values = {name: value for name, value in vars(constants).items() if name.isupper()}
+    digest.update(json.dumps(values, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def workflow_digest(workflow: Union[str, Path, Mapping[str, Any]]) -> str:
+    """
+    Returns a hash of a workflow file content or of a workflow description.
+    """
+    digest = hashlib.sha256()
+    if isinstance(workflow, Mapping):
+        digest.update(b"dict:")
+        digest.update(json.dumps(workflow, sort_keys=True, default=str).encode())
+    else:
+        filename = Path(workflow)
+        digest.update(f"file{filename.suffix.lower()}:".encode())
+        digest.update(filename.read_bytes())
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """
+    On-disk cache of rendered documents, SVG or their PDF and PNG exports,
+    addressed by a hash of the workflow, of the render options and of the
+    drawing environment (see `environment_digest`).
+
+    Entries are files of the cache directory, so the cache can be shared between
+    processes and builds. When the total size exceeds `max_size`, the least
+    recently used entries are removed.
+
+    :param directory: The cache directory, created if needed.
+    :param max_size: The maximum total size of the entries, in bytes.
+    """
+
+    def __init__(
+        self, directory: Union[str, Path], *, max_size: int = DEFAULT_MAX_SIZE
+    ):
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._max_size = max_size
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._size: Optional[int] = None
+        self._puts_since_scan = 0
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    def key(self, workflow: Union[str, Path, Mapping[str, Any]], **options: Any) -> str:
+        """
+        Returns the cache key of a workflow rendered with the given options and
+        the fonts registered so far.
+        """
+        digest = hashlib.sha256()
+        digest.update(environment_digest().encode())
+        digest.update(get_font_registry().digest.encode())
+        digest.update(workflow_digest(workflow).encode())
+        digest.update(json.dumps(options, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Returns the cached document of a key, or None on a miss.
+        """
+        path = self._entry_path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            self._misses += 1
+            return None
+        self._hits += 1
+        try:
+            # The modification time orders the entries for eviction
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """
+        Stores the document of a key, then evicts entries if the cache is too
+        large. The entry is written atomically so that concurrent readers never
+        see a partial document.
+        """
+        path = self._entry_path(key)
+        path.parent.mkdir(exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(tmp_name, path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+
+        self._puts_since_scan += 1
+        if self._size is None or self._puts_since_scan >= _RESCAN_INTERVAL:
+            self._scan()
+        else:
+            self._size += len(data)
+        if self._size > self._max_size:
+            self._evict()
+
+    def draw(
+        self,
+        workflow: Union[str, Path, Mapping[str, Any]],
+        filename: Union[str, Path],
+        *,
+        precision: Optional[int] = None,
+        minify: bool = False,
+        **options: Any,
+    ) -> bool:
+        """
+        Writes the SVG, SVGZ, PDF or PNG file of a workflow, from the cache if
+        possible.
+
+        :param workflow: The workflow file name or workflow description.
+        :param filename: The file to write, its suffix gives the format (see
+                         `ewoksdraw.render.export_format`).
+        :param precision: The number of decimals of the SVG coordinates, None to
+                          not round them.
+        :param minify: If True, SVG documents are written as small as possible.
+        :param options: The keyword arguments of `render_workflow`.
+        :return: True if the document was found in the cache.
+        """
+        output_format = export_format(filename)
+        write_options: Dict[str, Any] = {}
+        if output_format != "svg":
+            write_options["format"] = output_format
+        if precision is not None:
+            write_options["precision"] = precision
+        if minify:
+            write_options["minify"] = minify
+        key = self.key(workflow, **options, **write_options)
+        data = self.get(key)
+        hit = data is not None
+        if data is None:
+            stream = BytesIO()
+            write_canvas(
+                render_workflow(workflow, **options),
+                stream,
+                output_format,
+                precision=precision,
+                minify=minify,
+            )
+            data = stream.getvalue()
+            self.put(key, data)
+        with open(filename, "wb") as file:
+            file.write(data)
+        return hit
+
+    def stats(self) -> RenderCacheStats:
+        """
+        Returns the lookups statistics of this cache instance and the current
+        content of the cache directory.
+        """
+        entries = self._entries()
+        return RenderCacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            entries=len(entries),
+            size=sum(size for _, size in entries.values()),
+        )
+
+    def clear(self) -> None:
+        """
+        Removes all the entries.
+        """
+        for path in self._entries():
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+        self._size = 0
+
+    def _entry_path(self, key: str) -> Path:
+        # Any export format, the key tells which one
+        return self._directory / key[:2] / f"{key}.bin"
+
+    def _entries(self) -> Dict[Path, Tuple[float, int]]:
+        """
+        Returns the (modification time, size) of the entries by path.
+        """
+        entries = {}
+        for path in self._directory.glob("??/*.bin"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries[path] = (stat.st_mtime, stat.st_size)
+        return entries
+
+    def _scan(self) -> None:
+        self._size = sum(size for _, size in self._entries().values())
+        self._puts_since_scan = 0
+
+    def _evict(self) -> None:
+        """
+        Removes the least recently used entries until the cache fits in its
+        maximum size.
+        """
+        entries = self._entries()
+        size = sum(size for _, size in entries.values())
+        for path, (_, entry_size) in sorted(entries.items(), key=lambda item: item[1]):
+            if size <= self._max_size:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            size -= entry_size
+            self._evictions += 1
+        self._size = size
+        self._puts_since_scan = 0
+
+
+@lru_cache(maxsize=None)
+def get_render_cache(
+    directory: Union[str, Path], max_size: int = DEFAULT_MAX_SIZE
+) -> RenderCache:
+    """
+    Returns the render cache of a directory shared by the calls of a process.
+    """
+    return RenderCache(directory, max_size=max_size)
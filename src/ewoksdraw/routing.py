@@ -0,0 +1,186 @@
+import heapq
+from typing import Iterable, List, Literal, Sequence, Tuple
+
+from .geometry import BoundingBox, SpatialIndex
+
+Point = Tuple[float, float]
+
+LINK_CLEARANCE = 8
+MAX_LANE_CANDIDATES = 64
+
+
+class LinkRouter:
+    """
+    Routes links between task anchors with orthogonal segments that avoid the
+    task boxes.
+
+    The task boxes are kept in a spatial index, so that checking a route only
+    looks at the boxes near its segments and routing many links does not cost
+    links x tasks box tests.
+
+    :param obstacles: The bounding boxes of the tasks.
+    :param clearance: The length of the straight segments leaving and entering
+                      the anchors, and the distance kept from the boxes when
+                      going around them.
+    """
+
+    def __init__(
+        self,
+        obstacles: Iterable[BoundingBox],
+        *,
+        clearance: float = LINK_CLEARANCE,
+    ):
+        self._index: SpatialIndex[int] = SpatialIndex.from_boxes(enumerate(obstacles))
+        self._clearance = clearance
+
+    def route(self, start: Point, end: Point) -> List[Point]:
+        """
+        Computes the points of an orthogonal route from an output anchor (link
+        leaving to the right) to an input anchor (link entering from the left).
+
+        A three segment route with one vertical segment is used when it is free.
+        Otherwise the route goes through a horizontal lane, free of boxes,
+        between the anchors.
+
+        :param start: The position of the output anchor.
+        :param end: The position of the input anchor.
+        :return: The route points, from start to end.
+        """
+        (start_x, start_y), (end_x, end_y) = start, end
+        exit_x = start_x + self._clearance
+        entry_x = end_x - self._clearance
+
+        if exit_x <= entry_x:
+            for x in ((exit_x + entry_x) / 2, exit_x, entry_x):
+                points = [start, (x, start_y), (x, end_y), end]
+                if self.is_free(points):
+                    return _simplify(points)
+
+        for lane_y in self._lane_candidates(exit_x, entry_x, start_y, end_y):
+            points = [
+                start,
+                (exit_x, start_y),
+                (exit_x, lane_y),
+                (entry_x, lane_y),
+                (entry_x, end_y),
+                end,
+            ]
+            if self.is_free(points):
+                return _simplify(points)
+
+        middle_x = (exit_x + entry_x) / 2
+        return _simplify([start, (middle_x, start_y), (middle_x, end_y), end])
+
+    def is_free(self, points: Sequence[Point]) -> bool:
+        """
+        Returns True if no segment of the route goes through a box. Segments
+        along a box border are free.
+        """
+        return not any(
+            self._index.intersects_any(_segment_box(p1, p2))
+            for p1, p2 in zip(points, points[1:])
+        )
+
+    def _lane_candidates(
+        self, x1: float, x2: float, y1: float, y2: float
+    ) -> Iterable[float]:
+        """
+        Yields the y positions of horizontal lanes to try, closest to the anchors
+        first. The lanes just above and below each box blocking a lane are added
+        as new candidates.
+        """
+        x_min, x_max = min(x1, x2), max(x1, x2)
+        y_min, y_max = min(y1, y2), max(y1, y2)
+
+        def cost(y: float) -> float:
+            return max(y_min - y, 0) + max(y - y_max, 0)
+
+        candidates = [(cost(y), y) for y in (y1, y2)]
+        heapq.heapify(candidates)
+        tried = set()
+        while candidates and len(tried) < MAX_LANE_CANDIDATES:
+            _, y = heapq.heappop(candidates)
+            if y in tried:
+                continue
+            tried.add(y)
+
+            blockers = self._index.query_boxes(BoundingBox(x_min, y, x_max, y))
+            if not blockers:
+                yield y
+                continue
+            for _, box in blockers:
+                for lane in (
+                    box.y_min - self._clearance,
+                    box.y_max + self._clearance,
+                ):
+                    if lane not in tried:
+                        heapq.heappush(candidates, (cost(lane), lane))
+
+
+def path_data(
+    points: Sequence[Point], routing: Literal["orthogonal", "spline"] = "orthogonal"
+) -> str:
+    """
+    Returns the SVG path data drawing a route.
+
+    :param points: The route points.
+    :param routing: "orthogonal" for straight segments, "spline" for a smooth
+                    curve following the route.
+    """
+    start = points[0]
+    commands = [f"M{_format_point(start)}"]
+    if routing == "orthogonal" or len(points) == 2:
+        commands.extend(f"L{_format_point(point)}" for point in points[1:])
+    elif len(points) == 4:
+        # S-curve with tangents along the first and last segments
+        commands.append(
+            f"C{_format_point(points[1])} {_format_point(points[2])} "
+            f"{_format_point(points[3])}"
+        )
+    else:
+        for previous, corner, following in zip(points, points[1:], points[2:]):
+            commands.append(f"L{_format_point(_midpoint(previous, corner))}")
+            commands.append(
+                f"Q{_format_point(corner)} "
+                f"{_format_point(_midpoint(corner, following))}"
+            )
+        commands.append(f"L{_format_point(points[-1])}")
+    return " ".join(commands)
+
+
+def _segment_box(p1: Point, p2: Point) -> BoundingBox:
+    return BoundingBox(
+        min(p1[0], p2[0]), min(p1[1], p2[1]), max(p1[0], p2[0]), max(p1[1], p2[1])
+    )
+
+
+def _simplify(points: List[Point]) -> List[Point]:
+    """
+    Removes repeated points and points in the middle of straight lines.
+    """
+    result: List[Point] = []
+    for point in points:
+        if result and point == result[-1]:
+            continue
+        if len(result) >= 2 and _aligned(result[-2], result[-1], point):
+            result[-1] = point
+        else:
+            result.append(point)
+    return result
+
+
+def _aligned(p1: Point, p2: Point, p3: Point) -> bool:
+    return (p1[0] == p2[0] == p3[0]) or (p1[1] == p2[1] == p3[1])
+
+
+def _midpoint(p1: Point, p2: Point) -> Point:
+    return (p1[0] + p2[0]) / 2, (p1[1] + p2[1]) / 2
+
+
+def _format_point(point: Point) -> str:
+    return f"{_format_number(point[0])},{_format_number(point[1])}"
+
+
+def _format_number(value: float) -> str:
+    text = f"{value:.2f}".rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
@@ -0,0 +1,409 @@
+import json
+import math
+import os
+import stat
+import threading
+import time
+from collections import deque
+from concurrent.futures import (
+    BrokenExecutor,
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from socketserver import ThreadingMixIn, UnixStreamServer
+from typing import Any, Dict, Iterable, Literal, Mapping, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .batch import warm_up
+from .render import EXPORT_FORMATS, render_workflow, write_canvas
+
+DEFAULT_PORT = 8000
+# Largest workflow description accepted, in bytes
+MAX_REQUEST_SIZE = 64 * 1024 * 1024
+# Number of last requests the latency percentiles are computed on
+STATS_WINDOW = 1000
+
+CONTENT_TYPES = {
+    "svg": "image/svg+xml",
+    "svgz": "image/svg+xml",
+    "pdf": "application/pdf",
+    "png": "image/png",
+}
+
+
+def render_document(
+    workflow: Mapping[str, Any],
+    output_format: str = "svg",
+    *,
+    layout: Literal["layered", "grid"] = "layered",
+    links: Optional[Literal["orthogonal", "spline"]] = "orthogonal",
+    precision: Optional[int] = None,
+    minify: bool = False,
+) -> Tuple[bytes, float]:
+    """
+    Draws a workflow description in memory.
+
+    :param workflow: The workflow description, as in an Ewoks JSON file. File
+                     names are not accepted, so that clients cannot draw the
+                     files of the server.
+    :param output_format: One of `EXPORT_FORMATS`.
+    :return: The document and the time spent drawing it, in seconds.
+    :raises TypeError: If the workflow is not a mapping.
+    """
+    if not isinstance(workflow, Mapping):
+        raise TypeError(
+            f"the workflow must be a mapping, got {type(workflow).__name__}"
+        )
+    start = time.perf_counter()
+    canvas = render_workflow(workflow, layout=layout, links=links)
+    stream = BytesIO()
+    write_canvas(canvas, stream, output_format, precision=precision, minify=minify)
+    return stream.getvalue(), time.perf_counter() - start
+
+
+def parse_render_options(query: str) -> Dict[str, Any]:
+    """
+    Returns the `render_document` options of a request query string, like
+    ``format=svgz&layout=grid&links=none&precision=1&minify=1``.
+
+    :raises ValueError: For an unknown option or an invalid value.
+    """
+    options = {}
+    for name, values in parse_qs(query, keep_blank_values=True).items():
+        value = values[-1]
+        if name == "format":
+            if value not in EXPORT_FORMATS:
+                raise ValueError(f"format must be one of {EXPORT_FORMATS}")
+            options["output_format"] = value
+        elif name == "layout":
+            if value not in ("layered", "grid"):
+                raise ValueError("layout must be 'layered' or 'grid'")
+            options["layout"] = value
+        elif name == "links":
+            if value not in ("orthogonal", "spline", "none"):
+                raise ValueError("links must be 'orthogonal', 'spline' or 'none'")
+            options["links"] = None if value == "none" else value
+        elif name == "precision":
+            options["precision"] = int(value)
+        elif name == "minify":
+            options["minify"] = value.lower() in ("", "1", "true", "yes")
+        else:
+            raise ValueError(f"unknown option '{name}'")
+    return options
+
+
+def _summarize(values: Iterable[float]) -> Dict[str, float]:
+    """
+    Returns the mean, median, 90th and 99th percentiles and maximum of durations
+    in seconds, in milliseconds.
+    """
+    values = sorted(values)
+    if not values:
+        return {}
+
+    def percentile(p: float) -> float:
+        return values[max(math.ceil(p * len(values)) - 1, 0)]
+
+    summary = {
+        "mean": sum(values) / len(values),
+        "p50": percentile(0.5),
+        "p90": percentile(0.9),
+        "p99": percentile(0.99),
+        "max": values[-1],
+    }
+    return {name: round(value * 1000, 3) for name, value in summary.items()}
+
+
+class LatencyStats:
+    """
+    Latencies of the render requests of a server, shared by the request
+    threads.
+
+    The latency of a request is the time from reading it to having its document,
+    the render time is the part spent drawing, the rest being spent waiting for
+    a worker and transferring the workflow and the document. The percentiles are
+    computed on the last `window` requests.
+    """
+
+    def __init__(self, window: int = STATS_WINDOW) -> None:
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self._render_times = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+
+    def add(self, latency: float, render_time: Optional[float] = None) -> None:
+        """
+        Records a request, failed when its render time is None.
+        """
+        with self._lock:
+            self.requests += 1
+            if render_time is None:
+                self.errors += 1
+                return
+            self._latencies.append(latency)
+            self._render_times.append(render_time)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Returns the number of requests and errors and the latency and render
+        time statistics in milliseconds, as served by ``GET /stats``.
+        """
+        with self._lock:
+            latencies = list(self._latencies)
+            render_times = list(self._render_times)
+            requests, errors = self.requests, self.errors
+        return {
+            "requests": requests,
+            "errors": errors,
+            "latency_ms": _summarize(latencies),
+            "render_ms": _summarize(render_times),
+        }
+
+
+def create_executor(jobs: Optional[int] = None) -> Executor:
+    """
+    Returns the worker pool drawing the requests of a server, warmed up once
+    (see `warm_up`) and keeping its caches between requests.
+
+    :param jobs: The number of worker processes, defaults to the number of CPUs.
+                 With 1, the requests are drawn one at a time by a thread of the
+                 current process, without the cost of sending the workflows and
+                 the documents to another process.
+    """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs <= 1:
+        warm_up()
+        return ThreadPoolExecutor(max_workers=1)
+    return ProcessPoolExecutor(max_workers=jobs, initializer=warm_up)
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    """
+    Draws the workflow descriptions posted to ``/render`` (or ``/``), with the
+    options of `parse_render_options` in the query string, and serves the
+    request statistics on ``GET /stats``.
+
+    The latency of each request is returned in a ``Server-Timing`` header.
+    """
+
+    server_version = "ewoksdraw"
+    # Keeps the connections open, so that clients do not connect per request
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        path = urlsplit(self.path).path
+        if path == "/stats":
+            self._send_json(HTTPStatus.OK, self.server.stats.summary())
+        elif path == "/health":
+            self._send_json(HTTPStatus.OK, {"status": "ok"})
+        else:
+            self._send_error(HTTPStatus.NOT_FOUND, f"no such resource '{path}'")
+
+    def do_POST(self) -> None:
+        start = time.perf_counter()
+        url = urlsplit(self.path)
+        # The body is not read on errors, the connection cannot be reused
+        self.close_connection = True
+        if url.path not in ("/", "/render"):
+            self._send_error(HTTPStatus.NOT_FOUND, f"no such resource '{url.path}'")
+            return
+        length = self.headers.get("Content-Length", "")
+        if not length.isdigit():
+            self._send_error(HTTPStatus.LENGTH_REQUIRED, "Content-Length required")
+            return
+        if int(length) > MAX_REQUEST_SIZE:
+            self._send_error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "workflow too large")
+            return
+        body = self.rfile.read(int(length))
+        self.close_connection = False
+
+        try:
+            options = parse_render_options(url.query)
+            workflow = json.loads(body)
+            if not isinstance(workflow, dict):
+                raise ValueError("the workflow must be a JSON object")
+        except ValueError as e:
+            self.server.stats.add(time.perf_counter() - start)
+            self._send_error(HTTPStatus.BAD_REQUEST, str(e))
+            return
+
+        try:
+            document, render_time = self.server.executor.submit(
+                render_document, workflow, **options
+            ).result()
+        except BrokenExecutor as e:
+            self.server.stats.add(time.perf_counter() - start)
+            self._send_error(HTTPStatus.SERVICE_UNAVAILABLE, str(e))
+            return
+        except Exception as e:
+            self.server.stats.add(time.perf_counter() - start)
+            self._send_error(
+                HTTPStatus.UNPROCESSABLE_ENTITY, f"{type(e).__name__}: {e}"
+            )
+            return
+        latency = time.perf_counter() - start
+        self.server.stats.add(latency, render_time)
+
+        output_format = options.get("output_format", "svg")
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", CONTENT_TYPES[output_format])
+        if output_format == "svgz":
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(document)))
+        self.send_header(
+            "Server-Timing",
+            f"render;dur={render_time * 1000:.3f}, total;dur={latency * 1000:.3f}",
+        )
+        self.end_headers()
+        self.wfile.write(document)
+
+    def _send_json(self, status: HTTPStatus, data: Mapping[str, Any]) -> None:
+        content = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _send_error(self, status: HTTPStatus, message: str) -> None:
+        self._send_json(status, {"error": message})
+
+    def address_string(self) -> str:
+        # Clients of Unix sockets have no address
+        if isinstance(self.client_address, tuple):
+            return super().address_string()
+        return "local"
+
+    def log_message(self, format: str, *args) -> None:
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class _RenderServerMixin:
+    """
+    State shared by the request threads of a render server: the worker pool and
+    the request statistics.
+    """
+
+    daemon_threads = True
+
+    def _setup(self, jobs: Optional[int], quiet: bool) -> None:
+        self.executor = create_executor(jobs)
+        self.stats = LatencyStats()
+        self.quiet = quiet
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.executor.shutdown(cancel_futures=True)
+
+
+class RenderServer(_RenderServerMixin, ThreadingHTTPServer):
+    """
+    HTTP render server on a TCP address, handling each connection in a thread
+    and drawing with a pool of warm workers (see `create_executor`).
+    """
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        *,
+        jobs: Optional[int] = None,
+        quiet: bool = False,
+    ) -> None:
+        super().__init__(address, RenderRequestHandler)
+        self._setup(jobs, quiet)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class UnixRenderServer(_RenderServerMixin, ThreadingMixIn, UnixStreamServer):
+    """
+    HTTP render server on a Unix socket, only reachable from the local machine.
+    """
+
+    def __init__(
+        self, path: str, *, jobs: Optional[int] = None, quiet: bool = False
+    ) -> None:
+        _remove_socket(path)
+        super().__init__(path, RenderRequestHandler)
+        self._setup(jobs, quiet)
+
+    @property
+    def url(self) -> str:
+        return f"unix:{self.server_address}"
+
+    def server_close(self) -> None:
+        super().server_close()
+        _remove_socket(self.server_address)
+
+
+def _remove_socket(path: str) -> None:
+    """
+    Removes the socket left at a path by a previous server.
+
+    :raises FileExistsError: If the path is not a socket, as it could be any
+                             file given by mistake.
+    """
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"'{path}' exists and is not a socket")
+    os.unlink(path)
+
+
+def create_server(
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_PORT,
+    *,
+    socket_path: Optional[str] = None,
+    jobs: Optional[int] = None,
+    quiet: bool = False,
+):
+    """
+    Creates a render server, started with ``serve_forever`` and stopped with
+    ``shutdown`` and ``server_close``.
+
+    :param host: The host name or address to listen on.
+    :param port: The port to listen on, 0 for any free port.
+    :param socket_path: The path of a Unix socket to listen on instead of a TCP
+                        port.
+    :param jobs: The number of worker processes, see `create_executor`.
+    :param quiet: If True, the requests are not logged.
+    """
+    if socket_path:
+        return UnixRenderServer(socket_path, jobs=jobs, quiet=quiet)
+    return RenderServer((host, port), jobs=jobs, quiet=quiet)
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_PORT,
+    *,
+    socket_path: Optional[str] = None,
+    jobs: Optional[int] = None,
+    quiet: bool = False,
+) -> None:
+    """
+    Runs a render server until interrupted, see `create_server`.
+    """
+    server = create_server(host, port, socket_path=socket_path, jobs=jobs, quiet=quiet)
+    print(f"Drawing the workflows posted to /render on {server.url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
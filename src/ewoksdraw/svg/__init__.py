@@ -2,9 +2,11 @@ from .svg_background import SvgBackground  # noqa: F401
 from .svg_canvas import SvgCanvas  # noqa: F401
 from .svg_element import SvgElement  # noqa: F401
 from .svg_group import SvgGroup  # noqa: F401
+from .svg_style import SvgStyle  # noqa: F401
 from .svg_task import SvgTask  # noqa: F401
 from .svg_task_anchor_link import SvgTaskAnchorLink  # noqa: F401
 from .svg_task_box import SvgTaskBox  # noqa: F401
 from .svg_task_io import SvgTaskIO  # noqa: F401
+from .svg_task_link import SvgTaskLink  # noqa: F401
 from .svg_task_title import SvgTaskTitle  # noqa: F401
 from .svg_text import SvgText  # noqa: F401
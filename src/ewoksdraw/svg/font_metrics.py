@@ -0,0 +1,649 @@
+import hashlib
+import json
+import re
+import threading
+import struct
+import unicodedata
+import warnings
+from importlib.resources import files
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+DEFAULT_FONT = "Helvetica"
+
+# Metrics tables shipped in the package fonts directory
+BUNDLED_FONTS = {
+    "Helvetica": "helvetica.json",
+    "Helvetica-Bold": "helvetica_bold.json",
+    "Times-Roman": "times_roman.json",
+    "Courier": "courier.json",
+}
+
+# Font families measured with a bundled font of the same advance widths
+FONT_ALIASES = {
+    "sans-serif": "Helvetica",
+    "Arial": "Helvetica",
+    "Liberation Sans": "Helvetica",
+    "serif": "Times-Roman",
+    "Times": "Times-Roman",
+    "Times New Roman": "Times-Roman",
+    "Liberation Serif": "Times-Roman",
+    "monospace": "Courier",
+    "Courier New": "Courier",
+    "Liberation Mono": "Courier",
+}
+
+_UNITS_PER_EM = 1000
+
+_AFM_CHAR_METRICS = re.compile(r"\bC\s+(-?\d+)\s*;\s*WX\s+([\d.]+)\s*;\s*N\s+(\S+)")
+_AFM_UNICODE_NAME = re.compile(r"uni([0-9A-F]{4})$|u([0-9A-F]{4,6})$")
+_LATIN_ACCENTED_LETTER = re.compile(r"LATIN (SMALL|CAPITAL) LETTER (\w) WITH ([\w ]+)$")
+# Glyph name suffix of the accents, by Unicode name
+_ACCENT_GLYPH_NAMES = {
+    "ACUTE": "acute",
+    "GRAVE": "grave",
+    "CIRCUMFLEX": "circumflex",
+    "DIAERESIS": "dieresis",
+    "TILDE": "tilde",
+    "CEDILLA": "cedilla",
+    "CARON": "caron",
+    "RING ABOVE": "ring",
+    "STROKE": "slash",
+    "DOT ABOVE": "dotaccent",
+    "OGONEK": "ogonek",
+    "DOUBLE ACUTE": "hungarumlaut",
+    "BREVE": "breve",
+    "MACRON": "macron",
+}
+_ASCII_GLYPH_NAMES = (
+    "space exclam quotedbl numbersign dollar percent ampersand quotesingle "
+    "parenleft parenright asterisk plus comma hyphen period slash zero one two "
+    "three four five six seven eight nine colon semicolon less equal greater "
+    "question at A B C D E F G H I J K L M N O P Q R S T U V W X Y Z bracketleft "
+    "backslash bracketright asciicircum underscore grave a b c d e f g h i j k l m "
+    "n o p q r s t u v w x y z braceleft bar braceright asciitilde"
+).split()
+_PUNCTUATION_GLYPH_NAMES = {
+    "quoteleft": "‘",
+    "quoteright": "’",
+    "quotedblleft": "“",
+    "quotedblright": "”",
+    "quotesinglbase": "‚",
+    "quotedblbase": "„",
+    "endash": "–",
+    "emdash": "—",
+    "ellipsis": "…",
+    "bullet": "•",
+    "dagger": "†",
+    "daggerdbl": "‡",
+    "perthousand": "‰",
+    "guilsinglleft": "‹",
+    "guilsinglright": "›",
+    "trademark": "™",
+    "Euro": "€",
+    "fi": "ﬁ",
+    "fl": "ﬂ",
+}
+
+
+class FontMetrics:
+    """
+    Advance widths and vertical metrics of a font, in font units (1/1000 em).
+
+    The advance widths are kept by character, so that a text is measured by
+    summing the table lookups of its characters in a single pass. Characters
+    missing from the font have the default width.
+
+    :param name: The name of the font.
+    :param advances: The advance width of each character of the font.
+    :param ascent: The height of the font above the baseline.
+    :param descent: The depth of the font below the baseline, negative.
+    :param default_width: The advance width of missing characters.
+    """
+
+    __slots__ = ("_name", "_advances", "_ascent", "_descent", "_default_width")
+
+    def __init__(
+        self,
+        name: str,
+        advances: Dict[str, float],
+        *,
+        ascent: float,
+        descent: float,
+        default_width: float,
+    ):
+        self._name = name
+        self._advances = advances
+        self._ascent = ascent
+        self._descent = descent
+        self._default_width = default_width
+
+    @classmethod
+    def from_tables(
+        cls,
+        name: str,
+        codepoints: Iterable[int],
+        widths: Iterable[float],
+        *,
+        units_per_em: float = _UNITS_PER_EM,
+        ascent: float,
+        descent: float,
+        default_width: float,
+    ) -> "FontMetrics":
+        """
+        Creates the metrics from parallel tables of code points and advance
+        widths, given in units of `units_per_em` per em.
+        """
+        scale = _UNITS_PER_EM / units_per_em
+
+        def to_units(value: float) -> float:
+            units = value * scale
+            # Keep integer font units exact so sums do not accumulate rounding
+            return round(units) if abs(units - round(units)) < 1e-6 else units
+
+        return cls(
+            name,
+            {chr(code): to_units(width) for code, width in zip(codepoints, widths)},
+            ascent=to_units(ascent),
+            descent=to_units(descent),
+            default_width=to_units(default_width),
+        )
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._name!r}, {len(self._advances)} chars)"
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def ascent(self) -> float:
+        return self._ascent
+
+    @property
+    def descent(self) -> float:
+        return self._descent
+
+    @property
+    def default_width(self) -> float:
+        return self._default_width
+
+    def renamed(self, name: str) -> "FontMetrics":
+        """
+        Returns the same metrics under another font name.
+        """
+        return FontMetrics(
+            name,
+            self._advances,
+            ascent=self._ascent,
+            descent=self._descent,
+            default_width=self._default_width,
+        )
+
+    @property
+    def digest(self) -> str:
+        """
+        Returns a hash of the name and the metrics of the font.
+        """
+        data = [
+            self._name,
+            self._ascent,
+            self._descent,
+            self._default_width,
+            sorted(self._advances.items()),
+        ]
+        return hashlib.sha256(json.dumps(data).encode()).hexdigest()
+
+    def __contains__(self, char: str) -> bool:
+        return char in self._advances
+
+    def advance_width(self, char: str) -> float:
+        """
+        Returns the advance width of a character.
+        """
+        return self._advances.get(char, self._default_width)
+
+    def advance_widths(self, text: str) -> Iterator[float]:
+        """
+        Yields the advance widths of the characters of a text.
+        """
+        advances = self._advances
+        if all(map(advances.__contains__, text)):
+            return map(advances.__getitem__, text)
+        return map(self.advance_width, text)
+
+    def text_units(self, text: str) -> float:
+        """
+        Returns the width of a text.
+        """
+        try:
+            return sum(map(self._advances.__getitem__, text))
+        except KeyError:
+            return sum(map(self.advance_width, text))
+
+
+def load_json_metrics(path: Union[str, Path]) -> FontMetrics:
+    """
+    Loads font metrics from a JSON file, as bundled in the package fonts
+    directory:
+
+    .. code-block:: json
+
+        {
+            "name": "Helvetica",
+            "units_per_em": 1000,
+            "ascent": 718,
+            "descent": -207,
+            "default_width": 556,
+            "widths": [[32, [278, 278, 355]], [160, [278]]]
+        }
+
+    `widths` lists runs of consecutive code points, as the first code point and
+    the advance widths of the run.
+    """
+    with open(path, encoding="utf-8") as file:
+        return _metrics_from_json(json.load(file))
+
+
+def load_afm_metrics(path: Union[str, Path]) -> FontMetrics:
+    """
+    Loads font metrics from an Adobe Font Metrics (AFM) file.
+
+    The characters are identified by their glyph names: ASCII, Latin-1 and
+    Latin Extended-A letters, common punctuation and uniXXXX names.
+    Unknown glyph names of the standard encoding range use their character code.
+    """
+    header: Dict[str, str] = {}
+    codepoints: List[int] = []
+    widths: List[float] = []
+    notdef_width = None
+    glyph_chars = _glyph_name_chars()
+    with open(path, encoding="latin-1") as file:
+        for line in file:
+            match = _AFM_CHAR_METRICS.search(line)
+            if match is None:
+                key, _, value = line.strip().partition(" ")
+                header.setdefault(key, value.strip())
+                continue
+            code, width, glyph_name = match.groups()
+            if glyph_name == ".notdef":
+                notdef_width = float(width)
+                continue
+            char = glyph_chars.get(glyph_name) or _unicode_glyph_name(glyph_name)
+            if char is None and 32 <= int(code) < 127:
+                char = chr(int(code))
+            if char is not None:
+                codepoints.append(ord(char))
+                widths.append(float(width))
+    if not widths:
+        raise ValueError(f"No character metrics in AFM file '{path}'")
+
+    return FontMetrics.from_tables(
+        header.get("FontName") or Path(path).stem,
+        codepoints,
+        widths,
+        ascent=float(header.get("Ascender", 0)),
+        descent=float(header.get("Descender", 0)),
+        default_width=(
+            notdef_width
+            if notdef_width is not None
+            else sorted(widths)[len(widths) // 2]
+        ),
+    )
+
+
+def load_ttf_metrics(path: Union[str, Path]) -> FontMetrics:
+    """
+    Loads font metrics from a TrueType or OpenType font file, reading the
+    head, hhea, hmtx and cmap tables.
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    tables = _sfnt_tables(data, path)
+
+    units_per_em = _read_table(data, tables, "head", ">18xH", path)[0]
+    ascent, descent, nb_h_metrics = _read_table(data, tables, "hhea", ">4xhh26xH", path)
+    hmtx = tables.get("hmtx")
+    if hmtx is None or nb_h_metrics == 0:
+        raise ValueError(f"No horizontal metrics in font file '{path}'")
+    # Glyphs past the last horizontal metric have its advance width
+    advances = struct.unpack_from(f">{nb_h_metrics}I", data, hmtx[0])
+    advances = [value >> 16 for value in advances]
+
+    codepoints: List[int] = []
+    widths: List[float] = []
+    for code, glyph in _cmap_glyphs(data, tables, path):
+        codepoints.append(code)
+        widths.append(advances[min(glyph, nb_h_metrics - 1)])
+
+    return FontMetrics.from_tables(
+        _font_name(data, tables) or Path(path).stem,
+        codepoints,
+        widths,
+        units_per_em=units_per_em,
+        ascent=ascent,
+        descent=descent,
+        default_width=advances[0],
+    )
+
+
+_LOADERS = {
+    ".json": load_json_metrics,
+    ".afm": load_afm_metrics,
+    ".ttf": load_ttf_metrics,
+    ".otf": load_ttf_metrics,
+}
+
+
+def load_font_metrics(path: Union[str, Path]) -> FontMetrics:
+    """
+    Loads font metrics from a JSON, AFM, TTF or OTF file, depending on its suffix.
+    """
+    suffix = Path(path).suffix.lower()
+    loader = _LOADERS.get(suffix)
+    if loader is None:
+        raise ValueError(
+            f"Unsupported font metrics file '{path}', expected one of "
+            f"{', '.join(_LOADERS)}"
+        )
+    return loader(path)
+
+
+class FontRegistry:
+    """
+    The fonts available to measure texts, by name.
+
+    The bundled fonts are loaded on first use. Other fonts are added from
+    metrics files with `register_file`. The registry can be shared by the
+    threads drawing workflows concurrently.
+
+    :param default_font: The font measuring texts whose font families are all
+                         unknown.
+    """
+
+    def __init__(self, default_font: str = DEFAULT_FONT):
+        self._fonts: Dict[str, FontMetrics] = {}
+        self._aliases: Dict[str, str] = dict(FONT_ALIASES)
+        self._resolved: Dict[Tuple[str, ...], FontMetrics] = {}
+        self._default_font = default_font
+        self._version = 0
+        # Names of the fonts added with `register`, not the bundled ones
+        self._registered: List[str] = []
+        self._digest: Tuple[int, str] = (0, "")
+        # Registrations and lazy loads may happen while other threads measure
+        self._lock = threading.RLock()
+
+    @property
+    def version(self) -> int:
+        """
+        Returns the number of fonts registered so far, which changes whenever
+        texts may be measured differently.
+        """
+        return self._version
+
+    @property
+    def digest(self) -> str:
+        """
+        Returns a hash of the registered fonts and of the font aliases, empty
+        when only the bundled fonts are used. Unlike `version`, it is the same
+        in all the processes registering the same fonts.
+        """
+        version, digest = self._digest
+        if version == self._version:
+            return digest
+        with self._lock:
+            data = [
+                [self._fonts[name].digest for name in sorted(self._registered)],
+                sorted(self._aliases.items()),
+            ]
+            digest = hashlib.sha256(json.dumps(data).encode()).hexdigest()
+            self._digest = self._version, digest
+        return digest
+
+    @property
+    def font_names(self) -> List[str]:
+        """
+        Returns the names of the available fonts, bundled and registered.
+        """
+        with self._lock:
+            return sorted({*BUNDLED_FONTS, *self._fonts})
+
+    def register(self, metrics: FontMetrics, aliases: Sequence[str] = ()) -> None:
+        """
+        Adds a font, or replaces the font of the same name.
+
+        :param metrics: The metrics of the font.
+        :param aliases: Other font family names measured with this font.
+        """
+        with self._lock:
+            self._fonts[metrics.name] = metrics
+            if metrics.name not in self._registered:
+                self._registered.append(metrics.name)
+            for alias in aliases:
+                self._aliases[alias] = metrics.name
+            self._resolved.clear()
+            self._version += 1
+
+    def register_file(
+        self,
+        path: Union[str, Path],
+        *,
+        name: Optional[str] = None,
+        aliases: Sequence[str] = (),
+    ) -> FontMetrics:
+        """
+        Adds a font from a JSON, AFM, TTF or OTF metrics file.
+
+        :param path: The metrics file.
+        :param name: The font family name of the font, defaults to the name in
+                     the file.
+        :param aliases: Other font family names measured with this font.
+        """
+        metrics = load_font_metrics(path)
+        if name is not None and name != metrics.name:
+            aliases = (metrics.name, *aliases)
+            metrics = metrics.renamed(name)
+        self.register(metrics, aliases)
+        return metrics
+
+    def get(self, name: str) -> Optional[FontMetrics]:
+        """
+        Returns the metrics of a font or font alias, None if it is unknown.
+        """
+        name = self._aliases.get(name, name)
+        metrics = self._fonts.get(name)
+        if metrics is None and name in BUNDLED_FONTS:
+            with self._lock:
+                metrics = self._fonts.get(name)
+                if metrics is None:
+                    resource = files("ewoksdraw") / "fonts" / BUNDLED_FONTS[name]
+                    data = json.loads(resource.read_text("utf-8"))
+                    metrics = self._fonts[name] = _metrics_from_json(data)
+        return metrics
+
+    def resolve(self, families: Sequence[str]) -> FontMetrics:
+        """
+        Returns the metrics of the first known font of a CSS font family list.
+        A warning is emitted, once per list, when the default font is used
+        instead of the named fonts.
+        """
+        key = tuple(families)
+        metrics = self._resolved.get(key)
+        if metrics is not None:
+            return metrics
+        with self._lock:
+            metrics = self._resolved.get(key)
+            if metrics is not None:
+                return metrics
+            for family in key:
+                metrics = self.get(family)
+                if metrics is not None:
+                    break
+            else:
+                metrics = self.get(self._default_font)
+                if metrics is None:
+                    raise KeyError(f"Unknown default font '{self._default_font}'")
+                if key:
+                    warnings.warn(
+                        f"No metrics for the font families {', '.join(key)}, "
+                        f"texts are measured with {metrics.name}",
+                        stacklevel=2,
+                    )
+            self._resolved[key] = metrics
+        return metrics
+
+
+_FONT_REGISTRY = FontRegistry()
+
+
+def get_font_registry() -> FontRegistry:
+    """
+    Returns the process-wide font registry.
+    """
+    return _FONT_REGISTRY
+
+
+def _metrics_from_json(data: dict) -> FontMetrics:
+    codepoints: List[int] = []
+    widths: List[float] = []
+    for first, run in data["widths"]:
+        codepoints.extend(range(first, first + len(run)))
+        widths.extend(run)
+    return FontMetrics.from_tables(
+        data["name"],
+        codepoints,
+        widths,
+        units_per_em=data.get("units_per_em", _UNITS_PER_EM),
+        ascent=data["ascent"],
+        descent=data["descent"],
+        default_width=data["default_width"],
+    )
+
+
+def _glyph_name_chars() -> Dict[str, str]:
+    """
+    Returns the characters of the glyph names found in the standard fonts.
+    """
+    chars = dict(zip(_ASCII_GLYPH_NAMES, map(chr, range(32, 127))))
+    chars.update(_PUNCTUATION_GLYPH_NAMES)
+    for code in range(0xA0, 0x180):
+        char = chr(code)
+        match = _LATIN_ACCENTED_LETTER.match(unicodedata.name(char, ""))
+        if match is None:
+            continue
+        case, letter, accent = match.groups()
+        accent_name = _ACCENT_GLYPH_NAMES.get(accent)
+        if accent_name is not None:
+            letter = letter.lower() if case == "SMALL" else letter
+            chars.setdefault(f"{letter}{accent_name}", char)
+    return chars
+
+
+def _unicode_glyph_name(glyph_name: str) -> Optional[str]:
+    match = _AFM_UNICODE_NAME.match(glyph_name)
+    if match is None:
+        return None
+    return chr(int(match.group(1) or match.group(2), 16))
+
+
+def _sfnt_tables(data: bytes, path) -> Dict[str, Tuple[int, int]]:
+    """
+    Returns the offset and length of the tables of a TrueType or OpenType font.
+    """
+    if len(data) < 12 or data[:4] not in (b"\x00\x01\x00\x00", b"OTTO", b"true"):
+        raise ValueError(f"Not a TrueType or OpenType font file '{path}'")
+    (nb_tables,) = struct.unpack_from(">H", data, 4)
+    tables = {}
+    for i in range(nb_tables):
+        tag, _, offset, length = struct.unpack_from(">4sIII", data, 12 + 16 * i)
+        tables[tag.decode("latin-1")] = (offset, length)
+    return tables
+
+
+def _read_table(data: bytes, tables, tag: str, fmt: str, path) -> tuple:
+    table = tables.get(tag)
+    if table is None:
+        raise ValueError(f"No {tag} table in font file '{path}'")
+    return struct.unpack_from(fmt, data, table[0])
+
+
+def _cmap_glyphs(data: bytes, tables, path) -> Iterator[Tuple[int, int]]:
+    """
+    Yields the (code point, glyph index) pairs of the Unicode character map.
+    """
+    cmap = tables.get("cmap")
+    if cmap is None:
+        raise ValueError(f"No cmap table in font file '{path}'")
+    start = cmap[0]
+    (nb_subtables,) = struct.unpack_from(">H", data, start + 2)
+    subtables = {}
+    for i in range(nb_subtables):
+        platform, encoding, offset = struct.unpack_from(">HHI", data, start + 4 + 8 * i)
+        (fmt,) = struct.unpack_from(">H", data, start + offset)
+        subtables[(platform, encoding, fmt)] = start + offset
+
+    for key in ((3, 10, 12), (0, 4, 12), (3, 1, 4), (0, 3, 4), (0, 1, 4), (0, 0, 4)):
+        offset = subtables.get(key)
+        if offset is not None:
+            reader = _cmap_format12 if key[2] == 12 else _cmap_format4
+            return reader(data, offset)
+    raise ValueError(f"No Unicode character map in font file '{path}'")
+
+
+def _cmap_format4(data: bytes, offset: int) -> Iterator[Tuple[int, int]]:
+    (seg_count_x2,) = struct.unpack_from(">H", data, offset + 6)
+    seg_count = seg_count_x2 // 2
+    ends_offset = offset + 14
+    starts_offset = ends_offset + seg_count_x2 + 2
+    deltas_offset = starts_offset + seg_count_x2
+    range_offsets_offset = deltas_offset + seg_count_x2
+    ends = struct.unpack_from(f">{seg_count}H", data, ends_offset)
+    starts = struct.unpack_from(f">{seg_count}H", data, starts_offset)
+    deltas = struct.unpack_from(f">{seg_count}h", data, deltas_offset)
+    range_offsets = struct.unpack_from(f">{seg_count}H", data, range_offsets_offset)
+    for i, (first, last, delta, range_offset) in enumerate(
+        zip(starts, ends, deltas, range_offsets)
+    ):
+        if first == 0xFFFF:
+            continue
+        for code in range(first, last + 1):
+            if range_offset == 0:
+                glyph = (code + delta) & 0xFFFF
+            else:
+                # Offset from the range offset entry into the glyph id array
+                address = range_offsets_offset + 2 * i + range_offset
+                (glyph,) = struct.unpack_from(">H", data, address + 2 * (code - first))
+                if glyph:
+                    glyph = (glyph + delta) & 0xFFFF
+            if glyph:
+                yield code, glyph
+
+
+def _cmap_format12(data: bytes, offset: int) -> Iterator[Tuple[int, int]]:
+    (nb_groups,) = struct.unpack_from(">I", data, offset + 12)
+    for i in range(nb_groups):
+        first, last, glyph = struct.unpack_from(">III", data, offset + 16 + 12 * i)
+        for code in range(first, last + 1):
+            yield code, glyph + code - first
+
+
+def _font_name(data: bytes, tables) -> Optional[str]:
+    """
+    Returns the font family name of the name table, if any.
+    """
+    table = tables.get("name")
+    if table is None:
+        return None
+    start = table[0]
+    nb_records, strings_offset = struct.unpack_from(">2xHH", data, start)
+    names = {}
+    for i in range(nb_records):
+        platform, _, _, name_id, length, offset = struct.unpack_from(
+            ">HHHHHH", data, start + 6 + 12 * i
+        )
+        if name_id != 1:
+            continue
+        raw = data[start + strings_offset + offset :][:length]
+        encoding = "utf-16-be" if platform in (0, 3) else "latin-1"
+        names.setdefault(platform, raw.decode(encoding, "replace"))
+    return names.get(3) or names.get(1) or names.get(0)
@@ -8,9 +8,15 @@ class SvgBackground(SvgElement):
     style.
     """
 
+    __slots__ = ()
+
     def __init__(self, width: float, height: float):
         attr = {
-            "width": str(width),
-            "height": str(height),
+            "width": width,
+            "height": height,
         }
         super().__init__(tag="rect", css_class="background", attr=attr)
+
+    def set_size(self, width: float, height: float) -> None:
+        self.set_attr("width", width)
+        self.set_attr("height", height)
@@ -1,29 +1,52 @@
+import gzip
+import math
+from io import StringIO, TextIOWrapper
 from pathlib import Path
-from typing import Iterator, List, Union
-from xml.dom import minidom
-from xml.etree.ElementTree import Element, tostring
-
-import xmltodict
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+    Union,
+)
+from xml.etree.ElementTree import Element
 
+from ..geometry import BoundingBox, SpatialIndex
+from ..profiling import timer
+from .svg_background import SvgBackground
+from .svg_dict import document_dict
 from .svg_element import SvgElement
 from .svg_group import SvgGroup
+from .svg_style import SvgStyle
+from .svg_task_io import SvgTaskIO
+from .svg_writer import SvgWriter
+
+# Number of characters from which `SvgCanvas.iter_svg` returns a chunk
+SVG_CHUNK_SIZE = 64 * 1024
+# Font size, in pixels once scaled, below which labels are left out of viewports
+LABEL_MIN_READABLE_FONT_SIZE = 4
 
 
-def pretty_print_xml(xml_svg: Element) -> str:
+def pretty_print_xml(xml_svg: Element, indent: Optional[str] = "  ") -> str:
     """
     Converts an XML Element to a pretty-printed string.
     :param xml_svg: Xml Element in the svg format
+    :param indent: The indentation of one nesting level, None for compact output.
 
     :return: string representation of the xml/svg element
     """
-    svg_string = tostring(xml_svg, encoding="unicode", method="xml")
-
-    svg_string = svg_string.replace("&lt;![CDATA[", "<![CDATA[").replace(
-        "]]&gt;", "]]>"
-    )
-
-    dom = minidom.parseString(svg_string)
-    return dom.toprettyxml(indent="  ")
+    with timer("serialize.pretty_print"):
+        stream = StringIO()
+        writer = SvgWriter(stream, indent=indent)
+        stream.write(writer.xml_declaration)
+        writer.write_xml_element(xml_svg)
+        return stream.getvalue()
 
 
 class SvgCanvas:
@@ -33,12 +56,43 @@ class SvgCanvas:
     SvgElement or SvgGroup can be added to the canvas.
     The SvgCanvas compile every css styles and elements to generate the final
     SVG XML file.
+
+    The generated representations are cached until the canvas or one of its
+    elements is modified, so that `xml`, `dict`, `draw` and `write` share the
+    same generation work.
+
+    :param width: The width of the canvas.
+    :param height: The height of the canvas.
+    :param incremental: If True, the serialized text of each top-level group is
+                        kept, so that after a modification only the modified
+                        groups are serialized again. This trades memory for
+                        faster re-rendering of edited drawings.
     """
 
-    def __init__(self, width: int, height: int):
-        self.width = width
-        self.height = height
+    def __init__(self, width: int, height: int, *, incremental: bool = False):
+        self._width = width
+        self._height = height
+        self._incremental = incremental
         self.elements: List[Union[SvgElement, SvgGroup]] = []
+        self._render_cache: Dict[Hashable, Any] = {}
+
+    @property
+    def width(self) -> int:
+        return self._width
+
+    @width.setter
+    def width(self, value: int) -> None:
+        self._width = value
+        self._changed()
+
+    @property
+    def height(self) -> int:
+        return self._height
+
+    @height.setter
+    def height(self, value: int) -> None:
+        self._height = value
+        self._changed()
 
     def add_element(self, element: Union[SvgElement, SvgGroup]) -> None:
         """
@@ -46,82 +100,515 @@ class SvgCanvas:
 
         :param element: The element or group to be added.
         """
+        element._parent = self
+        if isinstance(element, SvgGroup):
+            element._invalidate_absolute_position()
         self.elements.append(element)
+        self._changed()
+
+    def elements_at(self, x: float, y: float) -> List[Union[SvgElement, SvgGroup]]:
+        """
+        Returns the elements of the canvas whose bounding box contains a point,
+        the topmost (last drawn) first.
+
+        :param x: The x-coordinate of the point.
+        :param y: The y-coordinate of the point.
+        """
+        found = self.elements_in(BoundingBox(x, y, x, y))
+        found.reverse()
+        return found
+
+    def elements_in(self, box: BoundingBox) -> List[Union[SvgElement, SvgGroup]]:
+        """
+        Returns the top-level elements of the canvas whose bounding box overlaps
+        a box, in drawing order. The bounding boxes are looked up in a spatial
+        index, built once until the canvas changes.
+
+        :param box: The box, in canvas coordinates.
+        """
+        index = self._cached("spatial_index", self._build_spatial_index)
+        return [self.elements[position] for position in index.query(box, strict=False)]
+
+    def grow_to_fit(self, width: int, height: int) -> None:
+        """
+        Enlarges the canvas, and its backgrounds, to at least the given size.
+
+        :param width: The minimum width of the canvas.
+        :param height: The minimum height of the canvas.
+        """
+        if width <= self.width and height <= self.height:
+            return
+
+        self.width = max(self.width, width)
+        self.height = max(self.height, height)
+        for element in self.elements:
+            if isinstance(element, SvgBackground):
+                element.set_size(self.width, self.height)
 
-    def draw(self, filename: Union[Path, str]) -> None:
+    def draw(
+        self,
+        filename: Union[Path, str],
+        *,
+        indent: Optional[str] = "  ",
+        use_defs: bool = False,
+        precision: Optional[int] = None,
+        minify: bool = False,
+    ) -> None:
         """
-        Save the SVG canvas to a file.
+        Save the SVG canvas to a file, gzip compressed while it is written if
+        the file name ends with ``.svgz``.
         :param filename: The name of the file to save the SVG content.
+        :param indent: The indentation of one nesting level, None for compact output.
+        :param use_defs: If True, repeated elements and groups, like the anchors
+                         or the tasks of the same signature, are written once in
+                         <defs> and drawn with <use>.
+        :param precision: If given, the coordinates are rounded to this number of
+                          decimals.
+        :param minify: If True, the document is written as small as possible
+                       (see `SvgWriter`).
         """
-        with open(filename, "w") as file:
-            file.write(self._get_svg_string())
+        options = dict(
+            indent=indent, use_defs=use_defs, precision=precision, minify=minify
+        )
+        if Path(filename).suffix.lower() == ".svgz":
+            with open(filename, "wb") as file:
+                self.write_svgz(file, **options)
+            return
+        with open(filename, "w", encoding="utf-8") as file:
+            self.write(file, **options)
+
+    def write(
+        self,
+        stream: TextIO,
+        *,
+        indent: Optional[str] = "  ",
+        use_defs: bool = False,
+        precision: Optional[int] = None,
+        minify: bool = False,
+    ) -> None:
+        """
+        Serializes the SVG canvas to a text stream.
+        :param stream: The text stream to write the SVG content to.
+        :param indent: The indentation of one nesting level, None for compact output.
+        :param use_defs: If True, repeated elements and groups are written once in
+                         <defs> and drawn with <use>. Incremental fragments are
+                         not reused then.
+        :param precision: If given, the coordinates are rounded to this number of
+                          decimals.
+        :param minify: If True, the document is written as small as possible
+                       (see `SvgWriter`).
+        """
+        stream.write(
+            self._get_svg_string(
+                indent, use_defs=use_defs, precision=precision, minify=minify
+            )
+        )
+
+    def write_svgz(self, stream: BinaryIO, **options: Any) -> None:
+        """
+        Serializes the SVG canvas to a binary stream, gzip compressed while it is
+        written. The compressed document has no timestamp nor file name, so that
+        the same drawing always gives the same bytes.
+        :param stream: The binary stream to write the compressed SVG content to.
+        :param options: The keyword arguments of `write`.
+        """
+        with gzip.GzipFile(
+            filename="", fileobj=stream, mode="wb", mtime=0
+        ) as compressed:
+            text_stream = TextIOWrapper(compressed, encoding="utf-8")
+            self.write(text_stream, **options)
+            text_stream.flush()
+            text_stream.detach()
+
+    def iter_svg(
+        self,
+        chunk_size: int = SVG_CHUNK_SIZE,
+        *,
+        indent: Optional[str] = "  ",
+        use_defs: bool = False,
+        precision: Optional[int] = None,
+        minify: bool = False,
+    ) -> Iterator[str]:
+        """
+        Serializes the SVG canvas in chunks, each written when the previous one
+        is consumed, so that the document can be sent while it is written.
+        :param chunk_size: The number of characters from which a chunk is
+                           returned. Chunks end after a top-level element, so they
+                           can be larger.
+        :param indent: The indentation of one nesting level, None for compact output.
+        :param use_defs: If True, repeated elements and groups are written once in
+                         <defs> and drawn with <use>.
+        :param precision: If given, the coordinates are rounded to this number of
+                          decimals.
+        :param minify: If True, the document is written as small as possible
+                       (see `SvgWriter`).
+        """
+        options = (indent, use_defs, precision, minify)
+        svg_string = self._render_cache.get(("svg", *options))
+        if svg_string is not None:
+            for start in range(0, len(svg_string), chunk_size):
+                yield svg_string[start : start + chunk_size]
+            return
+
+        stream = StringIO()
+        writer = SvgWriter(
+            stream,
+            indent=indent,
+            reuse_fragments=self._incremental and not use_defs,
+            shared_defs=use_defs,
+            precision=precision,
+            minify=minify,
+        )
+        for _ in writer.iter_document(
+            self._svg_attributes(), self._gather_all_styles(), self.elements
+        ):
+            if stream.tell() >= chunk_size:
+                yield stream.getvalue()
+                stream.seek(0)
+                stream.truncate()
+        if stream.tell():
+            yield stream.getvalue()
+
+    def draw_pdf(self, filename: Union[Path, str]) -> None:
+        """
+        Save the canvas to a PDF file, with one page of the canvas size.
+        :param filename: The name of the PDF file.
+        """
+        with open(filename, "wb") as file:
+            self.write_pdf(file)
+
+    def write_pdf(self, stream: BinaryIO) -> None:
+        """
+        Draws the canvas as a PDF document, walking the elements without
+        serializing the SVG document.
+        :param stream: The binary stream to write the PDF document to.
+        """
+        # The exporters are only imported when used, to start the CLI fast
+        from .svg_export import write_pdf
+
+        with timer("export.pdf"):
+            write_pdf(self, stream)
+
+    def draw_png(self, filename: Union[Path, str], *, scale: float = 1.0) -> None:
+        """
+        Save the canvas to a PNG file. Requires Pillow.
+        :param filename: The name of the PNG file.
+        :param scale: The number of pixels per canvas unit, below 1 for thumbnails.
+        """
+        with open(filename, "wb") as file:
+            self.write_png(file, scale=scale)
+
+    def write_png(
+        self,
+        stream: BinaryIO,
+        *,
+        scale: float = 1.0,
+        strip_height: Optional[int] = None,
+    ) -> None:
+        """
+        Draws the canvas as a PNG image, by horizontal strips of bounded memory.
+        Requires Pillow.
+        :param stream: The binary stream to write the PNG image to.
+        :param scale: The number of pixels per canvas unit, below 1 for thumbnails.
+        :param strip_height: The height in pixels of the strips drawn at once,
+                             `svg_export.PNG_STRIP_HEIGHT` by default.
+        """
+        from .svg_export import PNG_STRIP_HEIGHT, write_png
+
+        if strip_height is None:
+            strip_height = PNG_STRIP_HEIGHT
+        with timer("export.png"):
+            write_png(self, stream, scale=scale, strip_height=strip_height)
+
+    def draw_viewport(
+        self,
+        filename: Union[Path, str],
+        viewport: BoundingBox,
+        *,
+        scale: float = 1.0,
+        level_of_detail: bool = True,
+        indent: Optional[str] = "  ",
+    ) -> None:
+        """
+        Save the part of the canvas inside a viewport to an SVG file.
+        :param filename: The name of the file to save the SVG content.
+        :param viewport: The part of the canvas to draw, in canvas coordinates.
+        :param scale: The size of the drawing, in pixels per canvas unit.
+        :param level_of_detail: If True, IO labels too small to be read at this
+                                scale are not drawn.
+        :param indent: The indentation of one nesting level, None for compact output.
+        """
+        with open(filename, "w", encoding="utf-8") as file:
+            self.write_viewport(
+                file,
+                viewport,
+                scale=scale,
+                level_of_detail=level_of_detail,
+                indent=indent,
+            )
+
+    def write_viewport(
+        self,
+        stream: TextIO,
+        viewport: BoundingBox,
+        *,
+        scale: float = 1.0,
+        level_of_detail: bool = True,
+        indent: Optional[str] = "  ",
+    ) -> None:
+        """
+        Serializes the part of the canvas inside a viewport. Only the top-level
+        elements overlapping the viewport are written, the document `viewBox`
+        clips the parts of them outside of it.
+        :param stream: The text stream to write the SVG content to.
+        :param viewport: The part of the canvas to draw, in canvas coordinates.
+        :param scale: The size of the drawing, in pixels per canvas unit.
+        :param level_of_detail: If True, IO labels too small to be read at this
+                                scale are not drawn.
+        :param indent: The indentation of one nesting level, None for compact output.
+        """
+        if scale <= 0:
+            raise ValueError(f"scale must be positive, got {scale}")
+        attributes = {
+            "xmlns": "http://www.w3.org/2000/svg",
+            "width": _format_length(viewport.width * scale),
+            "height": _format_length(viewport.height * scale),
+            "viewBox": " ".join(
+                _format_length(value)
+                for value in (
+                    viewport.x_min,
+                    viewport.y_min,
+                    viewport.width,
+                    viewport.height,
+                )
+            ),
+        }
+        with timer("serialize.viewport"):
+            writer = SvgWriter(
+                stream,
+                indent=indent,
+                element_filter=_readable_labels(scale) if level_of_detail else None,
+            )
+            writer.write_document(
+                attributes, self._gather_all_styles(), self.elements_in(viewport)
+            )
+
+    def tiles(
+        self, tile_width: float, tile_height: Optional[float] = None
+    ) -> Iterator[Tuple[int, int, BoundingBox]]:
+        """
+        Splits the canvas into tiles, row by row.
+
+        :param tile_width: The width of the tiles, in canvas units.
+        :param tile_height: The height of the tiles, defaults to their width.
+        :return: The row, column and viewport of each tile.
+        """
+        if tile_height is None:
+            tile_height = tile_width
+        if tile_width <= 0 or tile_height <= 0:
+            raise ValueError("The tile size must be positive")
+        nb_rows = max(1, math.ceil(self.height / tile_height))
+        nb_columns = max(1, math.ceil(self.width / tile_width))
+        for row in range(nb_rows):
+            for column in range(nb_columns):
+                yield row, column, BoundingBox.from_size(
+                    column * tile_width, row * tile_height, tile_width, tile_height
+                )
+
+    def draw_tiles(
+        self,
+        directory: Union[Path, str],
+        tile_width: float,
+        tile_height: Optional[float] = None,
+        *,
+        scale: float = 1.0,
+        level_of_detail: bool = True,
+        indent: Optional[str] = "  ",
+    ) -> List[Path]:
+        """
+        Save the canvas split into tiles (see `tiles`), one SVG file per tile
+        named ``tile_<row>_<column>.svg``, each drawing only the elements
+        overlapping it.
+        :param directory: The directory of the tile files, created if needed.
+        :param tile_width: The width of the tiles, in canvas units.
+        :param tile_height: The height of the tiles, defaults to their width.
+        :param scale: The size of the drawing, in pixels per canvas unit.
+        :param level_of_detail: If True, IO labels too small to be read at this
+                                scale are not drawn.
+        :param indent: The indentation of one nesting level, None for compact output.
+        :return: The tile file names, row by row.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        filenames = []
+        for row, column, viewport in self.tiles(tile_width, tile_height):
+            filename = directory / f"tile_{row}_{column}.svg"
+            self.draw_viewport(
+                filename,
+                viewport,
+                scale=scale,
+                level_of_detail=level_of_detail,
+                indent=indent,
+            )
+            filenames.append(filename)
+        return filenames
 
     @property
     def xml(self) -> Element:
         """
         Returns the XML representation of the SVG canvas.
+        The element is shared until the canvas changes and should not be modified.
         """
-        return self._generate_xml_svg()
+        return self._cached("xml", self._generate_xml_svg)
 
     @property
     def dict(self) -> dict:
         """
-        Returns the SVG canvas as a dictionary.
+        Returns the SVG canvas as a dictionary, with the same structure as
+        `xmltodict.parse` applied to the SVG document.
+        The dictionary is shared until the canvas changes and should not be modified.
         """
-        return xmltodict.parse(self._get_svg_string())
+        return self._cached("dict", self._generate_dict)
 
-    def _get_svg_string(self) -> str:
+    def _get_svg_string(self, indent: Optional[str] = "  ", **options: Any) -> str:
         """
         Helper method to get the final, pretty-printed SVG string.
+        :param options: The other keyword arguments of `write`.
+        """
+        use_defs = options.get("use_defs", False)
+        precision = options.get("precision")
+        minify = options.get("minify", False)
+
+        def generate() -> str:
+            stream = StringIO()
+            with timer("serialize.svg"):
+                writer = SvgWriter(
+                    stream,
+                    indent=indent,
+                    reuse_fragments=self._incremental and not use_defs,
+                    shared_defs=use_defs,
+                    precision=precision,
+                    minify=minify,
+                )
+                writer.write_document(
+                    self._svg_attributes(), self._gather_all_styles(), self.elements
+                )
+            return stream.getvalue()
+
+        return self._cached(("svg", indent, use_defs, precision, minify), generate)
+
+    def _cached(self, key: Hashable, generate: Callable[[], Any]) -> Any:
+        """
+        Returns a generated representation of the canvas, generating it only if
+        the canvas changed since the last call.
+        """
+        if key not in self._render_cache:
+            self._render_cache[key] = generate()
+        return self._render_cache[key]
+
+    def _changed(self) -> None:
+        """
+        Drops the cached representations, called when the canvas or one of its
+        elements is modified.
+        """
+        self._render_cache.clear()
+
+    def _absolute_origin(self) -> Tuple[float, float]:
+        """
+        Returns the canvas coordinates of the origin of the canvas elements.
         """
-        return pretty_print_xml(self.xml)
+        return 0.0, 0.0
+
+    def _build_spatial_index(self) -> SpatialIndex[int]:
+        """
+        Indexes the positions of the top-level elements by bounding box. The
+        elements without bounding box are indexed with the whole canvas.
+        """
+        canvas_box = BoundingBox(0, 0, self.width, self.height)
+        return SpatialIndex.from_boxes(
+            (position, canvas_box if box is None else box)
+            for position, box in enumerate(
+                element.absolute_bbox for element in self.elements
+            )
+        )
+
+    def _svg_attributes(self) -> Dict[str, str]:
+        """
+        Returns the attributes of the root <svg> element.
+        """
+        return svg_attributes(self.width, self.height)
 
     def _generate_xml_svg(self) -> Element:
         """
         Generates a fresh SVG Element from the current canvas state.
         """
-        xml_svg = Element(
-            "svg",
-            xmlns="http://www.w3.org/2000/svg",
-            width=str(self.width),
-            height=str(self.height),
-        )
+        with timer("serialize.xml"):
+            xml_svg = Element("svg", self._svg_attributes())
 
-        style_elements = self._gather_all_styles()
-        seen_styles = set()
-        for style in style_elements:
-            if style.text not in seen_styles:
-                xml_svg.append(style)
-                seen_styles.add(style.text)
+            for style in self._gather_all_styles():
+                xml_svg.append(style.xml_element)
 
-        for element in self.elements:
-            xml_svg.append(element.xml_element)
+            for element in self.elements:
+                xml_svg.append(element.xml_element)
 
-        return xml_svg
+            return xml_svg
 
-    def _yield_styles(self, element: Union[SvgElement, SvgGroup]) -> Iterator[Element]:
-        """
-        Recursively walks through elements and yields their styles.
-        This is a generator function.
+    def _generate_dict(self) -> dict:
+        with timer("serialize.dict"):
+            return document_dict(self.xml)
 
-        :param element: The root element or group to start from.
+    def _gather_all_styles(self) -> List[SvgStyle]:
+        """
+        Returns the unique styles of the canvas elements, cached until the canvas
+        changes.
         """
-        if isinstance(element, SvgElement):
-            if element.style_element is not None:
-                yield element.style_element
-        elif isinstance(element, SvgGroup):
-            for child in element.elements:
-                yield from self._yield_styles(child)
+        return self._cached("styles", self._collect_styles)
 
-    def _gather_all_styles(self) -> List[Element]:
+    def _collect_styles(self) -> List[SvgStyle]:
         """
-        Gathers all unique styles from the canvas elements.
-        Uses the `_yield_styles` generator to walk the element tree.
+        Gathers all unique styles from the canvas elements, in order of first use.
+        The styles of groups are cached by the groups, so that only the modified
+        groups are walked again.
+        Styles are deduplicated by CSS class.
 
-        :return: A list of unique style elements.
+        :return: A list of unique styles.
         """
-        all_styles: List[Element] = []
+        all_styles: Dict[str, SvgStyle] = {}
         for element in self.elements:
-            all_styles.extend(self._yield_styles(element))
+            if isinstance(element, SvgGroup):
+                for style in element.styles:
+                    all_styles.setdefault(style.css_class, style)
+            elif element.style is not None:
+                all_styles.setdefault(element.style.css_class, element.style)
+
+        return list(all_styles.values())
+
+
+def svg_attributes(width: int, height: int) -> Dict[str, str]:
+    """
+    Returns the attributes of the root <svg> element of a canvas.
+    """
+    return {
+        "xmlns": "http://www.w3.org/2000/svg",
+        "width": str(width),
+        "height": str(height),
+    }
+
+
+def _format_length(value: float) -> str:
+    return str(int(value)) if value == int(value) else str(round(value, 2))
+
+
+def _readable_labels(scale: float) -> Callable[[SvgElement], bool]:
+    """
+    Returns an element filter dropping the IO labels whose font size, at the
+    given scale, is below `LABEL_MIN_READABLE_FONT_SIZE` pixels.
+    """
+
+    def is_readable(element: SvgElement) -> bool:
+        if not isinstance(element._parent, SvgTaskIO) or element.tag != "text":
+            return True
+        font_size = element.get_number("font-size")
+        return font_size * scale >= LABEL_MIN_READABLE_FONT_SIZE
 
-        return all_styles
+    return is_readable
@@ -0,0 +1,52 @@
+from typing import Any, Tuple
+from xml.etree.ElementTree import Element
+
+CDATA_START = "<![CDATA["
+CDATA_END = "]]>"
+
+
+def document_dict(xml_svg: Element) -> dict:
+    """
+    Builds the dictionary representation of an SVG document from its XML
+    element, with the same structure as `xmltodict.parse` applied to the
+    serialized document.
+    """
+    tag, content = _node_item(xml_svg)
+    return {tag: content}
+
+
+def _node_item(node: Element) -> Tuple[str, Any]:
+    """
+    Returns the tag and the xmltodict compatible content of an element: a string
+    for elements with only text, or None for empty elements.
+    """
+    content = {f"@{key}": value for key, value in node.attrib.items()}
+    for child in node:
+        _add_child(content, *_node_item(child))
+
+    text = _text(node)
+    if not text:
+        return node.tag, content or None
+    if not content:
+        return node.tag, text
+    content["#text"] = text
+    return node.tag, content
+
+
+def _text(node: Element) -> str:
+    text = node.text
+    if not text:
+        return ""
+    # Style sheets are CDATA sections, whose content is the parsed text
+    if node.tag == "style" and text.startswith(CDATA_START):
+        text = text[len(CDATA_START) : -len(CDATA_END)]
+    return text.strip()
+
+
+def _add_child(content: dict, tag: str, value: Any) -> None:
+    if tag not in content:
+        content[tag] = value
+    elif isinstance(content[tag], list):
+        content[tag].append(value)
+    else:
+        content[tag] = [content[tag], value]
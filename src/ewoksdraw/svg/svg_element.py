@@ -1,36 +1,55 @@
-from pathlib import Path
-from typing import Literal, Optional
+from types import MappingProxyType
+from typing import Dict, Literal, Mapping, Optional, Tuple, Union
 from xml.etree.ElementTree import Element
 
+from ..geometry import BoundingBox
+from .svg_style import SvgStyle, get_css_style
+
+AttributeValue = Union[str, float]
+
+# Marks a cached value that has not been computed yet, None being a valid value
+_UNSET = object()
+
 
 class SvgElement:
     """
     Represents generic SVG element.
 
-    :param tag: The SVG tag (e.g., 'rect', 'circle', 'text').
+    :param tag: The SVG tag (e.g., 'rect', 'circle', 'text', 'path').
     :param css_class: The CSS class to apply to the SVG element.
                        Should match a CSS file in the css_styles directory.
-    :param attr: A dictionary of svg attributes
+    :param attr: A dictionary of svg attributes. A read-only mapping
+                 (`types.MappingProxyType`) can be shared by many elements, it is
+                 copied by the first `set_attr` of each element.
+
+    Elements use `__slots__` and keep numeric attributes as numbers, converted
+    to text only when serialized, and share their style with all the elements
+    of the same CSS class, so that drawings with many elements stay compact.
     """
 
+    __slots__ = ("_tag", "_css_class", "_attr", "_text", "_style", "_parent", "_bbox")
+
     def __init__(
         self,
-        tag: Literal["rect", "circle", "text", "line"],
+        tag: Literal["rect", "circle", "text", "line", "path"],
         css_class: Optional[str] = None,
-        attr: Optional[dict] = None,
+        attr: Optional[Mapping[str, AttributeValue]] = None,
         text: Optional[str] = None,
     ):
-        if tag not in ("rect", "circle", "text", "line"):
+        if tag not in ("rect", "circle", "text", "line", "path"):
             raise ValueError(
                 f"Invalid SVG tag: {tag}. Supported tags are 'rect', 'circle', 'text',"
-                " 'line'."
+                " 'line', 'path'."
             )
         self._tag = tag
 
         self._css_class = css_class
         self._attr = attr or {}
         self._text = text
-        self._style_element = self._load_css_style()
+        self._style = self._load_css_style()
+        # The SvgGroup or SvgCanvas containing the element, notified of changes
+        self._parent = None
+        self._bbox = _UNSET
 
     def set_position(
         self, x: Optional[float] = None, y: Optional[float] = None
@@ -40,25 +59,26 @@ class SvgElement:
         :param x: The x-coordinate to set. If None, the x attribute is not changed.
         :param y: The y-coordinate to set. If None, the y attribute is not changed.
         """
-        if self._tag == "circle":
-            attr_x = "cx"
-            attr_y = "cy"
-        else:
-            attr_x = "x"
-            attr_y = "y"
+        attr_x, attr_y = self._position_attributes()
 
         if x is not None:
-            self.set_attr(attr_x, str(x))
+            self.set_attr(attr_x, x)
         if y is not None:
-            self.set_attr(attr_y, str(y))
+            self.set_attr(attr_y, y)
 
-    def set_attr(self, key: str, value: str) -> None:
+    def set_attr(self, key: str, value: AttributeValue) -> None:
         """
         Setter for any attribute key.
         :param key: The attribute key (string).
-        :param value: The value to set.
+        :param value: The value to set, a string or a number. Numbers are written
+                      as `str(value)`.
         """
+        if self._attr.get(key) == value:
+            return
+        if isinstance(self._attr, MappingProxyType):
+            self._attr = dict(self._attr)
         self._attr[key] = value
+        self._changed()
 
     def get_attr(self, key: str) -> Optional[str]:
         """
@@ -67,18 +87,95 @@ class SvgElement:
         :param key: The attribute key (string).
         :return: The value for the key or None if not found.
         """
-        if key not in self._attr:
+        value = self._attr.get(key)
+        if value is None or isinstance(value, str):
+            return value
+        return str(value)
+
+    def get_number(self, key: str, default: float = 0.0) -> float:
+        """
+        Getter for a numeric attribute, like a coordinate or a size.
+
+        :param key: The attribute key (string).
+        :param default: The value returned when the attribute is not set.
+        """
+        value = self._attr.get(key)
+        if value is None:
+            return default
+        if isinstance(value, str):
+            return float(value.rstrip("px"))
+        return float(value)
+
+    @property
+    def tag(self) -> str:
+        return self._tag
+
+    @property
+    def position(self) -> Tuple[float, float]:
+        """
+        Returns the position set with `set_position`, in the coordinates of the
+        container of the element.
+        """
+        attr_x, attr_y = self._position_attributes()
+        return self.get_number(attr_x), self.get_number(attr_y)
+
+    @property
+    def absolute_position(self) -> Tuple[float, float]:
+        """
+        Returns the position set with `set_position`, in canvas coordinates.
+        """
+        origin_x, origin_y = self._parent_origin()
+        x, y = self.position
+        return origin_x + x, origin_y + y
+
+    @property
+    def bbox(self) -> Optional[BoundingBox]:
+        """
+        Returns the bounding box of the element, in the coordinates of its
+        container, or None if it cannot be computed from the attributes.
+        The bounding box is cached until the element changes.
+        """
+        if self._bbox is _UNSET:
+            self._bbox = self._compute_bbox()
+        return self._bbox
+
+    @property
+    def absolute_bbox(self) -> Optional[BoundingBox]:
+        """
+        Returns the bounding box of the element in canvas coordinates, or None if it
+        cannot be computed from the attributes.
+        """
+        bbox = self.bbox
+        if bbox is None:
             return None
+        return bbox.translated(*self._parent_origin())
 
-        return self._attr.get(key)
+    @property
+    def attributes(self) -> Dict[str, str]:
+        """
+        Returns the SVG attributes of the element, including its CSS class.
+        """
+        attributes = {
+            key: value if isinstance(value, str) else str(value)
+            for key, value in self._attr.items()
+        }
+        if self._css_class:
+            attributes["class"] = self._css_class
+        return attributes
 
     @property
     def xml_element(self) -> Element:
         return self._create_xml_element()
 
+    @property
+    def style(self) -> Optional[SvgStyle]:
+        return self._style
+
     @property
     def style_element(self) -> Optional[Element]:
-        return self._style_element
+        if self._style is None:
+            return None
+        return self._style.xml_element
 
     @property
     def text(self) -> Optional[str]:
@@ -86,7 +183,55 @@ class SvgElement:
 
     @text.setter
     def text(self, value: str) -> None:
+        if value == self._text:
+            return
         self._text = value
+        self._changed()
+
+    def _changed(self) -> None:
+        """
+        Drops the cached bounding box and notifies the containers of the element
+        that it has been modified.
+        """
+        self._bbox = _UNSET
+        if self._parent is not None:
+            self._parent._changed()
+
+    def _parent_origin(self) -> Tuple[float, float]:
+        """
+        Returns the canvas coordinates of the origin of the element container.
+        """
+        if self._parent is None:
+            return 0.0, 0.0
+        return self._parent._absolute_origin()
+
+    def _position_attributes(self) -> Tuple[str, str]:
+        if self._tag == "circle":
+            return "cx", "cy"
+        return "x", "y"
+
+    def _compute_bbox(self) -> Optional[BoundingBox]:
+        """
+        Computes the bounding box of the element from its attributes.
+        """
+        number = self.get_number
+        if self._tag == "rect":
+            return BoundingBox.from_size(
+                number("x"), number("y"), number("width"), number("height")
+            )
+        if self._tag == "circle":
+            r = number("r")
+            return BoundingBox(
+                number("cx") - r, number("cy") - r, number("cx") + r, number("cy") + r
+            )
+        if self._tag == "line":
+            return BoundingBox.from_points(
+                [(number("x1"), number("y1")), (number("x2"), number("y2"))]
+            )
+        if self._tag == "text":
+            x, y = self.position
+            return BoundingBox(x, y, x, y)
+        return None
 
     def _create_xml_element(self) -> Element:
         """
@@ -94,30 +239,18 @@ class SvgElement:
 
         :return: The XML element.
         """
-        tag: str = self._tag
-        element = Element(tag, self._attr)
-
+        element = Element(self._tag, self.attributes)
         if self.text is not None:
             element.text = self.text
-        if self._css_class:
-            element.set("class", self._css_class)
         return element
 
-    def _load_css_style(self) -> Optional[Element]:
+    def _load_css_style(self) -> Optional[SvgStyle]:
         """
-        Loads the CSS style from a file and returns it as an XML <style> element.
+        Gets the shared CSS style of the element class from the style registry.
 
-        :return: The XML <style> element containing the CSS content.
+        :return: The SvgStyle of the CSS class or None if there is none.
         """
         if not self._css_class:
             return None
 
-        css_file_path = Path(f"src/ewoksdraw/css_styles/css_{self._css_class}.css")
-        if not css_file_path.exists():
-            return None
-
-        with open(css_file_path, "r") as css_file:
-            css_content = css_file.read()
-        style = Element("style")
-        style.text = f"<![CDATA[\n{css_content}\n]]>"
-        return style
+        return get_css_style(self._css_class)
@@ -0,0 +1,926 @@
+import abc
+import math
+import re
+import struct
+import tempfile
+import zlib
+from functools import lru_cache
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import BinaryIO
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+from ..geometry import BoundingBox
+from .font_metrics import DEFAULT_FONT
+from .font_metrics import get_font_registry
+from .svg_element import SvgElement
+from .svg_group import SvgGroup
+from .text_metrics import get_text_metrics
+
+if TYPE_CHECKING:
+    from .svg_canvas import SvgCanvas
+
+# Size from which the PDF page content is spooled to a temporary file, in bytes
+PDF_SPOOL_SIZE = 1024 * 1024
+# Height of the PNG strips drawn at once, in pixels
+PNG_STRIP_HEIGHT = 256
+
+# Red, green, blue and alpha channels, between 0 and 1
+Color = Tuple[float, float, float, float]
+Point = Tuple[float, float]
+# Absolute path command ("M", "L", "C" or "Z") and its coordinates
+PathSegment = Tuple[str, Tuple[float, ...]]
+
+# Distance, in canvas units, by which the elements may be drawn outside of their
+# bounding box: strokes, and glyphs of raster fonts wider than the PDF fonts
+_PNG_STRIP_MARGIN = 16
+_CURVE_STEPS = 8
+
+_RGB_PATTERN = re.compile(
+    r"rgba?\(\s*([\d.]+)\s*,\s*([\d.]+)\s*,\s*([\d.]+)\s*(?:,\s*([\d.]+)\s*)?\)"
+)
+_NAMED_COLORS = {"black": "#000000", "white": "#ffffff"}
+_PATH_TOKEN_PATTERN = re.compile(r"[A-Za-z]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_PATH_ARGUMENTS = {"M": 2, "L": 2, "C": 6, "Q": 4, "Z": 0}
+_PDF_PATH_OPERATORS = {"M": "m", "L": "l", "C": "c"}
+# Distance of the Bezier control points approximating a quarter circle of radius 1
+_KAPPA = 0.5522847498
+# Size of the page content formatted before being compressed, in characters
+_PDF_COMPRESS_SIZE = 64 * 1024
+_PDF_STANDARD_FONTS = frozenset(
+    (
+        *(
+            f"{family}{style}"
+            for family in ("Courier", "Helvetica")
+            for style in ("", "-Bold", "-Oblique", "-BoldOblique")
+        ),
+        "Times-Roman",
+        "Times-Bold",
+        "Times-Italic",
+        "Times-BoldItalic",
+        "Symbol",
+        "ZapfDingbats",
+    )
+)
+_PDF_STRING_ESCAPES = [
+    (
+        f"\\{chr(byte)}"
+        if byte in b"\\()"
+        else chr(byte) if 32 <= byte < 127 else f"\\{byte:03o}"
+    )
+    for byte in range(256)
+]
+
+
+class Paint(NamedTuple):
+    """
+    The presentation properties of an element, resolved from its stylesheet.
+
+    :param fill: The fill color, None to not fill.
+    :param stroke: The stroke color, None to not stroke.
+    :param stroke_width: The stroke width, in canvas units.
+    """
+
+    fill: Optional[Color]
+    stroke: Optional[Color]
+    stroke_width: float
+
+
+def parse_color(value: Optional[str]) -> Optional[Color]:
+    """
+    Parses a CSS color: ``#rgb``, ``#rgba``, ``#rrggbb``, ``#rrggbbaa``,
+    ``rgb()``, ``rgba()``, ``black``, ``white``, ``none`` or ``transparent``.
+
+    :return: The color, or None for no color or a fully transparent color.
+    """
+    if value is None:
+        return None
+    value = value.strip().lower()
+    value = _NAMED_COLORS.get(value, value)
+    if value in ("none", "transparent"):
+        return None
+
+    if value.startswith("#"):
+        digits = value[1:]
+        if len(digits) in (3, 4):
+            digits = "".join(digit * 2 for digit in digits)
+        if len(digits) not in (6, 8):
+            raise ValueError(f"Unsupported color '{value}'")
+        channels = [int(digits[i : i + 2], 16) / 255 for i in range(0, len(digits), 2)]
+    else:
+        match = _RGB_PATTERN.fullmatch(value)
+        if match is None:
+            raise ValueError(f"Unsupported color '{value}'")
+        red, green, blue, alpha = match.groups()
+        channels = [float(red) / 255, float(green) / 255, float(blue) / 255]
+        if alpha is not None:
+            channels.append(float(alpha))
+
+    if len(channels) == 3:
+        channels.append(1.0)
+    if channels[3] == 0:
+        return None
+    return channels[0], channels[1], channels[2], channels[3]
+
+
+def parse_length(value: Optional[str], reference: float, default: float) -> float:
+    """
+    Parses a CSS length in pixels, or in percent of a reference length.
+    """
+    if value is None:
+        return default
+    value = value.strip()
+    if value.endswith("%"):
+        return float(value[:-1]) * reference / 100
+    return float(value.rstrip("px"))
+
+
+def parse_path_data(path_data: str) -> List[PathSegment]:
+    """
+    Parses the absolute M, L, C, Q and Z commands of SVG path data, the commands
+    written by `ewoksdraw.routing.path_data`. Quadratic curves are converted to
+    cubic curves.
+    """
+    tokens = _PATH_TOKEN_PATTERN.findall(path_data)
+    segments: List[PathSegment] = []
+    command = None
+    current = start = (0.0, 0.0)
+    i = 0
+    while i < len(tokens):
+        if tokens[i].isalpha():
+            command = tokens[i]
+            i += 1
+            if command not in _PATH_ARGUMENTS:
+                raise ValueError(f"Unsupported path command '{command}'")
+            if command == "Z":
+                segments.append(("Z", ()))
+                current = start
+                continue
+        elif command is None or command == "Z":
+            raise ValueError(f"Invalid path data '{path_data}'")
+
+        nb_arguments = _PATH_ARGUMENTS[command]
+        values = tuple(float(token) for token in tokens[i : i + nb_arguments])
+        if len(values) != nb_arguments:
+            raise ValueError(f"Invalid path data '{path_data}'")
+        i += nb_arguments
+
+        if command == "Q":
+            control_x, control_y, x, y = values
+            values = (
+                current[0] + 2 / 3 * (control_x - current[0]),
+                current[1] + 2 / 3 * (control_y - current[1]),
+                x + 2 / 3 * (control_x - x),
+                y + 2 / 3 * (control_y - y),
+                x,
+                y,
+            )
+            segments.append(("C", values))
+        else:
+            segments.append((command, values))
+        current = values[-2], values[-1]
+        if command == "M":
+            start = current
+            # Coordinates following a moveto are lineto coordinates
+            command = "L"
+    return segments
+
+
+def iter_painted_elements(
+    elements: Iterable[Union[SvgElement, SvgGroup]], origin: Point = (0.0, 0.0)
+) -> Iterator[Tuple[SvgElement, float, float]]:
+    """
+    Walks element trees in drawing order.
+
+    :param elements: The elements and groups to walk.
+    :param origin: The canvas coordinates of the origin of the elements.
+    :return: The elements, with the canvas coordinates of their container origin.
+    """
+    origin_x, origin_y = origin
+    for element in elements:
+        if isinstance(element, SvgGroup):
+            dx, dy = element.translation
+            yield from iter_painted_elements(
+                element.elements, (origin_x + dx, origin_y + dy)
+            )
+        else:
+            yield element, origin_x, origin_y
+
+
+class _Painter(abc.ABC):
+    """
+    Draws SVG elements on another graphics backend, one element at a time, as
+    the element trees are walked.
+
+    Subclasses implement the drawing of shapes, given in canvas coordinates.
+
+    :param width: The width of the canvas.
+    :param height: The height of the canvas.
+    """
+
+    def __init__(self, width: float, height: float):
+        self._width = width
+        self._height = height
+        # The reference of the percentages of lengths which are neither
+        # horizontal nor vertical, like stroke widths
+        self._diagonal = math.sqrt((width * width + height * height) / 2)
+        self._paints: Dict[Optional[str], Paint] = {}
+
+    def paint_elements(
+        self, elements: Iterable[Union[SvgElement, SvgGroup]], origin: Point = (0, 0)
+    ) -> None:
+        for element, origin_x, origin_y in iter_painted_elements(elements, origin):
+            self.paint_element(element, origin_x, origin_y)
+
+    def paint_element(
+        self, element: SvgElement, origin_x: float, origin_y: float
+    ) -> None:
+        paint = self._paint(element)
+        number = element.get_number
+        tag = element.tag
+        if tag == "rect":
+            width, height = number("width"), number("height")
+            if width > 0 and height > 0:
+                self.rect(
+                    origin_x + number("x"),
+                    origin_y + number("y"),
+                    width,
+                    height,
+                    self._corner_radius(element, width, height),
+                    paint,
+                )
+        elif tag == "circle":
+            self.circle(
+                origin_x + number("cx"), origin_y + number("cy"), number("r"), paint
+            )
+        elif tag == "line":
+            self.line(
+                origin_x + number("x1"),
+                origin_y + number("y1"),
+                origin_x + number("x2"),
+                origin_y + number("y2"),
+                paint,
+            )
+        elif tag == "path":
+            path_data = element.get_attr("d")
+            if path_data:
+                segments = [
+                    (command, _translate(values, origin_x, origin_y))
+                    for command, values in parse_path_data(path_data)
+                ]
+                self.path(segments, paint)
+        elif tag == "text" and element.text:
+            self._paint_text(element, origin_x, origin_y, paint)
+
+    @abc.abstractmethod
+    def rect(
+        self,
+        x: float,
+        y: float,
+        width: float,
+        height: float,
+        radius: float,
+        paint: Paint,
+    ) -> None:
+        """
+        Draws a rectangle, with rounded corners of the given radius if positive.
+        """
+
+    @abc.abstractmethod
+    def circle(self, cx: float, cy: float, r: float, paint: Paint) -> None:
+        """
+        Draws a circle.
+        """
+
+    @abc.abstractmethod
+    def line(self, x1: float, y1: float, x2: float, y2: float, paint: Paint) -> None:
+        """
+        Draws a line segment, with the stroke of the paint only.
+        """
+
+    @abc.abstractmethod
+    def path(self, segments: Sequence[PathSegment], paint: Paint) -> None:
+        """
+        Draws a path of absolute M, L, C and Z segments.
+        """
+
+    @abc.abstractmethod
+    def text(
+        self,
+        x: float,
+        baseline_y: float,
+        text: str,
+        font_name: str,
+        font_size: float,
+        text_anchor: str,
+        paint: Paint,
+    ) -> None:
+        """
+        Draws a text starting at x, or centered or ending at x for the
+        "middle" and "end" anchors.
+        """
+
+    def _paint(self, element: SvgElement) -> Paint:
+        """
+        Returns the paint of an element, resolved once per CSS class.
+        """
+        css_class = element.style.css_class if element.style is not None else None
+        paint = self._paints.get(css_class)
+        if paint is None:
+            declarations = element.style.declarations if element.style else {}
+            paint = Paint(
+                fill=parse_color(declarations.get("fill", "black")),
+                stroke=parse_color(declarations.get("stroke")),
+                stroke_width=parse_length(
+                    declarations.get("stroke-width"), self._diagonal, 1.0
+                ),
+            )
+            self._paints[css_class] = paint
+        return paint
+
+    def _corner_radius(self, element: SvgElement, width: float, height: float) -> float:
+        declarations = element.style.declarations if element.style else {}
+        rx = declarations.get("rx", element.get_attr("rx"))
+        ry = declarations.get("ry", element.get_attr("ry"))
+        if rx is None:
+            rx = ry
+        elif ry is None:
+            ry = rx
+        radius = min(
+            parse_length(rx, self._width, 0.0), parse_length(ry, self._height, 0.0)
+        )
+        return max(0.0, min(radius, width / 2, height / 2))
+
+    def _paint_text(
+        self, element: SvgElement, origin_x: float, origin_y: float, paint: Paint
+    ) -> None:
+        families = element.style.font_families if element.style is not None else ()
+        font = get_font_registry().resolve(families)
+        font_size = element.get_number("font-size", 16.0)
+        x, y = element.position
+
+        ascent = get_text_metrics().units_to_width(font.ascent, font_size)
+        descent = get_text_metrics().units_to_width(font.descent, font_size)
+        baseline = element.get_attr("dominant-baseline")
+        if baseline in ("middle", "central"):
+            y += (ascent + descent) / 2
+        elif baseline in ("hanging", "text-before-edge"):
+            y += ascent
+
+        self.text(
+            origin_x + x,
+            origin_y + y,
+            element.text,
+            font.name,
+            font_size,
+            element.get_attr("text-anchor") or "start",
+            paint,
+        )
+
+
+class _PdfPainter(_Painter):
+    """
+    Draws SVG elements as the operators of a PDF page content.
+    """
+
+    def __init__(self, pdf: "_PdfWriter", width: float, height: float):
+        super().__init__(width, height)
+        self._pdf = pdf
+        self._current: Optional[Paint] = None
+        self._fill_alpha = self._stroke_alpha = 1.0
+        # Draw in SVG coordinates, with y pointing down
+        self._emit(f"1 0 0 -1 0 {_pdf_numbers(height)} cm")
+
+    def rect(self, x, y, width, height, radius, paint):
+        operator = self._set_paint(paint)
+        if operator is None:
+            return
+        if radius <= 0:
+            self._emit(f"{_pdf_numbers(x, y, width, height)} re {operator}")
+            return
+        k = radius * (1 - _KAPPA)
+        x2, y2 = x + width, y + height
+        self._emit(
+            f"{_pdf_numbers(x + radius, y)} m "
+            f"{_pdf_numbers(x2 - radius, y)} l "
+            f"{_pdf_numbers(x2 - k, y, x2, y + k, x2, y + radius)} c "
+            f"{_pdf_numbers(x2, y2 - radius)} l "
+            f"{_pdf_numbers(x2, y2 - k, x2 - k, y2, x2 - radius, y2)} c "
+            f"{_pdf_numbers(x + radius, y2)} l "
+            f"{_pdf_numbers(x + k, y2, x, y2 - k, x, y2 - radius)} c "
+            f"{_pdf_numbers(x, y + radius)} l "
+            f"{_pdf_numbers(x, y + k, x + k, y, x + radius, y)} c "
+            f"h {operator}"
+        )
+
+    def circle(self, cx, cy, r, paint):
+        operator = self._set_paint(paint)
+        if operator is None:
+            return
+        k = r * _KAPPA
+        self._emit(
+            f"{_pdf_numbers(cx + r, cy)} m "
+            f"{_pdf_numbers(cx + r, cy + k, cx + k, cy + r, cx, cy + r)} c "
+            f"{_pdf_numbers(cx - k, cy + r, cx - r, cy + k, cx - r, cy)} c "
+            f"{_pdf_numbers(cx - r, cy - k, cx - k, cy - r, cx, cy - r)} c "
+            f"{_pdf_numbers(cx + k, cy - r, cx + r, cy - k, cx + r, cy)} c "
+            f"h {operator}"
+        )
+
+    def line(self, x1, y1, x2, y2, paint):
+        if paint.stroke is not None:
+            self._set_paint(paint)
+            self._emit(f"{_pdf_numbers(x1, y1)} m {_pdf_numbers(x2, y2)} l S")
+
+    def path(self, segments, paint):
+        operator = self._set_paint(paint)
+        if operator is None:
+            return
+        operators = []
+        for command, values in segments:
+            if command == "Z":
+                operators.append("h")
+            else:
+                operators.append(
+                    f"{_pdf_numbers(*values)} {_PDF_PATH_OPERATORS[command]}"
+                )
+        operators.append(operator)
+        self._emit(" ".join(operators))
+
+    def text(self, x, baseline_y, text, font_name, font_size, text_anchor, paint):
+        if paint.fill is None:
+            return
+        self._set_paint(paint)
+        if text_anchor in ("middle", "end"):
+            width = get_text_metrics().text_width(text, font_name, font_size)
+            x -= width / 2 if text_anchor == "middle" else width
+        font = self._pdf.font(font_name)
+        # The text matrix flips the glyphs back upright
+        self._emit(
+            f"BT {font} {_pdf_numbers(font_size)} Tf "
+            f"1 0 0 -1 {_pdf_numbers(x, baseline_y)} Tm ({_pdf_string(text)}) Tj ET"
+        )
+
+    def _set_paint(self, paint: Paint) -> Optional[str]:
+        """
+        Sets the colors and line width of the next shapes, only when they change.
+
+        :return: The operator painting the shapes, None if there is nothing to
+                 paint.
+        """
+        if paint != self._current:
+            self._current = paint
+            operators = []
+            if paint.fill is not None:
+                operators.append(f"{_pdf_numbers(*paint.fill[:3])} rg")
+                if paint.fill[3] != self._fill_alpha:
+                    self._fill_alpha = paint.fill[3]
+                    operators.append(f"{self._pdf.alpha('ca', self._fill_alpha)} gs")
+            if paint.stroke is not None:
+                operators.append(f"{_pdf_numbers(*paint.stroke[:3])} RG")
+                operators.append(f"{_pdf_numbers(paint.stroke_width)} w")
+                if paint.stroke[3] != self._stroke_alpha:
+                    self._stroke_alpha = paint.stroke[3]
+                    operators.append(f"{self._pdf.alpha('CA', self._stroke_alpha)} gs")
+            if operators:
+                self._emit(" ".join(operators))
+        if paint.fill is not None:
+            return "B" if paint.stroke is not None else "f"
+        return "S" if paint.stroke is not None else None
+
+    def _emit(self, operators: str) -> None:
+        self._pdf.write(operators)
+
+
+class _PngPainter(_Painter):
+    """
+    Draws SVG elements on horizontal strips of a Pillow image.
+
+    :param scale: The number of pixels per canvas unit.
+    :param min_stroke_width: The minimum stroke width, in pixels.
+    """
+
+    def __init__(
+        self, width: float, height: float, scale: float, min_stroke_width: int = 1
+    ):
+        super().__init__(width, height)
+        self._scale = scale
+        self._min_stroke_width = min_stroke_width
+        self._draw: Any = None
+        self._offset_y = 0.0
+
+    def begin_strip(self, image: Any, offset_y: float) -> None:
+        """
+        Starts drawing on the strip of the image starting at a pixel row.
+        """
+        from PIL import ImageDraw
+
+        self._draw = ImageDraw.Draw(image, "RGBA")
+        self._offset_y = offset_y
+
+    def rect(self, x, y, width, height, radius, paint):
+        x0, y0 = self._pixel(x, y)
+        x1, y1 = self._pixel(x + width, y + height)
+        self._draw.rounded_rectangle(
+            (x0, y0, x1, y1),
+            radius=radius * self._scale,
+            fill=_pixel_color(paint.fill),
+            outline=_pixel_color(paint.stroke),
+            width=self._stroke_width(paint),
+        )
+
+    def circle(self, cx, cy, r, paint):
+        x0, y0 = self._pixel(cx - r, cy - r)
+        x1, y1 = self._pixel(cx + r, cy + r)
+        self._draw.ellipse(
+            (x0, y0, x1, y1),
+            fill=_pixel_color(paint.fill),
+            outline=_pixel_color(paint.stroke),
+            width=self._stroke_width(paint),
+        )
+
+    def line(self, x1, y1, x2, y2, paint):
+        if paint.stroke is not None:
+            self._draw.line(
+                (self._pixel(x1, y1), self._pixel(x2, y2)),
+                fill=_pixel_color(paint.stroke),
+                width=self._stroke_width(paint),
+            )
+
+    def path(self, segments, paint):
+        for points, closed in _flatten_path(segments):
+            pixels = [self._pixel(x, y) for x, y in points]
+            if paint.fill is not None and closed and len(pixels) > 2:
+                self._draw.polygon(pixels, fill=_pixel_color(paint.fill))
+            if paint.stroke is not None and len(pixels) > 1:
+                if closed:
+                    pixels.append(pixels[0])
+                self._draw.line(
+                    pixels,
+                    fill=_pixel_color(paint.stroke),
+                    width=self._stroke_width(paint),
+                    joint="curve",
+                )
+
+    def text(self, x, baseline_y, text, font_name, font_size, text_anchor, paint):
+        pixel_size = round(font_size * self._scale, 1)
+        if paint.fill is None or pixel_size < 1:
+            # Texts smaller than a pixel are not drawn
+            return
+        anchor = {"middle": "ms", "end": "rs"}.get(text_anchor, "ls")
+        self._draw.text(
+            self._pixel(x, baseline_y),
+            text,
+            fill=_pixel_color(paint.fill),
+            font=_png_font(pixel_size),
+            anchor=anchor,
+        )
+
+    def _pixel(self, x: float, y: float) -> Point:
+        return x * self._scale, y * self._scale - self._offset_y
+
+    def _stroke_width(self, paint: Paint) -> int:
+        if paint.stroke is None:
+            return 0
+        return max(self._min_stroke_width, round(paint.stroke_width * self._scale))
+
+
+def write_pdf(canvas: "SvgCanvas", stream: BinaryIO) -> None:
+    """
+    Draws an SVG canvas as a one page PDF document.
+
+    The elements are drawn on the page as the element trees are walked, without
+    building an intermediate document. The page content is compressed as it is
+    drawn, into a temporary file once larger than `PDF_SPOOL_SIZE`, so that the
+    memory used does not grow with the drawing.
+
+    :param canvas: The canvas to draw.
+    :param stream: The binary stream to write the PDF document to.
+    """
+    with _PdfWriter(stream, canvas.width, canvas.height) as pdf:
+        _PdfPainter(pdf, canvas.width, canvas.height).paint_elements(canvas.elements)
+
+
+class _PdfWriter:
+    """
+    Writes a one page PDF document, whose page content is compressed as it is
+    written and spooled to a temporary file until the document is closed.
+
+    Texts use the standard PDF fonts, which are not embedded.
+    """
+
+    def __init__(self, stream: BinaryIO, width: float, height: float):
+        self._stream = stream
+        self._media_box = f"[ 0 0 {_pdf_number(width)} {_pdf_number(height)} ]"
+        self._content = tempfile.SpooledTemporaryFile(max_size=PDF_SPOOL_SIZE)
+        self._compressor = zlib.compressobj(6)
+        self._pending: List[str] = []
+        self._pending_size = 0
+        self._fonts: Dict[str, str] = {}
+        self._alphas: Dict[Tuple[str, float], str] = {}
+        self._offsets: List[int] = []
+        self._position = 0
+
+    def __enter__(self) -> "_PdfWriter":
+        return self
+
+    def __exit__(self, exc_type, *_) -> None:
+        try:
+            if exc_type is None:
+                self._write_document()
+        finally:
+            self._content.close()
+
+    def write(self, operators: str) -> None:
+        """
+        Adds operators to the page content.
+        """
+        self._pending.append(operators)
+        self._pending_size += len(operators)
+        if self._pending_size >= _PDF_COMPRESS_SIZE:
+            self._compress_pending()
+
+    def font(self, font_name: str) -> str:
+        """
+        Returns the resource name of a font, the default font when it is not a
+        standard PDF font.
+        """
+        resource = self._fonts.get(font_name)
+        if resource is None:
+            if font_name not in _PDF_STANDARD_FONTS:
+                resource = self.font(DEFAULT_FONT)
+            else:
+                resource = f"/F{len(set(self._fonts.values())) + 1}"
+            self._fonts[font_name] = resource
+        return resource
+
+    def alpha(self, operator: str, value: float) -> str:
+        """
+        Returns the resource name of the graphics state setting the fill ("ca")
+        or stroke ("CA") opacity.
+        """
+        key = operator, value
+        resource = self._alphas.get(key)
+        if resource is None:
+            resource = self._alphas[key] = f"/GS{len(self._alphas) + 1}"
+        return resource
+
+    def _compress_pending(self) -> None:
+        data = "\n".join(self._pending).encode("latin-1") + b"\n"
+        self._content.write(self._compressor.compress(data))
+        self._pending.clear()
+        self._pending_size = 0
+
+    def _write_document(self) -> None:
+        self._compress_pending()
+        self._content.write(self._compressor.flush())
+        length = self._content.tell()
+        self._content.seek(0)
+
+        # The other font names share the resource of the default font
+        fonts = {
+            resource: name
+            for name, resource in self._fonts.items()
+            if name in _PDF_STANDARD_FONTS
+        }
+        first_font = 5
+        first_alpha = first_font + len(fonts)
+        resources = ["/ProcSet [ /PDF /Text ]"]
+        if fonts:
+            entries = " ".join(
+                f"{resource} {first_font + i} 0 R" for i, resource in enumerate(fonts)
+            )
+            resources.append(f"/Font << {entries} >>")
+        if self._alphas:
+            entries = " ".join(
+                f"{resource} {first_alpha + i} 0 R"
+                for i, resource in enumerate(self._alphas.values())
+            )
+            resources.append(f"/ExtGState << {entries} >>")
+
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._write_object("<< /Type /Catalog /Pages 2 0 R >>")
+        self._write_object("<< /Type /Pages /Kids [ 3 0 R ] /Count 1 >>")
+        self._write_object(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox {self._media_box} "
+            f"/Resources << {' '.join(resources)} >> /Contents 4 0 R >>"
+        )
+        self._offsets.append(self._position)
+        self._write(
+            f"4 0 obj\n<< /Length {length} /Filter /FlateDecode >>\nstream\n".encode()
+        )
+        while True:
+            data = self._content.read(_PDF_COMPRESS_SIZE)
+            if not data:
+                break
+            self._write(data)
+        self._write(b"\nendstream\nendobj\n")
+        for name in fonts.values():
+            # The symbolic fonts have their own encoding
+            encoding = (
+                ""
+                if name in ("Symbol", "ZapfDingbats")
+                else " /Encoding /WinAnsiEncoding"
+            )
+            self._write_object(
+                f"<< /Type /Font /Subtype /Type1 /BaseFont /{name}{encoding} >>"
+            )
+        for operator, value in self._alphas:
+            self._write_object(
+                f"<< /Type /ExtGState /{operator} {_pdf_number(value)} >>"
+            )
+
+        xref = self._position
+        size = len(self._offsets) + 1
+        self._write(f"xref\n0 {size}\n0000000000 65535 f \n".encode())
+        self._write(
+            "".join(f"{offset:010d} 00000 n \n" for offset in self._offsets).encode()
+        )
+        self._write(
+            f"trailer\n<< /Size {size} /Root 1 0 R >>\n"
+            f"startxref\n{xref}\n%%EOF\n".encode()
+        )
+
+    def _write_object(self, content: str) -> None:
+        self._offsets.append(self._position)
+        number = len(self._offsets)
+        self._write(f"{number} 0 obj\n{content}\nendobj\n".encode())
+
+    def _write(self, data: bytes) -> None:
+        self._stream.write(data)
+        self._position += len(data)
+
+
+def write_png(
+    canvas: "SvgCanvas",
+    stream: BinaryIO,
+    *,
+    scale: float = 1.0,
+    supersampling: int = 2,
+    strip_height: int = PNG_STRIP_HEIGHT,
+) -> None:
+    """
+    Draws an SVG canvas as a PNG image, with Pillow.
+
+    The image is drawn and compressed by horizontal strips, only drawing the
+    top-level elements overlapping each strip, so that the memory used depends
+    on the image width and not on its height.
+
+    :param canvas: The canvas to draw.
+    :param stream: The binary stream to write the PNG image to.
+    :param scale: The number of pixels per canvas unit, below 1 for thumbnails.
+    :param supersampling: Each pixel is drawn as supersampling x supersampling
+                          pixels then averaged, to smooth the edges.
+    :param strip_height: The height of the strips, in pixels.
+    """
+    try:
+        from PIL import Image
+    except ImportError as e:
+        raise ImportError(
+            "Exporting PNG images requires 'pillow', install 'ewoksdraw[png]'"
+        ) from e
+
+    if scale <= 0:
+        raise ValueError(f"scale must be positive, got {scale}")
+    width = max(1, round(canvas.width * scale))
+    height = max(1, round(canvas.height * scale))
+    # Strokes are at least one pixel wide once the supersampled pixels averaged
+    painter = _PngPainter(
+        canvas.width, canvas.height, scale * supersampling, supersampling
+    )
+
+    writer = _PngWriter(stream, width, height)
+    for top in range(0, height, strip_height):
+        rows = min(strip_height, height - top)
+        image = Image.new("RGBA", (width * supersampling, rows * supersampling))
+        painter.begin_strip(image, top * supersampling)
+
+        strip = BoundingBox(
+            -_PNG_STRIP_MARGIN,
+            top / scale - _PNG_STRIP_MARGIN,
+            canvas.width + _PNG_STRIP_MARGIN,
+            (top + rows) / scale + _PNG_STRIP_MARGIN,
+        )
+        painter.paint_elements(canvas.elements_in(strip))
+
+        if supersampling > 1:
+            image = image.reduce(supersampling)
+        writer.write_rows(image.tobytes())
+    writer.close()
+
+
+class _PngWriter:
+    """
+    Writes an RGBA PNG image by blocks of rows, compressing them as they come.
+    """
+
+    def __init__(self, stream: BinaryIO, width: int, height: int):
+        self._stream = stream
+        self._row_size = width * 4
+        self._compressor = zlib.compressobj(6)
+        stream.write(b"\x89PNG\r\n\x1a\n")
+        # 8 bits per channel, RGBA, no interlacing
+        self._write_chunk(
+            b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+        )
+
+    def write_rows(self, pixels: bytes) -> None:
+        row_size = self._row_size
+        # Each row starts with its filter type, 0 for no filter
+        data = b"".join(
+            b"\x00" + pixels[start : start + row_size]
+            for start in range(0, len(pixels), row_size)
+        )
+        self._write_data(self._compressor.compress(data))
+
+    def close(self) -> None:
+        self._write_data(self._compressor.flush())
+        self._write_chunk(b"IEND", b"")
+
+    def _write_data(self, data: bytes) -> None:
+        if data:
+            self._write_chunk(b"IDAT", data)
+
+    def _write_chunk(self, chunk_type: bytes, data: bytes) -> None:
+        self._stream.write(struct.pack(">I", len(data)))
+        self._stream.write(chunk_type)
+        self._stream.write(data)
+        self._stream.write(struct.pack(">I", zlib.crc32(chunk_type + data)))
+
+
+def _translate(values: Tuple[float, ...], dx: float, dy: float) -> Tuple[float, ...]:
+    return tuple(value + (dy if i % 2 else dx) for i, value in enumerate(values))
+
+
+def _flatten_path(segments: Sequence[PathSegment]) -> List[Tuple[List[Point], bool]]:
+    """
+    Converts path segments to polylines, approximating the curves.
+
+    :return: The points of each sub-path, and whether it is closed.
+    """
+    polylines: List[Tuple[List[Point], bool]] = []
+    points: List[Point] = []
+    for command, values in segments:
+        if command == "M":
+            if points:
+                polylines.append((points, False))
+            points = [(values[0], values[1])]
+        elif command == "L":
+            points.append((values[0], values[1]))
+        elif command == "C":
+            x0, y0 = points[-1] if points else (0.0, 0.0)
+            x1, y1, x2, y2, x3, y3 = values
+            for step in range(1, _CURVE_STEPS + 1):
+                t = step / _CURVE_STEPS
+                u = 1 - t
+                points.append(
+                    (
+                        u**3 * x0 + 3 * u * u * t * x1 + 3 * u * t * t * x2 + t**3 * x3,
+                        u**3 * y0 + 3 * u * u * t * y1 + 3 * u * t * t * y2 + t**3 * y3,
+                    )
+                )
+        elif points:
+            polylines.append((points, True))
+            points = [points[0]]
+    if len(points) > 1:
+        polylines.append((points, False))
+    return polylines
+
+
+def _pdf_numbers(*values: float) -> str:
+    return " ".join(f"{value:.3f}" for value in values)
+
+
+def _pdf_number(value: float) -> str:
+    return f"{value:.3f}".rstrip("0").rstrip(".")
+
+
+def _pdf_string(text: str) -> str:
+    """
+    Returns the content of a PDF literal string, encoded with the Windows ANSI
+    encoding of the standard fonts.
+    """
+    encoded = text.encode("cp1252", "replace")
+    return "".join(map(_PDF_STRING_ESCAPES.__getitem__, encoded))
+
+
+def _pixel_color(color: Optional[Color]) -> Optional[Tuple[int, int, int, int]]:
+    if color is None:
+        return None
+    red, green, blue, alpha = (round(channel * 255) for channel in color)
+    return red, green, blue, alpha
+
+
+@lru_cache(maxsize=64)
+def _png_font(size: float) -> Any:
+    from PIL import ImageFont
+
+    return ImageFont.load_default(size=size)
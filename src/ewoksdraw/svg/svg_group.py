@@ -1,22 +1,42 @@
-import re
-from typing import Iterable, Union
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 from xml.etree.ElementTree import Element
 
-from .svg_element import SvgElement
+from ..geometry import BoundingBox
+from .svg_element import _UNSET, SvgElement
+from .svg_style import SvgStyle
 
 
 class SvgGroup:
     """
     Represents a group of SVG elements.
+
+    The translation of the group is kept as numbers and rendered as a single
+    `translate` transform. The bounding box of the group content and the
+    absolute position of the group are cached until the group, one of its
+    elements or one of its containers changes.
     """
 
-    _TRANSLATE_PATTERN = re.compile(
-        r"translate\(\s*[-+]?\d*\.?\d+(?:[,\s]+[-+]?\d*\.?\d+)?\s*\)"
+    __slots__ = (
+        "elements",
+        "_translation",
+        "_parent",
+        "_content_bbox",
+        "_absolute_position",
+        "_fragment",
+        "_styles",
     )
 
     def __init__(self):
         self.elements = []
-        self._transform = ""
+        # None until the group is translated, then rendered as a transform
+        self._translation: Optional[Tuple[float, float]] = None
+        # The SvgGroup or SvgCanvas containing the group, notified of changes
+        self._parent = None
+        self._content_bbox = _UNSET
+        self._absolute_position: Optional[Tuple[float, float]] = None
+        # (indent, text) serialization kept by SvgWriter(reuse_fragments=True)
+        self._fragment: Optional[Tuple[Optional[str], str]] = None
+        self._styles: Optional[List[SvgStyle]] = None
 
     def add_elements(self, elements: Iterable[Union[SvgElement, "SvgGroup"]]) -> None:
         """
@@ -24,45 +44,156 @@ class SvgGroup:
 
         :param elements: The elements to be added.
         """
-        self.elements.extend(elements)
+        for element in elements:
+            element._parent = self
+            if isinstance(element, SvgGroup):
+                element._invalidate_absolute_position()
+            self.elements.append(element)
+        self._changed()
 
     def translate(self, x: float = 0, y: float = 0) -> None:
         """
-        Adds a translation transform by appending it to the existing transform state.
+        Adds a translation to the existing translation of the group.
 
         :param x: The translation distance along the x-axis (default is 0).
         :param y: The translation distance along the y-axis (default is 0).
         """
-        new_transform = f"translate({x},{y})"
-        if self._transform:
-            self._transform += f" {new_transform}"
-        else:
-            self._transform = new_transform
-        self._transform = self._transform.strip()
+        current_x, current_y = self.translation
+        self._set_translation(current_x + x, current_y + y)
 
     def set_translation(self, x: float = 0, y: float = 0) -> None:
         """
-        Sets the translation transform
+        Sets the translation of the group.
 
         :param x: The translation distance along the x-axis (default is 0).
         :param y: The translation distance along the y-axis (default is 0).
         """
-        new_translate = f"translate({x},{y})"
-        current_transform = self._transform or ""
+        self._set_translation(x, y)
+
+    def _set_translation(self, x: float, y: float) -> None:
+        if (x, y) == self._translation:
+            return
+        self._translation = (x, y)
+        self._invalidate_absolute_position()
+        self._changed()
+
+    def _changed(self) -> None:
+        """
+        Drops the cached bounding box and serialization, and notifies the
+        containers of the group that it or one of its elements has been modified.
+        """
+        self._content_bbox = _UNSET
+        self._fragment = None
+        self._styles = None
+        if self._parent is not None:
+            self._parent._changed()
+
+    def _invalidate_absolute_position(self) -> None:
+        """
+        Drops the cached absolute positions of the group and of its sub-groups,
+        called when the group moves.
+        """
+        if self._absolute_position is None:
+            return
+        self._absolute_position = None
+        for element in self.elements:
+            if isinstance(element, SvgGroup):
+                element._invalidate_absolute_position()
+
+    def _absolute_origin(self) -> Tuple[float, float]:
+        """
+        Returns the canvas coordinates of the origin of the group content.
+        """
+        return self.absolute_position
+
+    @property
+    def translation(self) -> Tuple[float, float]:
+        """Returns the total (x, y) translation of the group."""
+        if self._translation is None:
+            return 0, 0
+        return self._translation
+
+    @property
+    def absolute_position(self) -> Tuple[float, float]:
+        """
+        Returns the canvas coordinates of the origin of the group, which is the sum
+        of the translations of the group and of its containers.
+        """
+        if self._absolute_position is None:
+            x, y = self.translation
+            if self._parent is not None:
+                parent_x, parent_y = self._parent._absolute_origin()
+                x, y = parent_x + x, parent_y + y
+            self._absolute_position = (x, y)
+        return self._absolute_position
 
-        cleaned_transform = self._TRANSLATE_PATTERN.sub("", current_transform).strip()
+    @property
+    def content_bbox(self) -> Optional[BoundingBox]:
+        """
+        Returns the bounding box of the group elements, in the coordinates of the
+        group, or None if the group has nothing to draw.
+        """
+        if self._content_bbox is _UNSET:
+            bbox = None
+            for element in self.elements:
+                element_bbox = element.bbox
+                if element_bbox is None:
+                    continue
+                bbox = element_bbox if bbox is None else bbox.union(element_bbox)
+            self._content_bbox = bbox
+        return self._content_bbox
 
-        if cleaned_transform:
-            self._transform = f"{cleaned_transform} {new_translate}".strip()
-        else:
-            self._transform = new_translate
+    @property
+    def bbox(self) -> Optional[BoundingBox]:
+        """
+        Returns the bounding box of the group, in the coordinates of its container,
+        or None if the group has nothing to draw.
+        """
+        bbox = self.content_bbox
+        if bbox is None:
+            return None
+        return bbox.translated(*self.translation)
+
+    @property
+    def absolute_bbox(self) -> Optional[BoundingBox]:
+        """
+        Returns the bounding box of the group in canvas coordinates, or None if the
+        group has nothing to draw.
+        """
+        bbox = self.content_bbox
+        if bbox is None:
+            return None
+        return bbox.translated(*self.absolute_position)
+
+    @property
+    def styles(self) -> List[SvgStyle]:
+        """
+        Returns the unique styles, by CSS class, of the group elements in order
+        of first use. The list is cached until the group changes.
+        """
+        if self._styles is None:
+            styles: Dict[str, SvgStyle] = {}
+            for element in self.elements:
+                if isinstance(element, SvgGroup):
+                    for style in element.styles:
+                        styles.setdefault(style.css_class, style)
+                elif element.style is not None:
+                    styles.setdefault(element.style.css_class, element.style)
+            self._styles = list(styles.values())
+        return self._styles
+
+    @property
+    def attributes(self) -> Dict[str, str]:
+        """Returns the SVG attributes of the group element."""
+        if self._translation is not None:
+            x, y = self._translation
+            return {"transform": f"translate({x},{y})"}
+        return {}
 
     @property
     def xml_element(self) -> Element:
         """Returns the XML representation of the group element."""
-        group_el = Element("g")
-        if self._transform:
-            group_el.set("transform", self._transform)
+        group_el = Element("g", self.attributes)
         for element in self.elements:
             group_el.append(element.xml_element)
         return group_el
@@ -0,0 +1,125 @@
+import re
+from functools import lru_cache
+from importlib.resources import files
+from typing import Dict, List, Optional, Tuple
+from xml.etree.ElementTree import Element
+
+from ..profiling import timer
+
+_DECLARATION_PATTERN = re.compile(r"([\w-]+)\s*:\s*([^;]+)")
+
+
+class SvgStyle:
+    """
+    Represents the parsed content of one CSS stylesheet from the css_styles
+    directory.
+
+    Instances are shared between every element using the same CSS class, they must
+    be treated as read-only.
+
+    :param css_class: The CSS class the stylesheet applies to.
+    :param css: The raw content of the stylesheet.
+    """
+
+    def __init__(self, css_class: str, css: str):
+        self._css_class = css_class
+        self._css = css
+        self._declarations = self._parse_declarations(css)
+        self._font_families = self._parse_font_families(
+            self._declarations.get("font-family", "")
+        )
+
+    @property
+    def css_class(self) -> str:
+        return self._css_class
+
+    @property
+    def css(self) -> str:
+        return self._css
+
+    @property
+    def declarations(self) -> Dict[str, str]:
+        """
+        Returns the CSS declarations of the stylesheet as a property -> value
+        mapping.
+        """
+        return self._declarations
+
+    @property
+    def font_family(self) -> Optional[str]:
+        """
+        Returns the first font family named by the stylesheet, or None.
+        """
+        return self._font_families[0] if self._font_families else None
+
+    @property
+    def font_families(self) -> Tuple[str, ...]:
+        """
+        Returns the font families named by the stylesheet, in order of preference.
+        """
+        return self._font_families
+
+    @property
+    def cdata(self) -> str:
+        """
+        Returns the stylesheet wrapped in a CDATA section.
+        """
+        return f"<![CDATA[\n{self._css}\n]]>"
+
+    @property
+    def xml_element(self) -> Element:
+        """
+        Returns a new XML <style> element containing the stylesheet.
+        """
+        style = Element("style")
+        style.text = self.cdata
+        return style
+
+    @staticmethod
+    def _parse_declarations(css: str) -> Dict[str, str]:
+        start = css.find("{")
+        end = css.rfind("}")
+        body = css[start + 1 : end] if start != -1 else css
+        return {
+            match.group(1): match.group(2).strip()
+            for match in _DECLARATION_PATTERN.finditer(body)
+        }
+
+    @staticmethod
+    def _parse_font_families(value: str) -> Tuple[str, ...]:
+        families = (family.strip().strip("\"'").strip() for family in value.split(","))
+        return tuple(family for family in families if family)
+
+
+@lru_cache(maxsize=None)
+def get_css_style(css_class: str) -> Optional[SvgStyle]:
+    """
+    Loads the stylesheet of a CSS class from the package css_styles directory.
+
+    Each stylesheet is read once per process, subsequent calls return the same
+    SvgStyle instance.
+
+    :param css_class: The CSS class, matching a css_<css_class>.css file.
+    :return: The shared SvgStyle or None if no stylesheet exists for the class.
+    """
+    with timer("styles.load"):
+        css_file = files("ewoksdraw") / "css_styles" / f"css_{css_class}.css"
+        if not css_file.is_file():
+            return None
+        return SvgStyle(css_class, css_file.read_text(encoding="utf-8"))
+
+
+def get_all_css_styles() -> List[SvgStyle]:
+    """
+    Loads the stylesheets of all CSS classes of the package css_styles directory.
+    """
+    styles = []
+    for css_file in sorted(
+        (files("ewoksdraw") / "css_styles").iterdir(), key=lambda f: f.name
+    ):
+        name = css_file.name
+        if name.startswith("css_") and name.endswith(".css"):
+            style = get_css_style(name[len("css_") : -len(".css")])
+            if style is not None:
+                styles.append(style)
+    return styles
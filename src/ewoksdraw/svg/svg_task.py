@@ -1,9 +1,13 @@
+from typing import List, Optional, Sequence, Tuple
+
 from ..config.constants import IO_INTER_IO_MARGIN, IO_TOP_MARGIN
+from ..profiling import count, timer
 from .svg_group import SvgGroup
 from .svg_task_box import SvgTaskBox
 from .svg_task_io import SvgTaskIOGroup
 from .svg_task_line import SvgTaskLine
 from .svg_task_title import SvgTaskTitle
+from .task_layout_cache import TaskLayout, get_task_layout_cache
 
 
 class SvgTask(SvgGroup):
@@ -17,8 +21,30 @@ class SvgTask(SvgGroup):
     :param task_name: The name of the task (displayed as title).
     :param list_input_names: List of input names for the task.
     :param list_output_names: List of output names for the task.
+
+    The text fitting results are shared by the tasks with the same title and IO
+    names through the process-wide task layout cache.
+
+    The title and the IO names can be changed after creation. Only the affected
+    text fitting is redone, and only the elements whose attributes change are
+    marked as modified, so that a canvas re-serializes only the changed tasks.
     """
 
+    __slots__ = (
+        "_task_name",
+        "_interspace_title_input",
+        "_interspace_input_output",
+        "_title",
+        "_box",
+        "_inputs",
+        "_outputs",
+        "_line_title",
+        "_fit_title",
+        "_fit_io",
+        "_title_overflows",
+        "_io_overflows",
+    )
+
     def __init__(
         self,
         task_name: str,
@@ -27,6 +53,8 @@ class SvgTask(SvgGroup):
     ):
         super().__init__()
 
+        count("tasks")
+        self._task_name = task_name
         self._interspace_title_input = IO_TOP_MARGIN
         self._interspace_input_output = IO_INTER_IO_MARGIN
         self._title = SvgTaskTitle(text=task_name, x=0, y=0)
@@ -38,9 +66,114 @@ class SvgTask(SvgGroup):
             list_io=output_names, io_type="output", vertical_spacing=8
         )
         self._line_title = SvgTaskLine(x1=0, y1=0, x2=0, y2=0)
+        # Texts not fitted yet, and texts which did not fit in the max box width
+        self._fit_title = self._fit_io = True
+        self._title_overflows = self._io_overflows = False
 
         self._init_elements()
 
+    @property
+    def width(self) -> float:
+        """
+        Returns the width of the task box.
+        """
+        return self._box.width
+
+    @property
+    def height(self) -> float:
+        """
+        Returns the height of the task box.
+        """
+        return self._box.height
+
+    @property
+    def title(self) -> str:
+        """
+        Returns the task name, before any truncation of the displayed title.
+        """
+        return self._task_name
+
+    @property
+    def input_names(self) -> List[str]:
+        return self._inputs.names
+
+    @property
+    def output_names(self) -> List[str]:
+        return self._outputs.names
+
+    def set_title(self, task_name: str) -> None:
+        """
+        Changes the task name and re-fits the title.
+
+        :param task_name: The new name of the task.
+        """
+        if task_name == self._task_name:
+            return
+        self._task_name = task_name
+        self._title.reset(task_name)
+        self._fit_title = True
+        self._layout()
+
+    def set_input_names(self, input_names: Sequence[str]) -> None:
+        """
+        Changes the input names and re-fits the IO labels.
+
+        :param input_names: The new input names.
+        """
+        if list(input_names) == self._inputs.names:
+            return
+        self._inputs.set_names(input_names)
+        self._outputs.reset()
+        self._fit_io = True
+        self._layout()
+
+    def set_output_names(self, output_names: Sequence[str]) -> None:
+        """
+        Changes the output names and re-fits the IO labels.
+
+        :param output_names: The new output names.
+        """
+        if list(output_names) == self._outputs.names:
+            return
+        self._outputs.set_names(output_names)
+        self._inputs.reset()
+        self._fit_io = True
+        self._layout()
+
+    @property
+    def box(self) -> SvgTaskBox:
+        """
+        Returns the box element of the task.
+        """
+        return self._box
+
+    def input_anchor_position(self, name: Optional[str] = None) -> Tuple[float, float]:
+        """
+        Returns the position of the anchor of an input, in canvas coordinates.
+
+        :param name: The input name. If None or unknown, the middle of the left
+                     side of the box is returned.
+        """
+        return self._anchor_position(self._inputs, name, 0)
+
+    def output_anchor_position(self, name: Optional[str] = None) -> Tuple[float, float]:
+        """
+        Returns the position of the anchor of an output, in canvas coordinates.
+
+        :param name: The output name. If None or unknown, the middle of the right
+                     side of the box is returned.
+        """
+        return self._anchor_position(self._outputs, name, self.width)
+
+    def _anchor_position(
+        self, io_group: SvgTaskIOGroup, name: Optional[str], default_x: float
+    ) -> Tuple[float, float]:
+        io = io_group.get_io(name) if name is not None else None
+        if io is None:
+            x, y = self.absolute_position
+            return x + default_x, y + self.height / 2
+        return io.anchor.absolute_position
+
     def _init_elements(self) -> None:
         """
         Initializes the SVG task elements, setting their sizes and positions.
@@ -48,25 +181,76 @@ class SvgTask(SvgGroup):
         self.add_elements(
             [self._title, self._box, self._inputs, self._outputs, self._line_title]
         )
+        self._layout()
 
-        self._scale_horizontal()
-        self._scale_vertical()
+    def _layout(self) -> None:
+        """
+        Fits the texts which are not fitted yet, or takes the fitting from the
+        task layout cache, then sizes and places the elements. The title and the
+        IO labels are fitted independently.
+        """
+        cache = get_task_layout_cache()
+        key = cache.key(self._task_name, self._inputs.names, self._outputs.names)
+        layout = cache.get(key)
+        if layout is None:
+            count("task.layout_cache_misses")
+            with timer("task.fit_texts"):
+                box_width = self._scale_horizontal()
+            cache.put(key, self._fitted_layout(box_width))
+        else:
+            count("task.layout_cache_hits")
+            self._apply_layout(layout)
 
-    def _scale_horizontal(self) -> None:
+        with timer("task.place"):
+            self._title.set_position(x=self._box.width / 2.0)
+            self._scale_vertical()
+
+    def _fitted_layout(self, box_width: float) -> TaskLayout:
+        return TaskLayout(
+            title_text=self._title.text,
+            title_font_size=self._title.font_size,
+            input_texts=self._inputs.texts,
+            output_texts=self._outputs.texts,
+            input_font_size=self._inputs.font_size,
+            output_font_size=self._outputs.font_size,
+            box_width=box_width,
+            title_overflows=self._title_overflows,
+            io_overflows=self._io_overflows,
+        )
+
+    def _apply_layout(self, layout: TaskLayout) -> None:
+        self._title.text = layout.title_text
+        self._title.set_font_size(layout.title_font_size)
+        self._inputs.set_texts(layout.input_texts, layout.input_font_size)
+        self._outputs.set_texts(layout.output_texts, layout.output_font_size)
+        self._box.set_width(layout.box_width)
+        self._title_overflows = layout.title_overflows
+        self._io_overflows = layout.io_overflows
+        self._fit_title = self._fit_io = False
+
+    def _scale_horizontal(self) -> float:
         """
         Adjusts the widths of title, input/output groups, and box.
 
+        :return: The box width.
         """
 
         target_width = max([self._title.width, self._inputs.width, self._outputs.width])
-        # If the box width is within the defined min and max bounds
-        if (target_width >= self._box._min_width) and (
-            target_width <= self._box._max_width
-        ):
-            self._box.set_width(target_width)
+        # Texts fitted by a previous layout keep the box at its max width
+        if self._fit_title:
+            self._title_overflows = self._title.width > self._box._max_width
+        if self._fit_io:
+            self._io_overflows = (
+                max(self._inputs.width, self._outputs.width) > self._box._max_width
+            )
+        self._fit_title = self._fit_io = False
+
+        if not (self._title_overflows or self._io_overflows):
+            # The box width is the target width within the min and max bounds
+            box_width = max(target_width, self._box._min_width)
 
-        elif target_width > self._box._max_width:
-            self._box.set_width(self._box._max_width)
+        else:
+            box_width = self._box._max_width
 
             max_iterations = 50
             iteration = 0
@@ -86,8 +270,8 @@ class SvgTask(SvgGroup):
                     self._outputs.decrease_size_to_fit_width(self._box._max_width)
                     self._inputs.set_font_size(self._outputs.font_size)
 
-        self._outputs.translate(x=self._box.width)
-        self._title.set_position(x=self._box.width / 2.0)
+        self._box.set_width(box_width)
+        return box_width
 
     def _scale_vertical(self) -> None:
         """
@@ -106,9 +290,9 @@ class SvgTask(SvgGroup):
         self._title.set_position(y=self._title.vertical_margin // 2)
 
         pos = self._title.height + self._interspace_title_input
-        self._inputs.translate(y=pos)
+        self._inputs.set_translation(x=0, y=pos)
         pos += self._inputs.height + self._interspace_input_output
-        self._outputs.translate(y=pos)
+        self._outputs.set_translation(x=self._box.width, y=pos)
 
         self._line_title.set_coordinates(
             x1=0,
@@ -1,4 +1,8 @@
-from .svg_element import SvgElement
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping
+
+from .svg_element import AttributeValue, SvgElement
 
 
 class SvgTaskAnchorLink(SvgElement):
@@ -9,6 +13,20 @@ class SvgTaskAnchorLink(SvgElement):
     :param radius: The radius of the circle.
     """
 
+    __slots__ = ()
+
     def __init__(self, cx: float, cy: float, radius: float):
-        attr = {"cx": str(cx), "cy": str(cy), "r": str(radius)}
+        attr = _shared_attributes(cx, cy, radius)
         super().__init__(tag="circle", css_class="task_anchor_link", attr=attr)
+
+
+@lru_cache(maxsize=64)
+def _shared_attributes(
+    cx: float, cy: float, radius: float
+) -> Mapping[str, AttributeValue]:
+    """
+    Returns read-only attributes shared by the anchors created with the same
+    position and radius, which are almost all the anchors since they are placed
+    by translating their IO group.
+    """
+    return MappingProxyType({"cx": cx, "cy": cy, "r": radius})
@@ -9,24 +9,29 @@ class SvgTaskBox(SvgElement):
     :param y: The y-coordinate of the box.
     """
 
+    __slots__ = ("_min_width", "_max_width")
+
     def __init__(self, x: float, y: float):
         self._min_width = BOX_MIN_WIDTH
         self._max_width = BOX_MAX_WIDTH
 
         attr = {
-            "x": str(x),
-            "y": str(y),
-            "width": str(self._min_width),
+            "x": x,
+            "y": y,
+            "width": self._min_width,
         }
         super().__init__(tag="rect", css_class="task_box", attr=attr)
 
     def set_width(self, width: float) -> None:
-        self.set_attr("width", str(width))
+        self.set_attr("width", width)
 
     def set_height(self, height: float) -> None:
-        self.set_attr("height", str(height))
+        self.set_attr("height", height)
 
     @property
     def width(self) -> float:
-        width = self.get_attr("width") or "0"
-        return float(width)
+        return self.get_number("width")
+
+    @property
+    def height(self) -> float:
+        return self.get_number("height")
@@ -1,4 +1,4 @@
-from typing import Literal
+from typing import List, Literal, Optional, Sequence, Tuple
 
 from ..config.constants import (
     ANCHOR_LINKS_RADIUS,
@@ -9,6 +9,7 @@ from ..config.constants import (
 from .svg_group import SvgGroup
 from .svg_task_anchor_link import SvgTaskAnchorLink
 from .svg_text import SvgText
+from .text_fitting import fit_font_size, max_font_decrements
 
 
 class SvgTaskIO(SvgGroup):
@@ -19,6 +20,8 @@ class SvgTaskIO(SvgGroup):
     :param io_type: The type of IO, typically "input" or "output".
     """
 
+    __slots__ = ("_io_type", "_io_txt", "_anchor_text_spacing", "txt", "anchor")
+
     def __init__(self, io_txt: str, io_type: Literal["input", "output"]):
         super().__init__()
 
@@ -44,22 +47,55 @@ class SvgTaskIO(SvgGroup):
         """
         return self.txt.font_size
 
+    @property
+    def name(self) -> str:
+        """
+        Returns the IO name, before any truncation of the displayed text.
+        """
+        return self._io_txt
+
+    @property
+    def anchor_position(self) -> Tuple[float, float]:
+        """
+        Returns the center of the anchor link, in the coordinates of the parent
+        of this IO element.
+        """
+        x, y = self.translation
+        anchor_x, anchor_y = self.anchor.position
+        return x + anchor_x, y + anchor_y
+
+    def reset(self) -> None:
+        """
+        Restores the full IO name at the target font size, before fitting.
+        """
+        self.txt.text = self._io_txt
+        self.set_font_size(IO_TARGET_FONT_SIZE)
+
+    def width_for_font_size(self, font_size: float) -> float:
+        """
+        Returns the width this IO element would have with the given font size.
+
+        :param font_size: The font size.
+        """
+        return self.txt.width_for_font_size(font_size) + self._spacing_width
+
     @property
     def width(self) -> float:
         """
         Returns the total width of this IO element, including text and spacing.
         """
-        width_txt = self.txt.width
-        return width_txt + (self._anchor_text_spacing) * 2
+        return self.width_for_font_size(self.font_size)
+
+    @property
+    def _spacing_width(self) -> float:
+        return (self._anchor_text_spacing) * 2
 
     @property
     def height(self) -> float:
         """
         Returns the height, max of diameter of anchor or txt.
         """
-        radius_attr = float(self.anchor.get_attr("r") or "0")
-
-        return max(self.txt.height, radius_attr * 2)
+        return max(self.txt.height, self.anchor.get_number("r") * 2)
 
     def _init_elements(self) -> None:
         """
@@ -91,6 +127,17 @@ class SvgTaskIO(SvgGroup):
         """
         self.txt.truncate_text_by_one()
 
+    def truncate_text_to_fit_width(self, target_width: float) -> None:
+        """
+        Truncates the displayed text so that this IO element, including spacing,
+        fits within the target width.
+
+        :param target_width: The maximum allowed width.
+        """
+        self.txt.truncate_text_to_fit_width(
+            target_width, extra_width=self._spacing_width
+        )
+
 
 class SvgTaskIOGroup(SvgGroup):
     """
@@ -101,6 +148,8 @@ class SvgTaskIOGroup(SvgGroup):
     :param vertical_spacing: Vertical space between elements (default is 10).
     """
 
+    __slots__ = ("_io_type", "_list_io", "_vertical_spacing")
+
     def __init__(
         self,
         list_io: list[str],
@@ -112,7 +161,7 @@ class SvgTaskIOGroup(SvgGroup):
         if io_type not in ("input", "output"):
             raise ValueError(f"io_type must be 'input' or 'output', got '{io_type}'")
         self._io_type = io_type
-        self._list_io = list_io
+        self._list_io = list(list_io)
         self._vertical_spacing = vertical_spacing
         self._init_elements()
 
@@ -125,6 +174,51 @@ class SvgTaskIOGroup(SvgGroup):
         for element in self.elements:
             element.set_font_size(font_size)
 
+    @property
+    def names(self) -> List[str]:
+        """
+        Returns the IO names, before any truncation of the displayed texts.
+        """
+        return list(self._list_io)
+
+    def set_names(self, list_io: Sequence[str]) -> None:
+        """
+        Replaces the IO elements by new ones, at the target font size.
+
+        :param list_io: The new IO labels.
+        """
+        for element in self.elements:
+            element._parent = None
+        self.elements = []
+        self._list_io = list(list_io)
+        self._init_elements()
+
+    def reset(self) -> None:
+        """
+        Restores the full IO names at the target font size, before fitting.
+        """
+        for element in self.elements:
+            element.reset()
+
+    @property
+    def texts(self) -> Tuple[str, ...]:
+        """
+        Returns the displayed, possibly truncated, IO names.
+        """
+        return tuple(element.txt.text for element in self.elements)
+
+    def set_texts(self, texts: Sequence[str], font_size: float) -> None:
+        """
+        Sets the displayed IO names and font size of a previous fitting.
+
+        :param texts: The displayed IO names, one per element.
+        :param font_size: The font size of all the elements.
+        """
+        for element, text in zip(self.elements, texts):
+            element.txt.text = text
+        if self.elements:
+            self.set_font_size(font_size)
+
     def set_vertical_spacing(self, vertical_spacing) -> None:
         """
         Adjusts the vertical spacing between the IO elements.
@@ -147,16 +241,34 @@ class SvgTaskIOGroup(SvgGroup):
 
         min_font_size = IO_MIN_FONT_SIZE
 
-        if self.elements:
-            current_width = self.width
+        if not self.elements:
+            return
+
+        font_size = fit_font_size(
+            self.width_for_font_size,
+            self.font_size,
+            target_width,
+            max_font_decrements(self.font_size, min_font_size, inclusive=True),
+        )
+        if font_size != self.font_size:
+            self.set_font_size(font_size)
+
+        # Truncating the widest element until the group fits gives each element
+        # its own shortest truncation that fits.
+        for element in self.elements:
+            element.truncate_text_to_fit_width(target_width)
+
+    def width_for_font_size(self, font_size: float) -> float:
+        """
+        Returns the width the group would have if all its elements had the given
+        font size, or 0 if empty.
 
-            while (target_width < current_width) and (self.font_size >= min_font_size):
-                self.set_font_size(self.font_size - 1)
-                current_width = self.width
+        :param font_size: The font size.
+        """
+        if not self.elements:
+            return 0.0
 
-            while target_width < current_width:
-                self.truncate_text_by_one()
-                current_width = self.width
+        return max(element.width_for_font_size(font_size) for element in self.elements)
 
     @property
     def width(self) -> float:
@@ -181,6 +293,17 @@ class SvgTaskIOGroup(SvgGroup):
 
         return len(self.elements) * self._vertical_spacing
 
+    def get_io(self, name: str) -> Optional[SvgTaskIO]:
+        """
+        Returns the IO element with the given name, or None if there is none.
+
+        :param name: The IO name.
+        """
+        for element in self.elements:
+            if element.name == name:
+                return element
+        return None
+
     @property
     def font_size(self) -> float:
         """
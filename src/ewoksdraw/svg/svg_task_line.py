@@ -11,8 +11,10 @@ class SvgTaskLine(SvgElement):
     :param y2: The y-coordinate of the end point of the line.
     """
 
+    __slots__ = ()
+
     def __init__(self, x1: int, y1: int, x2: int, y2: int):
-        attr = {"x1": str(x1), "y1": str(y1), "x2": str(x2), "y2": str(y2)}
+        attr = {"x1": x1, "y1": y1, "x2": x2, "y2": y2}
         super().__init__(tag="line", css_class="task_line", attr=attr)
 
     def set_coordinates(self, x1: float, y1: float, x2: float, y2: float) -> None:
@@ -25,7 +27,7 @@ class SvgTaskLine(SvgElement):
         :param y2: The new y-coordinate of the end point.
         """
 
-        self.set_attr("x1", str(x1))
-        self.set_attr("y1", str(y1))
-        self.set_attr("x2", str(x2))
-        self.set_attr("y2", str(y2))
+        self.set_attr("x1", x1)
+        self.set_attr("y1", y1)
+        self.set_attr("x2", x2)
+        self.set_attr("y2", y2)
@@ -0,0 +1,37 @@
+from typing import Literal, Optional, Sequence, Tuple
+
+from ..geometry import BoundingBox
+from ..routing import path_data
+from .svg_element import SvgElement
+
+
+class SvgTaskLink(SvgElement):
+    """
+    Represents a link between an output anchor and an input anchor as an SVG path.
+
+    :param points: The points of the link route, from the output anchor to the
+                   input anchor.
+    :param routing: "orthogonal" to draw straight segments, "spline" to draw a
+                    smooth curve following the route.
+    """
+
+    __slots__ = ("_points",)
+
+    def __init__(
+        self,
+        points: Sequence[Tuple[float, float]],
+        routing: Literal["orthogonal", "spline"] = "orthogonal",
+    ):
+        self._points = list(points)
+        attr = {"d": path_data(self._points, routing)}
+        super().__init__(tag="path", css_class="task_link", attr=attr)
+
+    @property
+    def points(self) -> Sequence[Tuple[float, float]]:
+        """
+        Returns the points of the link route.
+        """
+        return self._points
+
+    def _compute_bbox(self) -> Optional[BoundingBox]:
+        return BoundingBox.from_points(self._points)
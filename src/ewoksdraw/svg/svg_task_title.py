@@ -18,6 +18,8 @@ class SvgTaskTitle(SvgText):
     :param y: The y-coordinate of the task title in the SVG canvas.
     """
 
+    __slots__ = ("vertical_margin", "horizontal_margin")
+
     def __init__(self, text: str, x: int, y: int):
         self.vertical_margin: int = TITLE_VERTICAL_MARGIN
         self.horizontal_margin: int = TITLE_HORIZONTAL_MARGIN
@@ -26,6 +28,15 @@ class SvgTaskTitle(SvgText):
         self.set_text_anchor("middle")
         self.set_font_size(TITLE_TARGET_FONT_SIZE)
 
+    def reset(self, text: str) -> None:
+        """
+        Sets the full title text at the target font size, before fitting.
+
+        :param text: The title text.
+        """
+        self.text = text
+        self.set_font_size(TITLE_TARGET_FONT_SIZE)
+
     def modify_text_to_fit_width(
         self, target_width: float, *, min_font_size: Optional[float] = None
     ) -> None:
@@ -39,8 +50,8 @@ class SvgTaskTitle(SvgText):
         super().modify_text_to_fit_width(target_width, min_font_size=min_font_size)
 
     @property
-    def width(self) -> float:
-        return super().width + self.horizontal_margin
+    def _horizontal_padding(self) -> float:
+        return self.horizontal_margin
 
     @property
     def height(self) -> float:
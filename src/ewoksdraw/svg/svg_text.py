@@ -1,9 +1,16 @@
-import re
+import sys
 from typing import Optional
 
-from reportlab.pdfbase.pdfmetrics import stringWidth
-
+from ..geometry import BoundingBox
+from .font_metrics import get_font_registry
 from .svg_element import SvgElement
+from .text_fitting import (
+    ELLIPSIS,
+    fit_font_size,
+    fit_truncated_text,
+    max_font_decrements,
+)
+from .text_metrics import get_text_metrics
 
 
 class SvgText(SvgElement):
@@ -15,10 +22,12 @@ class SvgText(SvgElement):
     :param css_class: The CSS class to apply to the text element.
     """
 
+    __slots__ = ()
+
     def __init__(self, text: str, x: int, y: int, css_class: str):
         attr = {
-            "x": str(x),
-            "y": str(y),
+            "x": x,
+            "y": y,
             "text-anchor": "start",
             "dominant-baseline": "middle",
             "font-size": "6px",
@@ -31,18 +40,65 @@ class SvgText(SvgElement):
     ) -> None:
         """
         Adjusts the font size and truncates the text to fit within a target width.
+
+        The font size is decreased by steps of 1 until the text fits or the font
+        size reaches `min_font_size`, then the text is truncated.
         """
 
         font_size_limit = min_font_size if min_font_size is not None else 0.0
 
-        while self.width > target_width and self.font_size > font_size_limit:
-            self.set_font_size(self.font_size - 1)
+        font_size = fit_font_size(
+            self.width_for_font_size,
+            self.font_size,
+            target_width,
+            max_font_decrements(self.font_size, font_size_limit),
+        )
+        if font_size != self.font_size:
+            self.set_font_size(font_size)
+
+        self.truncate_text_to_fit_width(target_width)
 
-        while self.width > target_width:
-            self.truncate_text_by_one()
+    def truncate_text_to_fit_width(
+        self, target_width: float, *, extra_width: Optional[float] = None
+    ) -> None:
+        """
+        Truncates the text, keeping the font size, to fit within a target width.
+        The result is the same as calling `truncate_text_by_one` until it fits.
+
+        :param target_width: The maximum allowed width.
+        :param extra_width: Width added to the text width, defaults to the
+                            horizontal padding of the element.
+        """
+        if self.text is None:
+            return
+
+        if extra_width is None:
+            extra_width = self._horizontal_padding
+        metrics = get_text_metrics()
+        font_name = self.font_name
+        font_size = self.font_size
+
+        def width_of_units(units: float) -> float:
+            return metrics.units_to_width(units, font_size) + extra_width
+
+        if width_of_units(metrics.text_units(self.text, font_name)) <= target_width:
+            return
+
+        text = fit_truncated_text(
+            self.text,
+            metrics.prefix_units(self.text, font_name),
+            metrics.text_units(ELLIPSIS, font_name),
+            width_of_units,
+            target_width,
+        )
+        self.text = text
 
     def set_font_size(self, font_size: float) -> None:
-        self.set_attr("font-size", f"{font_size}px")
+        if font_size == int(font_size):
+            # Same attribute for the same size, whether it is an int or a float
+            font_size = int(font_size)
+        # Texts of the same size share the attribute string
+        self.set_attr("font-size", sys.intern(f"{font_size}px"))
 
     def set_dominant_baseline(self, dominant_baseline: str) -> None:
         self.set_attr("dominant-baseline", dominant_baseline)
@@ -50,16 +106,33 @@ class SvgText(SvgElement):
     def set_text_anchor(self, text_anchor: str) -> None:
         self.set_attr("text-anchor", text_anchor)
 
+    def width_for_font_size(self, font_size: float) -> float:
+        """
+        Returns the width the element would have with the given font size.
+
+        :param font_size: The font size.
+        """
+        if self.text is None:
+            text_width = 0.0
+        else:
+            text_width = self._compute_text_width(self.text, font_size, self.font_name)
+        return text_width + self._horizontal_padding
+
     @property
     def width(self) -> float:
-        if self.text is None:
-            return 0
-        return self._compute_text_width(self.text, self.font_size, self.font_name)
+        return self.width_for_font_size(self.font_size)
 
     @property
     def height(self) -> float:
         return self._compute_text_height(self.font_size)
 
+    @property
+    def _horizontal_padding(self) -> float:
+        """
+        Returns the horizontal space added to the text width.
+        """
+        return 0
+
     @property
     def font_name(self) -> str:
         return self._extract_font_name()
@@ -82,20 +155,34 @@ class SvgText(SvgElement):
 
     def _extract_font_name(self) -> str:
         """
-        Extracts the font name from the style element's CSS content.
+        Resolves the font of the element from the font families of its CSS style.
 
-        :return: The extracted font name or "Helvetica" if not found.
+        :return: The name of the first known font family, or of the default font.
         """
+        families = self.style.font_families if self.style is not None else ()
+        return get_font_registry().resolve(families).name
 
-        if self.style_element is None:
-            return "Helvetica"
-
-        css_content = self.style_element.text
-        match = re.search(r"font-family:\s*([\w\s-]+)", css_content or "")
-        if match:
-            return match.group(1).strip()
-        else:
-            return "Helvetica"
+    def _compute_bbox(self) -> Optional[BoundingBox]:
+        """
+        Computes the bounding box of the text from its position, alignment and
+        font metrics.
+        """
+        x, y = self.position
+        width = self.width_for_font_size(self.font_size) - self._horizontal_padding
+        height = self.height
+
+        text_anchor = self.get_attr("text-anchor")
+        if text_anchor == "middle":
+            x -= width / 2
+        elif text_anchor == "end":
+            x -= width
+
+        baseline = self.get_attr("dominant-baseline")
+        if baseline in ("middle", "central"):
+            y -= height / 2
+        elif baseline not in ("hanging", "text-before-edge"):
+            y -= height
+        return BoundingBox.from_size(x, y, width, height)
 
     def _compute_text_width(self, text: str, font_size: float, font_name: str) -> float:
         """
@@ -109,7 +196,7 @@ class SvgText(SvgElement):
         :return: The computed width of the text in the specified font and size.
         """
 
-        return stringWidth(text, font_name, font_size)
+        return get_text_metrics().text_width(text, font_name, font_size)
 
     def _compute_text_height(self, font_size: float) -> float:
         """
@@ -126,4 +213,4 @@ class SvgText(SvgElement):
         Truncate the text by removing the last character and adding an ellipsis.
         """
         if self.text is not None:
-            self.text = self.text.rstrip("…").rstrip()[:-1].rstrip() + "…"
+            self.text = self.text.rstrip(ELLIPSIS).rstrip()[:-1].rstrip() + ELLIPSIS
@@ -0,0 +1,562 @@
+import re
+from io import StringIO
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    TextIO,
+    Tuple,
+    Union,
+)
+from xml.etree.ElementTree import Element
+
+from .svg_element import SvgElement
+from .svg_group import SvgGroup
+from .svg_style import SvgStyle
+
+XML_DECLARATION = '<?xml version="1.0" ?>'
+XLINK_NAMESPACE = "http://www.w3.org/1999/xlink"
+
+# Attribute values equal to the SVG initial values, left out of minified documents
+DEFAULT_ATTRIBUTES: Mapping[str, Union[str, float]] = {
+    "x": 0,
+    "y": 0,
+    "cx": 0,
+    "cy": 0,
+    "x1": 0,
+    "y1": 0,
+    "x2": 0,
+    "y2": 0,
+    "text-anchor": "start",
+    "dominant-baseline": "auto",
+}
+
+# Default of the attributes without SVG default value
+_NO_DEFAULT = object()
+# Attributes whose string values hold coordinates, rounded with the precision
+_NUMBER_LIST_ATTRIBUTES = frozenset(("d", "points", "transform", "viewBox"))
+_DECIMAL_NUMBER = re.compile(r"-?\d+\.\d+")
+_COMMA_SPACES = re.compile(r"\s*,\s*")
+
+
+def escape_text(text: str) -> str:
+    """
+    Escapes the XML special characters of a text node. Double quotes are
+    escaped too, like minidom wrote them in the former pretty-printed output.
+    """
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    if '"' in text:
+        text = text.replace('"', "&quot;")
+    return text
+
+
+def escape_attribute(value: str) -> str:
+    """
+    Escapes the XML special characters of an attribute value.
+    """
+    value = escape_text(value)
+    if "\n" in value:
+        value = value.replace("\n", "&#10;")
+    return value
+
+
+def format_number(value: float, precision: int) -> str:
+    """
+    Formats a number with at most `precision` decimals, without trailing zeros.
+    """
+    text = f"{value:.{precision}f}"
+    if "." in text:
+        text = text.rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
+
+
+def short_class_names(css_classes: Iterable[str]) -> Dict[str, str]:
+    """
+    Returns short CSS class names (a, b, ..., z, a0, ...) for CSS classes.
+    """
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    names = {}
+    for index, css_class in enumerate(css_classes):
+        name = letters[index % len(letters)]
+        if index >= len(letters):
+            name += str(index // len(letters) - 1)
+        names[css_class] = name
+    return names
+
+
+class SvgWriter:
+    """
+    Serializes SvgElement and SvgGroup trees to a text stream, without building
+    an intermediate XML tree or string.
+
+    :param stream: The text stream to write to.
+    :param indent: The indentation of one nesting level. If None, the document is
+                   written compact, without indentation nor line breaks.
+    :param reuse_fragments: If True, the serialized text of each top-level group
+                            is kept on the group and reused until the group
+                            changes.
+    :param element_filter: If given, only the elements for which it returns True
+                           are written. Fragments are not reused with a filter.
+    :param shared_defs: If True, the elements and groups repeated in the
+                        document are written once in a <defs> section and drawn
+                        with <use> references, given both as ``href`` and as
+                        ``xlink:href`` for SVG 1.1 renderers. Not applied with a
+                        filter, nor with reused fragments.
+    :param precision: If given, the coordinates are rounded to this number of
+                      decimals.
+    :param minify: If True, the document is written as small as possible:
+                   compact, without XML declaration, default attribute values
+                   (`DEFAULT_ATTRIBUTES`) nor groups without attributes, with
+                   short class names and a single whitespace-free stylesheet.
+    """
+
+    def __init__(
+        self,
+        stream: TextIO,
+        *,
+        indent: Optional[str] = "  ",
+        reuse_fragments: bool = False,
+        element_filter: Optional[Callable[[SvgElement], bool]] = None,
+        shared_defs: bool = False,
+        precision: Optional[int] = None,
+        minify: bool = False,
+    ):
+        if precision is not None and precision < 0:
+            raise ValueError(f"precision must be positive or zero, got {precision}")
+        if minify:
+            indent = None
+        self._stream = stream
+        self._indent = indent
+        self._newline = "" if indent is None else "\n"
+        self._precision = precision
+        self._minify = minify
+        # Values are written as stored, unless rounded or minified
+        self._verbatim = precision is None and not minify
+        self._reuse_fragments = (
+            reuse_fragments and element_filter is None and self._verbatim
+        )
+        self._element_filter = element_filter
+        # The short class names of a minified document, by CSS class
+        self._class_names: Dict[str, str] = {}
+        self._shared_defs = (
+            shared_defs and element_filter is None and not self._reuse_fragments
+        )
+        # The <defs> identifier of the nodes drawn with <use>, by node id
+        self._use_ids: Dict[int, str] = {}
+
+    def write_document(
+        self,
+        attributes: Mapping[str, str],
+        styles: Iterable[SvgStyle],
+        elements: Iterable[Union[SvgElement, SvgGroup]],
+    ) -> None:
+        """
+        Writes a complete SVG document.
+
+        :param attributes: The attributes of the root <svg> element.
+        :param styles: The styles written before the elements.
+        :param elements: The top-level elements or groups.
+        """
+        for _ in self.iter_document(attributes, styles, elements):
+            pass
+
+    def iter_document(
+        self,
+        attributes: Mapping[str, str],
+        styles: Iterable[SvgStyle],
+        elements: Iterable[Union[SvgElement, SvgGroup]],
+    ) -> Iterator[None]:
+        """
+        Writes a complete SVG document like `write_document`, pausing after the
+        styles and after each top-level node, so that the text written so far
+        can be sent while the rest of the document is written.
+        """
+        self.start_document(attributes)
+        if self._minify:
+            styles = list(styles)
+            self._class_names = short_class_names(style.css_class for style in styles)
+            self.write_minified_styles(styles)
+        else:
+            for style in styles:
+                self.write_style(style)
+        if self._shared_defs:
+            elements = list(elements)
+            self.write_defs(elements)
+        yield
+        for element in elements:
+            self.write_node(element)
+            yield
+        self.end_document()
+        self._use_ids.clear()
+        self._class_names = {}
+
+    @property
+    def xml_declaration(self) -> str:
+        """
+        Returns the XML declaration, followed by a line break if indenting.
+        """
+        return f"{XML_DECLARATION}{self._newline}"
+
+    def start_document(self, attributes: Mapping[str, str]) -> None:
+        """
+        Writes the XML declaration, left out of minified documents, and opens
+        the root <svg> element.
+        """
+        declaration = "" if self._minify else self.xml_declaration
+        if self._shared_defs:
+            # For the xlink:href of <use>, understood by SVG 1.1 renderers
+            attributes = {**attributes, "xmlns:xlink": XLINK_NAMESPACE}
+        self._stream.write(
+            f"{declaration}<svg{self._format_attributes(attributes)}>{self._newline}"
+        )
+
+    def end_document(self) -> None:
+        """
+        Closes the root <svg> element.
+        """
+        self._stream.write(f"</svg>{self._newline}")
+
+    def write_style(self, style: SvgStyle, level: int = 1) -> None:
+        """
+        Writes a <style> element with the stylesheet in a CDATA section.
+        """
+        self._stream.write(
+            f"{self._prefix(level)}<style>{style.cdata}</style>{self._newline}"
+        )
+
+    def write_minified_styles(self, styles: Iterable[SvgStyle], level: int = 1) -> None:
+        """
+        Writes the stylesheets as a single <style> element, one rule per style
+        with its short class name, without whitespace.
+        """
+        rules = []
+        for style in styles:
+            declarations = ";".join(
+                f"{name}:{_COMMA_SPACES.sub(',', value)}"
+                for name, value in style.declarations.items()
+            )
+            class_name = self._class_names.get(style.css_class, style.css_class)
+            rules.append(f".{class_name}{{{declarations}}}")
+        css = "".join(rules)
+        if not css:
+            return
+        if "<" in css or "&" in css:
+            css = f"<![CDATA[{css}]]>"
+        self._stream.write(f"{self._prefix(level)}<style>{css}</style>{self._newline}")
+
+    def write_defs(
+        self, nodes: Iterable[Union[SvgElement, SvgGroup]], level: int = 1
+    ) -> None:
+        """
+        Writes a <defs> section with the elements and groups repeated in the
+        node trees, so that the following `write_node` calls draw them with
+        <use> references. Nothing is written if no subtree is repeated.
+
+        :param nodes: The top-level nodes of the document.
+        :param level: The nesting level of the <defs> element.
+        """
+        shared = _SharedSubtrees()
+        for node in nodes:
+            shared.visit(node)
+        repeated = shared.repeated()
+        if not repeated:
+            return
+
+        # Identifiers in order of first occurrence, before any <use> is written
+        for def_index, (node, occurrences) in enumerate(repeated):
+            use_id = f"d{def_index}"
+            self._use_ids[id(node)] = use_id
+            for occurrence in occurrences:
+                self._use_ids[id(occurrence)] = use_id
+
+        prefix = self._prefix(level)
+        self._stream.write(f"{prefix}<defs>{self._newline}")
+        for node, _ in repeated:
+            self._write_definition(node, level + 1)
+        self._stream.write(f"{prefix}</defs>{self._newline}")
+
+    def write_node(self, node: Union[SvgElement, SvgGroup], level: int = 1) -> None:
+        """
+        Writes an element or, recursively, a group and its children.
+
+        :param node: The element or group to write.
+        :param level: The nesting level of the node in the document.
+        """
+        if self._use_ids:
+            use_id = self._use_ids.get(id(node))
+            if use_id is not None:
+                self._write_use(node, use_id, level)
+                return
+        if isinstance(node, SvgGroup):
+            self._write_group(node, level)
+        elif self._element_filter is None or self._element_filter(node):
+            self._write_element(node, level)
+
+    def write_xml_element(self, element: Element, level: int = 0) -> None:
+        """
+        Writes an ElementTree element and its children. The text of <style>
+        elements is written verbatim so that CDATA sections are preserved.
+        """
+        prefix = self._prefix(level)
+        attributes = self._format_attributes(element.attrib)
+        children = list(element)
+        if children:
+            self._stream.write(f"{prefix}<{element.tag}{attributes}>{self._newline}")
+            for child in children:
+                self.write_xml_element(child, level + 1)
+            self._stream.write(f"{prefix}</{element.tag}>{self._newline}")
+        elif element.text is not None:
+            text = element.text if element.tag == "style" else escape_text(element.text)
+            self._stream.write(
+                f"{prefix}<{element.tag}{attributes}>{text}"
+                f"</{element.tag}>{self._newline}"
+            )
+        else:
+            self._stream.write(f"{prefix}<{element.tag}{attributes}/>{self._newline}")
+
+    def _write_definition(self, node: Union[SvgElement, SvgGroup], level: int) -> None:
+        """
+        Writes a repeated node with its <defs> identifier. A group is written
+        without its translation, applied by its <use> references.
+        """
+        prefix = self._prefix(level)
+        id_attribute = f' id="{self._use_ids[id(node)]}"'
+        if isinstance(node, SvgElement):
+            tag = node.tag
+            attributes = id_attribute + self._format_element_attributes(node)
+            if node.text is None:
+                self._stream.write(f"{prefix}<{tag}{attributes}/>{self._newline}")
+            else:
+                self._stream.write(
+                    f"{prefix}<{tag}{attributes}>{escape_text(node.text)}"
+                    f"</{tag}>{self._newline}"
+                )
+            return
+
+        self._stream.write(f"{prefix}<g{id_attribute}>{self._newline}")
+        for child in node.elements:
+            self.write_node(child, level + 1)
+        self._stream.write(f"{prefix}</g>{self._newline}")
+
+    def _write_use(
+        self, node: Union[SvgElement, SvgGroup], use_id: str, level: int
+    ) -> None:
+        attributes = self._group_attributes(node) if isinstance(node, SvgGroup) else {}
+        self._stream.write(
+            f'{self._prefix(level)}<use href="#{use_id}" xlink:href="#{use_id}"'
+            f"{self._format_attributes(attributes)}/>{self._newline}"
+        )
+
+    def _write_group(self, group: SvgGroup, level: int) -> None:
+        if self._reuse_fragments and level == 1:
+            self._write_group_fragment(group, level)
+            return
+
+        if not group.elements and self._minify:
+            return
+        group_attributes = self._group_attributes(group)
+        if self._minify and not group_attributes:
+            # A group without attributes does not change its children
+            for child in group.elements:
+                self.write_node(child, level)
+            return
+        prefix = self._prefix(level)
+        attributes = self._format_attributes(group_attributes)
+        if not group.elements:
+            self._stream.write(f"{prefix}<g{attributes}/>{self._newline}")
+            return
+
+        self._stream.write(f"{prefix}<g{attributes}>{self._newline}")
+        for child in group.elements:
+            self.write_node(child, level + 1)
+        self._stream.write(f"{prefix}</g>{self._newline}")
+
+    def _write_group_fragment(self, group: SvgGroup, level: int) -> None:
+        """
+        Writes the cached text of a group, serializing the group only if it
+        changed since it was last written with the same indentation.
+        """
+        fragment = group._fragment
+        if fragment is None or fragment[0] != self._indent:
+            stream = self._stream
+            self._stream = StringIO()
+            self._reuse_fragments = False
+            try:
+                self._write_group(group, level)
+                fragment = (self._indent, self._stream.getvalue())
+            finally:
+                self._stream = stream
+                self._reuse_fragments = True
+            group._fragment = fragment
+        self._stream.write(fragment[1])
+
+    def _write_element(self, element: SvgElement, level: int) -> None:
+        prefix = self._prefix(level)
+        tag = element.tag
+        attributes = self._format_element_attributes(element)
+        if element.text is None:
+            self._stream.write(f"{prefix}<{tag}{attributes}/>{self._newline}")
+        else:
+            self._stream.write(
+                f"{prefix}<{tag}{attributes}>{escape_text(element.text)}"
+                f"</{tag}>{self._newline}"
+            )
+
+    def _prefix(self, level: int) -> str:
+        if self._indent is None:
+            return ""
+        return self._indent * level
+
+    def _format_element_attributes(self, element: SvgElement) -> str:
+        """
+        Formats the attributes of an element directly from its stored values,
+        numbers being written with `str` and needing no escaping.
+        """
+        if not self._verbatim:
+            return self._format_rounded_attributes(element)
+        parts = [
+            (
+                f' {key}="{escape_attribute(value)}"'
+                if isinstance(value, str)
+                else f' {key}="{value}"'
+            )
+            for key, value in element._attr.items()
+        ]
+        if element._css_class:
+            parts.append(f' class="{escape_attribute(element._css_class)}"')
+        return "".join(parts)
+
+    def _format_rounded_attributes(self, element: SvgElement) -> str:
+        """
+        Formats the attributes of an element with rounded numbers and, when
+        minifying, without default values and with the short class name.
+        """
+        parts = []
+        for key, value in element._attr.items():
+            if self._minify and DEFAULT_ATTRIBUTES.get(key, _NO_DEFAULT) == value:
+                continue
+            parts.append(f' {key}="{self._format_value(key, value)}"')
+        css_class = element._css_class
+        if css_class:
+            css_class = self._class_names.get(css_class, css_class)
+            parts.append(f' class="{escape_attribute(css_class)}"')
+        return "".join(parts)
+
+    def _format_value(self, key: str, value: Union[str, float]) -> str:
+        precision = self._precision
+        if isinstance(value, str):
+            if precision is not None and key in _NUMBER_LIST_ATTRIBUTES:
+                value = _DECIMAL_NUMBER.sub(
+                    lambda match: format_number(float(match.group()), precision),
+                    value,
+                )
+            return escape_attribute(value)
+        if precision is not None and isinstance(value, float):
+            return format_number(value, precision)
+        if self._minify and isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        return str(value)
+
+    def _group_attributes(self, group: SvgGroup) -> Mapping[str, str]:
+        """
+        Returns the attributes of a group, with its translation rounded.
+        """
+        if self._verbatim or group._translation is None:
+            return group.attributes
+        x, y = group._translation
+        if self._minify and x == 0 and y == 0:
+            return {}
+        x_text, y_text = self._format_value("x", x), self._format_value("y", y)
+        if self._minify and y == 0:
+            return {"transform": f"translate({x_text})"}
+        return {"transform": f"translate({x_text},{y_text})"}
+
+    @staticmethod
+    def _format_attributes(attributes: Mapping[str, str]) -> str:
+        return "".join(
+            f' {key}="{escape_attribute(value)}"' for key, value in attributes.items()
+        )
+
+
+class _SharedSubtrees:
+    """
+    Finds the repeated subtrees of node trees. Identical subtrees have the same
+    shape number: elements with the same tag, attributes, class and text, and
+    groups with the same children at the same translations. The translation of a
+    group itself is not part of its shape.
+
+    The subtrees of a repeated subtree are only visited at its first occurrence,
+    so that shapes only repeated inside it are not counted as repeated.
+    """
+
+    def __init__(self):
+        self._shapes: Dict[tuple, int] = {}
+        # The shape of the nodes whose shape was computed, by node id
+        self._node_shapes: Dict[int, int] = {}
+        self._first_nodes: Dict[int, Union[SvgElement, SvgGroup]] = {}
+        self._occurrences: Dict[int, List[Union[SvgElement, SvgGroup]]] = {}
+
+    def visit(self, node: Union[SvgElement, SvgGroup]) -> None:
+        """
+        Records an occurrence of the shape of a node and, at the first
+        occurrence, visits its children.
+        """
+        shape = self._shape(node)
+        if shape in self._first_nodes:
+            self._occurrences[shape].append(node)
+            return
+        self._first_nodes[shape] = node
+        self._occurrences[shape] = []
+        if isinstance(node, SvgGroup):
+            for child in node.elements:
+                self.visit(child)
+
+    def repeated(
+        self,
+    ) -> List[Tuple[Union[SvgElement, SvgGroup], List[Union[SvgElement, SvgGroup]]]]:
+        """
+        Returns the first occurrence and the later occurrences of the repeated
+        shapes, in visiting order. Empty groups are not shared.
+        """
+        return [
+            (node, self._occurrences[shape])
+            for shape, node in self._first_nodes.items()
+            if self._occurrences[shape]
+            and not (isinstance(node, SvgGroup) and not node.elements)
+        ]
+
+    def _shape(self, node: Union[SvgElement, SvgGroup]) -> int:
+        """
+        Returns the shape number of a node, numbering the shapes of its subtrees
+        so that a group is identified by a tuple of small integers.
+        """
+        shape = self._node_shapes.get(id(node))
+        if shape is not None:
+            return shape
+        if isinstance(node, SvgGroup):
+            key: tuple = (
+                None,
+                *(
+                    (
+                        child._translation if isinstance(child, SvgGroup) else None,
+                        self._shape(child),
+                    )
+                    for child in node.elements
+                ),
+            )
+        else:
+            key = (node._tag, node._css_class, node._text, *node._attr.items())
+        shape = self._shapes.get(key)
+        if shape is None:
+            shape = self._shapes[key] = len(self._shapes)
+        self._node_shapes[id(node)] = shape
+        return shape
@@ -0,0 +1,130 @@
+import threading
+from typing import Dict, Hashable, NamedTuple, Optional, Sequence, Tuple
+
+from ..config import constants
+from .font_metrics import get_font_registry
+
+
+class TaskLayout(NamedTuple):
+    """
+    Result of fitting the texts of a task in its box: the displayed texts, their
+    font sizes and the box width.
+
+    :param title_text: The displayed, possibly truncated, title.
+    :param title_font_size: The font size of the title.
+    :param input_texts: The displayed input names.
+    :param output_texts: The displayed output names.
+    :param input_font_size: The font size of the input names.
+    :param output_font_size: The font size of the output names.
+    :param box_width: The width of the task box.
+    :param title_overflows: True if the full title did not fit in the box.
+    :param io_overflows: True if the full IO names did not fit in the box.
+    """
+
+    title_text: str
+    title_font_size: float
+    input_texts: Tuple[str, ...]
+    output_texts: Tuple[str, ...]
+    input_font_size: float
+    output_font_size: float
+    box_width: float
+    title_overflows: bool
+    io_overflows: bool
+
+
+class TaskLayoutCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    size: int
+    max_size: int
+
+
+_LAYOUT_CONSTANTS: Tuple[Tuple[str, object], ...] = ()
+
+
+def layout_constants() -> Tuple[Tuple[str, object], ...]:
+    """
+    Returns the layout constants of `config.constants`, part of the layout keys.
+    The same tuple is returned while the constants do not change, so that the
+    keys of the cache do not each hold a copy.
+    """
+    global _LAYOUT_CONSTANTS
+    values = tuple(
+        (name, value) for name, value in vars(constants).items() if name.isupper()
+    )
+    if values != _LAYOUT_CONSTANTS:
+        _LAYOUT_CONSTANTS = values
+    return _LAYOUT_CONSTANTS
+
+
+class TaskLayoutCache:
+    """
+    Keeps the task layouts by task signature, so that tasks with the same title,
+    inputs and outputs are fitted once. Tasks of workflows built from the same
+    task classes share their layouts and their displayed strings.
+
+    When the cache is full, the oldest layouts are dropped. The cache can be
+    shared by the threads drawing workflows concurrently.
+
+    :param max_size: The maximum number of layouts kept, 0 to disable the cache.
+    """
+
+    def __init__(self, max_size: int = 4096):
+        self._max_size = max_size
+        self._layouts: Dict[Hashable, TaskLayout] = {}
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(
+        title: str, input_names: Sequence[str], output_names: Sequence[str]
+    ) -> Hashable:
+        """
+        Returns the cache key of a task signature.
+        """
+        return (
+            title,
+            tuple(input_names),
+            tuple(output_names),
+            layout_constants(),
+            get_font_registry().version,
+        )
+
+    def get(self, key: Hashable) -> Optional[TaskLayout]:
+        with self._lock:
+            layout = self._layouts.get(key)
+            if layout is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return layout
+
+    def put(self, key: Hashable, layout: TaskLayout) -> None:
+        if self._max_size <= 0:
+            return
+        with self._lock:
+            if len(self._layouts) >= self._max_size and key not in self._layouts:
+                del self._layouts[next(iter(self._layouts))]
+            self._layouts[key] = layout
+
+    def clear(self) -> None:
+        with self._lock:
+            self._layouts.clear()
+            self._hits = self._misses = 0
+
+    def cache_info(self) -> TaskLayoutCacheInfo:
+        with self._lock:
+            return TaskLayoutCacheInfo(
+                self._hits, self._misses, len(self._layouts), self._max_size
+            )
+
+
+_TASK_LAYOUT_CACHE = TaskLayoutCache()
+
+
+def get_task_layout_cache() -> TaskLayoutCache:
+    """
+    Returns the process-wide task layout cache.
+    """
+    return _TASK_LAYOUT_CACHE
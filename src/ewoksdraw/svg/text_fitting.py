@@ -0,0 +1,132 @@
+import math
+from typing import Callable, List, Sequence
+
+ELLIPSIS = "…"
+
+
+def max_font_decrements(
+    font_size: float, min_font_size: float, *, inclusive: bool = False
+) -> int:
+    """
+    Returns how many times a font size can be decreased by 1 before reaching the
+    minimum font size.
+
+    :param font_size: The starting font size.
+    :param min_font_size: The minimum font size.
+    :param inclusive: If True, a font size equal to the minimum can still be
+                      decreased once.
+    """
+    steps = 0
+    while font_size > min_font_size or (inclusive and font_size == min_font_size):
+        font_size -= 1
+        steps += 1
+    return steps
+
+
+def fit_font_size(
+    width_at: Callable[[float], float],
+    font_size: float,
+    target_width: float,
+    max_steps: int,
+) -> float:
+    """
+    Computes the largest font size, decreasing by steps of 1 from `font_size`, for
+    which the width fits within the target width.
+
+    The width is linear in the font size, so the number of steps is computed
+    directly from the width at the current font size and at font size 0, and then
+    checked against `width_at`. The result is the same as decreasing the font size
+    one step at a time.
+
+    :param width_at: Returns the width for a given font size.
+    :param font_size: The current font size.
+    :param target_width: The maximum allowed width.
+    :param max_steps: The maximum number of decrements allowed.
+    :return: The new font size, or the current one if it already fits.
+    """
+    width = width_at(font_size)
+    if width <= target_width or max_steps <= 0:
+        return font_size
+
+    slope = (width - width_at(0.0)) / font_size if font_size else 0.0
+    if slope > 0:
+        steps = math.ceil((width - target_width) / slope)
+    else:
+        steps = max_steps
+    steps = min(max(steps, 1), max_steps)
+
+    while steps > 1 and width_at(_decrease(font_size, steps - 1)) <= target_width:
+        steps -= 1
+    while steps < max_steps and width_at(_decrease(font_size, steps)) > target_width:
+        steps += 1
+    return _decrease(font_size, steps)
+
+
+def truncation_ends(text: str) -> List[int]:
+    """
+    Returns the lengths of the prefixes kept by successive one character
+    truncations of a text (see `SvgText.truncate_text_by_one`), until the text
+    is empty.
+
+    :param text: The text to truncate.
+    """
+    ends = []
+    end = len(text)
+    while end > 0:
+        while end > 0 and text[end - 1] == ELLIPSIS:
+            end -= 1
+        while end > 0 and text[end - 1].isspace():
+            end -= 1
+        end = max(end - 1, 0)
+        while end > 0 and text[end - 1].isspace():
+            end -= 1
+        ends.append(end)
+    return ends
+
+
+def fit_truncated_text(
+    text: str,
+    prefix_units: Sequence[float],
+    ellipsis_units: float,
+    width_of_units: Callable[[float], float],
+    target_width: float,
+) -> str:
+    """
+    Finds the shortest one character truncation sequence that makes a text fit
+    within the target width.
+
+    The truncated texts are prefixes followed by an ellipsis, so their widths
+    decrease with the number of truncations. The truncation point is found by
+    binary search over the cumulative prefix widths.
+
+    :param text: The text to truncate.
+    :param prefix_units: The cumulative widths of the prefixes of the text,
+                         in font units.
+    :param ellipsis_units: The width of the ellipsis, in font units.
+    :param width_of_units: Converts a width in font units to the displayed width.
+    :param target_width: The maximum allowed width.
+    :return: The text, truncated if needed. Texts that cannot fit are reduced to the
+             ellipsis.
+    """
+    if width_of_units(prefix_units[len(text)]) <= target_width:
+        return text
+
+    ends = truncation_ends(text)
+    if not ends:
+        return ELLIPSIS
+
+    low, high = 0, len(ends) - 1
+    while low < high:
+        middle = (low + high) // 2
+        units = prefix_units[ends[middle]] + ellipsis_units
+        if width_of_units(units) <= target_width:
+            high = middle
+        else:
+            low = middle + 1
+    return text[: ends[low]] + ELLIPSIS
+
+
+def _decrease(font_size: float, steps: int) -> float:
+    for _ in range(steps):
+        font_size -= 1
+    return font_size
@@ -0,0 +1,100 @@
+from functools import lru_cache
+from itertools import accumulate
+from typing import List, Optional
+
+from ..profiling import count
+from .font_metrics import FontMetrics, FontRegistry, get_font_registry
+
+
+class TextMetrics:
+    """
+    Measures text widths with cached font metrics.
+
+    The advance widths come from the font metrics tables of a font registry,
+    loaded once per font. Widths are computed in font units (1/1000 em). The font
+    units of a whole text are cached by (font, text), so the width at any font
+    size is a single scaling of the cached measurement. The cache can be shared
+    by the threads drawing workflows concurrently.
+
+    :param cache_size: The maximum number of (font, text) measurements kept.
+    :param fonts: The fonts measuring the texts, the process-wide registry by
+                  default.
+    """
+
+    def __init__(self, cache_size: int = 65536, fonts: Optional[FontRegistry] = None):
+        self._fonts = fonts if fonts is not None else get_font_registry()
+        self._text_units = lru_cache(maxsize=cache_size)(self._compute_text_units)
+
+    def text_width(self, text: str, font_name: str, font_size: float) -> float:
+        """
+        Returns the width of a text.
+
+        :param text: The text to measure.
+        :param font_name: The name of the font used to render the text.
+        :param font_size: The font size used to render the text.
+        """
+        count("text_metrics.measure")
+        return self.units_to_width(
+            self._text_units(self.font(font_name), text), font_size
+        )
+
+    @staticmethod
+    def units_to_width(units: float, font_size: float) -> float:
+        """
+        Converts a width in font units to the width at a given font size.
+        """
+        return units * 0.001 * font_size
+
+    def font(self, font_name: str) -> FontMetrics:
+        """
+        Returns the metrics of a font, or of the default font when it is unknown.
+        """
+        return self._fonts.resolve((font_name,))
+
+    def text_units(self, text: str, font_name: str) -> float:
+        """
+        Returns the width of a text in font units (1/1000 em).
+        """
+        count("text_metrics.measure")
+        return self._text_units(self.font(font_name), text)
+
+    def prefix_units(self, text: str, font_name: str) -> List[float]:
+        """
+        Returns the cumulative widths in font units of all prefixes of a text,
+        from the empty prefix to the whole text.
+        """
+        count("text_metrics.prefix_measure")
+        return list(accumulate(self.font(font_name).advance_widths(text), initial=0))
+
+    def advance_width(self, char: str, font_name: str) -> float:
+        """
+        Returns the advance width of a single character in font units.
+        """
+        return self.font(font_name).advance_width(char)
+
+    def clear(self) -> None:
+        """
+        Drops all cached measurements.
+        """
+        self._text_units.cache_clear()
+
+    def cache_info(self):
+        """
+        Returns the statistics of the (font, text) measurement cache.
+        """
+        return self._text_units.cache_info()
+
+    @staticmethod
+    def _compute_text_units(font: FontMetrics, text: str) -> float:
+        count("text_metrics.measure_miss")
+        return font.text_units(text)
+
+
+_TEXT_METRICS = TextMetrics()
+
+
+def get_text_metrics() -> TextMetrics:
+    """
+    Returns the process-wide text metrics service.
+    """
+    return _TEXT_METRICS
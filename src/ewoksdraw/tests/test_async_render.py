@@ -0,0 +1,130 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from ewoksdraw import render
+from ewoksdraw.async_render import AsyncRenderer, stream_svg
+from ewoksdraw.svg.task_layout_cache import get_task_layout_cache
+from ewoksdraw.svg.text_metrics import get_text_metrics
+
+WORKFLOW = {
+    "graph": {"id": "async"},
+    "nodes": [{"id": f"task{i}"} for i in range(20)],
+    "links": [{"source": f"task{i}", "target": f"task{i + 1}"} for i in range(19)],
+}
+
+
+def test_stream_svg():
+    async def draw():
+        canvas = await AsyncRenderer().render_workflow(WORKFLOW)
+        chunks = [chunk async for chunk in stream_svg(WORKFLOW, chunk_size=1000)]
+        return canvas, chunks
+
+    canvas, chunks = asyncio.run(draw())
+    assert len(chunks) > 1
+    assert "".join(chunks) == canvas._get_svg_string()
+
+
+def test_concurrent_renders_share_caches():
+    # Tasks with their own signatures fill the caches from all the threads
+    workflows = [
+        {
+            "graph": {"id": f"shared{i}"},
+            "nodes": [{"id": f"task{i}_{j}"} for j in range(30)],
+            "links": [],
+        }
+        for i in range(8)
+    ]
+    expected = [render.render_workflow(w)._get_svg_string() for w in workflows]
+    get_task_layout_cache().clear()
+    get_text_metrics().clear()
+
+    async def draw():
+        renderer = AsyncRenderer(max_concurrency=4)
+        canvases = await asyncio.gather(*map(renderer.render_workflow, workflows))
+        return [canvas._get_svg_string() for canvas in canvases]
+
+    assert asyncio.run(draw()) == expected
+    info = get_task_layout_cache().cache_info()
+    assert info.misses == info.size == 8 * 30
+
+
+def test_concurrency_limit(monkeypatch):
+    running = []
+    max_running = 0
+    render_workflow = render.render_workflow
+
+    def slow_render_workflow(workflow, **options):
+        nonlocal max_running
+        running.append(workflow)
+        max_running = max(max_running, len(running))
+        time.sleep(0.05)
+        running.remove(workflow)
+        return render_workflow(workflow, **options)
+
+    monkeypatch.setattr(render, "render_workflow", slow_render_workflow)
+    renderer = AsyncRenderer(max_concurrency=2)
+
+    async def draw_all():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        canvases = await asyncio.gather(
+            *(renderer.render_workflow(dict(WORKFLOW)) for _ in range(6))
+        )
+        ticker.cancel()
+        return canvases, ticks
+
+    canvases, ticks = asyncio.run(draw_all())
+    assert len(canvases) == 6
+    assert max_running == 2
+    # The event loop was not blocked while drawing
+    assert ticks > 10
+
+
+def test_cancellation(monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def blocked_render_workflow(workflow, **options):
+        calls.append(workflow)
+        started.set()
+        release.wait(5)
+        return None
+
+    monkeypatch.setattr(render, "render_workflow", blocked_render_workflow)
+    renderer = AsyncRenderer(max_concurrency=1)
+
+    async def cancel():
+        running = asyncio.create_task(renderer.render_workflow("running"))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait)
+        waiting = asyncio.create_task(renderer.render_workflow("waiting"))
+        await asyncio.sleep(0.01)
+        waiting.cancel()
+        running.cancel()
+        for task in (running, waiting):
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        # The cancelled render keeps its slot until it ends
+        after = asyncio.create_task(renderer.render_workflow("after"))
+        await asyncio.sleep(0.01)
+        assert calls == ["running"]
+        release.set()
+        await after
+
+    asyncio.run(cancel())
+    assert calls == ["running", "after"]
+
+
+def test_max_concurrency():
+    with pytest.raises(ValueError):
+        AsyncRenderer(max_concurrency=0)
@@ -0,0 +1,72 @@
+import json
+import subprocess
+from pathlib import Path
+
+from ewoksdraw.batch import find_workflow_files, output_filenames, render_batch
+
+
+def _write_workflows(directory):
+    (directory / "sub").mkdir()
+    for filename in ("a.json", "sub/b.json"):
+        graph = {
+            "graph": {"id": filename},
+            "nodes": [{"id": "task1"}, {"id": "task2"}],
+            "links": [{"source": "task1", "target": "task2"}],
+        }
+        (directory / filename).write_text(json.dumps(graph))
+    (directory / "sub" / "broken.json").write_text("{")
+    (directory / "notes.txt").write_text("not a workflow")
+
+
+def test_find_workflow_files(tmp_path):
+    _write_workflows(tmp_path)
+
+    assert find_workflow_files(tmp_path) == [
+        tmp_path / "a.json",
+        tmp_path / "sub" / "b.json",
+        tmp_path / "sub" / "broken.json",
+    ]
+    assert find_workflow_files(str(tmp_path / "**" / "b*.json")) == [
+        tmp_path / "sub" / "b.json",
+        tmp_path / "sub" / "broken.json",
+    ]
+    assert output_filenames([tmp_path / "sub" / "b.json"], "out") == [
+        Path("out", "b.svg")
+    ]
+    # Workflows differing by their suffix keep it
+    sources = [tmp_path / "a.json", tmp_path / "a.yaml", tmp_path / "sub" / "a.json"]
+    assert output_filenames(sources, "out", "pdf") == [
+        Path("out", "a.json.pdf"),
+        Path("out", "a.yaml.pdf"),
+        Path("out", "sub", "a.pdf"),
+    ]
+
+
+def test_render_batch(tmp_path):
+    _write_workflows(tmp_path)
+    output_dir = tmp_path / "out"
+
+    results = list(render_batch(find_workflow_files(tmp_path), output_dir, jobs=2))
+
+    assert len(results) == 3
+    failed = [result for result in results if not result.ok]
+    assert [result.source.name for result in failed] == ["broken.json"]
+    assert (output_dir / "a.svg").is_file()
+    assert (output_dir / "sub" / "b.svg").is_file()
+    assert not (output_dir / "sub" / "broken.svg").exists()
+
+
+def test_cli_batch(tmp_path):
+    _write_workflows(tmp_path)
+    output_dir = tmp_path / "out"
+
+    process = subprocess.run(
+        ("ewoksdraw", str(output_dir), "--batch", str(tmp_path), "--jobs", "1"),
+        capture_output=True,
+        text=True,
+    )
+
+    assert process.returncode == 1
+    assert "broken.json FAILED" in process.stderr
+    assert "2 drawn, 1 failed" in process.stdout
+    assert (output_dir / "sub" / "b.svg").is_file()
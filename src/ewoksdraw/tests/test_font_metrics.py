@@ -0,0 +1,96 @@
+import json
+import os
+
+import pytest
+import reportlab
+from reportlab.pdfbase.pdfmetrics import getFont, registerFont, stringWidth
+from reportlab.pdfbase.ttfonts import TTFont
+
+from ewoksdraw.svg.font_metrics import (
+    BUNDLED_FONTS,
+    FontRegistry,
+    load_afm_metrics,
+    load_font_metrics,
+    load_ttf_metrics,
+)
+from ewoksdraw.svg.text_metrics import TextMetrics
+
+REPORTLAB_FONTS = os.path.join(os.path.dirname(reportlab.__file__), "fonts")
+
+
+@pytest.mark.parametrize("font_name", sorted(BUNDLED_FONTS))
+def test_bundled_fonts_match_reportlab(font_name):
+    metrics = FontRegistry().get(font_name)
+    face = getFont(font_name).face
+
+    assert metrics.name == font_name
+    assert (metrics.ascent, metrics.descent) == (face.ascent, face.descent)
+    text = "The quick brown fox, naïve café, Åsa's smørbrød: 100 € « » — …"
+    assert metrics.text_units(text) == pytest.approx(stringWidth(text, font_name, 1000))
+
+
+def test_resolve_font_families():
+    fonts = FontRegistry()
+
+    assert fonts.resolve(("Helvetica", "sans-serif")).name == "Helvetica"
+    assert fonts.resolve(("Unknown", "Arial")).name == "Helvetica"
+    assert fonts.resolve(("monospace",)).name == "Courier"
+    assert fonts.resolve(()).name == "Helvetica"
+    with pytest.warns(UserWarning, match="Unknown"):
+        assert fonts.resolve(("Unknown",)).name == "Helvetica"
+
+
+def test_missing_characters_have_default_width():
+    metrics = FontRegistry().get("Helvetica")
+
+    assert "中" not in metrics
+    assert metrics.text_units("a中") == metrics.advance_width("a") + 556
+    assert list(metrics.advance_widths("a中")) == [556, 556]
+
+
+def test_load_ttf_metrics():
+    path = os.path.join(REPORTLAB_FONTS, "Vera.ttf")
+    metrics = load_ttf_metrics(path)
+    registerFont(TTFont("Vera", path))
+
+    assert metrics.name == "Bitstream Vera Sans"
+    text = "Hello, World! ©"
+    assert metrics.text_units(text) == pytest.approx(stringWidth(text, "Vera", 1000))
+
+
+def test_load_afm_metrics():
+    metrics = load_afm_metrics(os.path.join(REPORTLAB_FONTS, "DarkGardenMK.afm"))
+
+    assert metrics.name == "DarkGardenMK"
+    assert metrics.advance_width("A") > 0
+    assert metrics.ascent > 0 > metrics.descent
+
+    # Glyph names of accents with several words, like RING ABOVE
+    metrics = load_afm_metrics(os.path.join(REPORTLAB_FONTS, "callig15.afm"))
+    assert (metrics.advance_width("å"), metrics.advance_width("Å")) == (296, 792)
+    assert metrics.advance_width("Ø") == 608
+
+
+def test_register_font_file(tmp_path):
+    path = tmp_path / "narrow.json"
+    widths = [[32, [100] * 95]]
+    data = {"name": "Narrow", "ascent": 700, "descent": -200, "default_width": 100}
+    path.write_text(json.dumps({**data, "widths": widths}))
+    fonts = FontRegistry()
+    fonts.register_file(path, name="Narrow Sans", aliases=["narrow"])
+
+    metrics = TextMetrics(fonts=fonts)
+    assert metrics.text_width("abcd", "Narrow Sans", 10) == 4
+    assert metrics.text_width("abcd", "narrow", 10) == 4
+    assert fonts.resolve(("Narrow",)).name == "Narrow Sans"
+
+    # The same fonts give the same digest in any registry
+    assert FontRegistry().digest == ""
+    other = FontRegistry()
+    other.register_file(path, name="Narrow Sans", aliases=["narrow"])
+    assert other.digest == fonts.digest != ""
+    other.register_file(path)
+    assert other.digest != fonts.digest
+
+    with pytest.raises(ValueError):
+        load_font_metrics(tmp_path / "narrow.woff")
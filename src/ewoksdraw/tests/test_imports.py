@@ -0,0 +1,44 @@
+import subprocess
+import sys
+from typing import Dict
+
+import pytest
+
+# Imported on use only: Faker for the demo mode, reportlab when measuring texts
+# or exporting PDF, Pillow when exporting PNG, the process pool for batches
+HEAVY_MODULES = ("faker", "reportlab", "PIL", "concurrent.futures.process")
+
+
+def _import_times(module: str) -> Dict[str, int]:
+    """
+    Returns the cumulative import time, in microseconds, of every module loaded
+    when importing the given module in a new interpreter.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("module", ["ewoksdraw.main", "ewoksdraw.svg"])
+def test_no_heavy_import_at_startup(module):
+    times = _import_times(module)
+    assert module in times
+    for heavy_module in HEAVY_MODULES:
+        assert heavy_module not in times, f"{module} imports {heavy_module}"
+
+
+def test_cli_import_time():
+    times = _import_times("ewoksdraw.main")
+    # About 0.1 s here; the bound only catches a heavy dependency coming back
+    assert times["ewoksdraw.main"] < 1_000_000
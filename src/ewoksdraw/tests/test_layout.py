@@ -0,0 +1,50 @@
+from ewoksdraw.layout import LayeredLayout, _spaced_isotonic_fit
+from ewoksdraw.svg import SvgTask
+
+
+def _position(task: SvgTask):
+    return task.translation
+
+
+def _create_tasks(*node_ids):
+    return {node_id: SvgTask(node_id, ["in"], ["out"]) for node_id in node_ids}
+
+
+def test_layered_layout():
+    tasks = _create_tasks("a", "b", "c", "d")
+    edges = [("a", "b"), ("b", "c"), ("a", "c"), ("a", "d")]
+    width, height = LayeredLayout().apply(tasks, edges)
+
+    positions = {node_id: _position(task) for node_id, task in tasks.items()}
+    for source, target in edges:
+        assert positions[source][0] + tasks[source].width < positions[target][0]
+    for node_id, (x, y) in positions.items():
+        assert x + tasks[node_id].width <= width
+        assert y + tasks[node_id].height <= height
+
+    # b and d share a layer and must not overlap
+    assert positions["b"][0] == positions["d"][0]
+    top, bottom = sorted([positions["b"][1], positions["d"][1]])
+    assert bottom - top >= tasks["b"].height
+
+
+def test_layered_layout_cycle():
+    tasks = _create_tasks("a", "b", "c")
+    edges = [("a", "b"), ("b", "c"), ("c", "a")]
+    LayeredLayout().apply(tasks, edges)
+
+    assert len({_position(task)[0] for task in tasks.values()}) == 3
+
+
+def test_layered_layout_removes_crossings():
+    tasks = _create_tasks("a", "b", "c", "d")
+    edges = [("a", "d"), ("b", "c")]
+    layout = LayeredLayout()
+    layout.apply(tasks, edges)
+
+    assert layout.crossings == 0
+
+
+def test_spaced_isotonic_fit():
+    assert _spaced_isotonic_fit([0, 0, 0], [10, 10, 10]) == [-10, 0, 10]
+    assert _spaced_isotonic_fit([0, 50], [10, 10]) == [0, 50]
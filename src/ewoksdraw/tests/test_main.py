@@ -1,9 +1,24 @@
+import json
 import subprocess
 from pathlib import Path
 
+from ewoksdraw.main import main, parse_args
+
 
 def test_basic_use(tmp_path):
     output_path = Path(tmp_path) / "test.svg"
     subprocess.run(("ewoksdraw", f"{output_path}"))
 
     assert output_path.is_file()
+
+
+def test_output_named_serve(tmp_path, monkeypatch):
+    workflow_file = tmp_path / "workflow.json"
+    workflow = {"graph": {"id": "serve"}, "nodes": [{"id": "task1"}], "links": []}
+    workflow_file.write_text(json.dumps(workflow))
+    monkeypatch.chdir(tmp_path)
+
+    # Only a first argument "serve" exactly runs the render server
+    assert main(["./serve", "--workflow", str(workflow_file)]) == 0
+    assert (tmp_path / "serve").read_text().startswith("<?xml")
+    assert parse_args(["--", "serve"]).output == "serve"
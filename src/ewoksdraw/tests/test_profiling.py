@@ -0,0 +1,58 @@
+from ewoksdraw.main import main
+from ewoksdraw.profiling import count, get_profiler, profile, timer
+from ewoksdraw.render import render_workflow
+from ewoksdraw.svg.task_layout_cache import get_task_layout_cache
+
+WORKFLOW = {
+    "graph": {"id": "profiled"},
+    "nodes": [
+        {"id": "task1", "default_inputs": [{"name": "a", "value": 1}]},
+        {"id": "task2"},
+    ],
+    "links": [
+        {
+            "source": "task1",
+            "target": "task2",
+            "data_mapping": [{"source_output": "result", "target_input": "b"}],
+        }
+    ],
+}
+
+
+def test_profile():
+    get_task_layout_cache().clear()
+    with profile() as profiler:
+        render_workflow(WORKFLOW).xml
+    assert get_profiler() is None
+
+    timers = profiler.timers
+    assert list(timers)[:3] == ["render.load", "render.tasks", "task.fit_texts"]
+    assert timers["task.fit_texts"].calls == 2
+    assert timers["render.tasks"].total >= timers["task.fit_texts"].total
+    assert timers["serialize.xml"].calls == 1
+    counters = profiler.counters
+    assert counters["tasks"] == 2
+    assert counters["text_metrics.measure"] > 0
+
+    report = profiler.report()
+    assert "task.fit_texts" in report
+    assert "text_metrics.measure" in report
+
+
+def test_profiling_off():
+    assert get_profiler() is None
+    with timer("phase"):
+        count("event")
+
+    with profile() as profiler:
+        with timer("phase"):
+            count("event", 2)
+        with timer("phase"):
+            pass
+    assert profiler.timers["phase"].calls == 2
+    assert profiler.counters == {"event": 2}
+
+
+def test_main_profile(tmp_path, capsys):
+    assert main([str(tmp_path / "mock.svg"), "--profile"]) == 0
+    assert "Profile:" in capsys.readouterr().err
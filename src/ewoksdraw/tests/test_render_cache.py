@@ -0,0 +1,92 @@
+import json
+import os
+import subprocess
+
+from ewoksdraw.render import render_workflow
+from ewoksdraw.render_cache import RenderCache
+from ewoksdraw.svg import font_metrics
+from ewoksdraw.svg.font_metrics import FontRegistry
+
+WORKFLOW = {
+    "graph": {"id": "cached"},
+    "nodes": [{"id": "task1"}, {"id": "task2"}],
+    "links": [{"source": "task1", "target": "task2"}],
+}
+
+
+def test_render_cache_draw(tmp_path):
+    cache = RenderCache(tmp_path / "cache")
+    expected = tmp_path / "expected.svg"
+    render_workflow(WORKFLOW).draw(expected)
+
+    assert not cache.draw(WORKFLOW, tmp_path / "miss.svg")
+    assert cache.draw(WORKFLOW, tmp_path / "hit.svg")
+    assert (tmp_path / "miss.svg").read_bytes() == expected.read_bytes()
+    assert (tmp_path / "hit.svg").read_bytes() == expected.read_bytes()
+
+    # Another layout is another entry
+    assert not cache.draw(WORKFLOW, tmp_path / "grid.svg", layout="grid")
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 2, 2)
+
+    cache.clear()
+    assert cache.stats().entries == 0
+
+
+def test_render_cache_key(tmp_path):
+    cache = RenderCache(tmp_path)
+    workflow_file = tmp_path / "workflow.json"
+    workflow_file.write_text(json.dumps(WORKFLOW))
+    key = cache.key(workflow_file, layout="layered")
+
+    assert cache.key(workflow_file, layout="layered") == key
+    assert cache.key(workflow_file, layout="grid") != key
+
+    workflow_file.write_text(json.dumps({**WORKFLOW, "graph": {"id": "changed"}}))
+    assert cache.key(workflow_file, layout="layered") != key
+
+
+def test_render_cache_key_registered_fonts(tmp_path, monkeypatch):
+    fonts = FontRegistry()
+    monkeypatch.setattr(font_metrics, "_FONT_REGISTRY", fonts)
+    cache = RenderCache(tmp_path)
+    key = cache.key(WORKFLOW)
+
+    fonts.register(fonts.get("Helvetica").renamed("Other Sans"), ["sans-serif"])
+    assert cache.key(WORKFLOW) != key
+
+
+def test_render_cache_eviction(tmp_path):
+    cache = RenderCache(tmp_path, max_size=250)
+    for i in range(5):
+        key = f"{i:064x}"
+        cache.put(key, b"x" * 100)
+        # Entries are evicted by least recent use time
+        (entry,) = cache.directory.glob(f"*/{key}.bin")
+        os.utime(entry, (1000 + i, 1000 + i))
+
+    stats = cache.stats()
+    assert stats.entries == 2
+    assert stats.evictions == 3
+    assert cache.get(f"{4:064x}") is not None
+    assert cache.get(f"{0:064x}") is None
+
+
+def test_cli_render_cache(tmp_path):
+    workflow_file = tmp_path / "workflow.json"
+    workflow_file.write_text(json.dumps(WORKFLOW))
+    command = (
+        "ewoksdraw",
+        str(tmp_path / "workflow.svg"),
+        "--workflow",
+        str(workflow_file),
+        "--cache-dir",
+        str(tmp_path / "cache"),
+    )
+
+    subprocess.run(command, check=True, capture_output=True)
+    process = subprocess.run(command, check=True, capture_output=True, text=True)
+
+    assert "1 hits, 0 misses" in process.stdout
+    assert (tmp_path / "workflow.svg").is_file()
@@ -0,0 +1,95 @@
+import pytest
+
+from ewoksdraw.geometry import BoundingBox, SpatialIndex
+from ewoksdraw.render import render_workflow, task_bounding_box
+from ewoksdraw.routing import LinkRouter, path_data
+from ewoksdraw.svg import SvgTaskLink
+
+
+def _segments_box(points):
+    return [BoundingBox.from_points([p1, p2]) for p1, p2 in zip(points, points[1:])]
+
+
+def test_spatial_index_query():
+    boxes = [BoundingBox.from_size(i * 50, 0, 40, 40) for i in range(100)]
+    index = SpatialIndex.from_boxes(enumerate(boxes))
+
+    assert len(index) == 100
+    assert index.query(BoundingBox(45, 10, 105, 20)) == [1, 2]
+    # Touching boxes only match when not strict
+    assert index.query(BoundingBox(40, 0, 50, 40)) == []
+    assert index.query(BoundingBox(40, 0, 50, 40), strict=False) == [0, 1]
+
+    with pytest.raises(ValueError):
+        SpatialIndex(0)
+
+
+def test_route_straight():
+    router = LinkRouter([])
+    assert router.route((0, 10), (100, 10)) == [(0, 10), (100, 10)]
+    assert router.route((0, 10), (100, 50)) == [
+        (0, 10),
+        (50, 10),
+        (50, 50),
+        (100, 50),
+    ]
+
+
+@pytest.mark.parametrize(
+    "start,end",
+    [((0, 50), (300, 50)), ((0, 20), (300, 90)), ((300, 50), (0, 60))],
+    ids=["through", "diagonal", "backward"],
+)
+def test_route_avoids_boxes(start, end):
+    obstacles = [
+        BoundingBox.from_size(100, 0, 100, 120),
+        BoundingBox.from_size(120, 130, 40, 40),
+    ]
+    router = LinkRouter(obstacles)
+    points = router.route(start, end)
+
+    assert points[0] == start and points[-1] == end
+    assert router.is_free(points)
+    for segment in _segments_box(points):
+        assert segment.width == 0 or segment.height == 0
+        assert not any(segment.intersects(box) for box in obstacles)
+
+
+def test_path_data():
+    points = [(0, 0), (10.5, 0), (10.5, 20), (30, 20)]
+    assert path_data(points) == "M0,0 L10.5,0 L10.5,20 L30,20"
+    assert path_data(points, "spline") == "M0,0 C10.5,0 10.5,20 30,20"
+
+    link = SvgTaskLink(points)
+    assert link.tag == "path"
+    assert link.get_attr("d") == "M0,0 L10.5,0 L10.5,20 L30,20"
+    assert "fill: none" in link.style.css
+
+
+def test_render_workflow_links():
+    graph = {
+        "graph": {"id": "links"},
+        "nodes": [{"id": name} for name in "abc"],
+        "links": [
+            {
+                "source": "a",
+                "target": "b",
+                "data_mapping": [{"source_output": "x", "target_input": "y"}],
+            },
+            {"source": "a", "target": "c"},
+            {"source": "b", "target": "c"},
+        ],
+    }
+    canvas = render_workflow(graph)
+    links = [element for element in canvas.elements if isinstance(element, SvgTaskLink)]
+    assert len(links) == 3
+
+    tasks = canvas.elements[-3:]
+    task_a, task_b = tasks[0], tasks[1]
+    start, end = task_a.output_anchor_position("x"), task_b.input_anchor_position("y")
+    move_to_start = path_data([start, end]).split()[0]
+    assert links[0].get_attr("d").split()[0] == move_to_start
+    assert start[0] == task_bounding_box(task_a).x_max
+    assert end[0] == task_bounding_box(task_b).x_min
+
+    assert len(render_workflow(graph, links=None).elements) == 4
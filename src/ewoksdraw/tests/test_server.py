@@ -0,0 +1,153 @@
+import gzip
+import http.client
+import json
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from xml.etree import ElementTree
+
+import pytest
+
+from ewoksdraw.server import create_server, parse_render_options, render_document
+
+WORKFLOW = {
+    "graph": {"id": "served"},
+    "nodes": [{"id": "task1"}, {"id": "task2"}],
+    "links": [{"source": "task1", "target": "task2"}],
+}
+
+
+class _UnixConnection(http.client.HTTPConnection):
+    def __init__(self, path):
+        super().__init__("localhost")
+        self._path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self._path)
+
+
+@contextmanager
+def _running_server(**options):
+    server = create_server(port=0, jobs=1, quiet=True, **options)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def _connect(server):
+    if isinstance(server.server_address, str):
+        return _UnixConnection(server.server_address)
+    host, port = server.server_address[:2]
+    return http.client.HTTPConnection(host, port)
+
+
+def _request(connection, method, url, body=None):
+    connection.request(method, url, body=body)
+    response = connection.getresponse()
+    return response, response.read()
+
+
+def test_render_requests():
+    with _running_server() as server:
+        connection = _connect(server)
+        body = json.dumps(WORKFLOW)
+        # Requests share the connection
+        response, svg = _request(connection, "POST", "/render", body)
+        assert response.status == 200
+        assert response.getheader("Content-Type") == "image/svg+xml"
+        assert "render;dur=" in response.getheader("Server-Timing")
+        assert ElementTree.fromstring(svg).tag.endswith("svg")
+
+        response, svgz = _request(
+            connection, "POST", "/render?format=svgz&minify=1", body
+        )
+        assert response.getheader("Content-Encoding") == "gzip"
+        assert len(gzip.decompress(svgz)) < len(svg)
+
+        response, stats = _request(connection, "GET", "/stats")
+        stats = json.loads(stats)
+        assert stats["requests"] == 2
+        assert stats["errors"] == 0
+        assert 0 < stats["render_ms"]["p50"] <= stats["latency_ms"]["max"]
+
+
+def test_render_errors():
+    with _running_server() as server:
+        for url, body, status in [
+            ("/render", "{", 400),
+            # Not a workflow description, file names are not drawn
+            ("/render", json.dumps(__file__), 400),
+            ("/render", "[]", 400),
+            ("/render?layout=circle", json.dumps(WORKFLOW), 400),
+            ("/render", json.dumps({"nodes": [{"id": "a"}], "links": [{}]}), 422),
+            ("/unknown", "{}", 404),
+        ]:
+            response, content = _request(_connect(server), "POST", url, body)
+            assert response.status == status
+            assert json.loads(content)["error"]
+
+        response, stats = _request(_connect(server), "GET", "/stats")
+        assert json.loads(stats)["errors"] == 5
+
+
+def test_concurrent_requests():
+    with _running_server() as server:
+
+        def render(_):
+            return _request(_connect(server), "POST", "/", json.dumps(WORKFLOW))
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(render, range(8)))
+
+        assert {response.status for response, _ in results} == {200}
+        assert len({svg for _, svg in results}) == 1
+        assert server.stats.requests == 8
+
+
+def test_unix_socket(tmp_path):
+    path = str(tmp_path / "ewoksdraw.sock")
+    with _running_server(socket_path=path) as server:
+        response, svg = _request(_connect(server), "POST", "/", json.dumps(WORKFLOW))
+        assert response.status == 200
+        assert svg.startswith(b"<?xml")
+
+
+def test_unix_socket_path_not_a_socket(tmp_path):
+    path = tmp_path / "ewoksdraw.sock"
+    path.write_text("not a socket")
+    with pytest.raises(FileExistsError):
+        create_server(socket_path=str(path), jobs=1, quiet=True)
+    assert path.read_text() == "not a socket"
+
+    # A socket left by a previous server is replaced, and removed on close
+    path.unlink()
+    previous = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    previous.bind(str(path))
+    previous.close()
+    with _running_server(socket_path=str(path)) as server:
+        response, _ = _request(_connect(server), "POST", "/", json.dumps(WORKFLOW))
+        assert response.status == 200
+    assert not path.exists()
+
+
+def test_render_document_rejects_file_names():
+    with pytest.raises(TypeError):
+        render_document(__file__)
+
+
+def test_parse_render_options():
+    assert parse_render_options("format=pdf&links=none&precision=2&minify") == {
+        "output_format": "pdf",
+        "links": None,
+        "precision": 2,
+        "minify": True,
+    }
+    with pytest.raises(ValueError):
+        parse_render_options("scale=2")
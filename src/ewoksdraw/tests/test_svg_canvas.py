@@ -0,0 +1,249 @@
+import copy
+import gzip
+from io import StringIO
+from xml.etree import ElementTree
+
+import xmltodict
+
+from ewoksdraw.geometry import BoundingBox
+from ewoksdraw.profiling import profile
+from ewoksdraw.svg import SvgBackground, SvgCanvas, SvgTask
+from ewoksdraw.svg.svg_canvas import pretty_print_xml
+
+
+def _create_canvas() -> SvgCanvas:
+    canvas = SvgCanvas(width=200, height=100)
+    canvas.add_element(SvgBackground(200, 100))
+    task = SvgTask("task & <name>", ["a", 'b "quoted"'], ["c"])
+    task.translate(x=10, y=20)
+    canvas.add_element(task)
+    return canvas
+
+
+def test_draw(tmp_path):
+    canvas = _create_canvas()
+    filename = tmp_path / "test.svg"
+    canvas.draw(filename)
+
+    content = filename.read_text(encoding="utf-8")
+    assert content == pretty_print_xml(canvas.xml)
+    assert "<style><![CDATA[" in content
+    assert ">b &quot;quoted&quot;</text>" in content
+
+    root = ElementTree.fromstring(content.split("\n", 1)[1])
+    assert root.find("{http://www.w3.org/2000/svg}g") is not None
+
+
+def test_write_compact():
+    canvas = _create_canvas()
+    stream = StringIO()
+    canvas.write(stream, indent=None)
+
+    content = stream.getvalue()
+    assert "\n  <" not in content
+    root = ElementTree.fromstring(content.split("?>", 1)[1])
+    assert len(root) == len(canvas.xml)
+
+
+def _expand_uses(root: ElementTree.Element) -> ElementTree.Element:
+    """
+    Replaces the <use> references by groups with a copy of their definition, and
+    removes the <defs> section.
+    """
+    namespace = "{http://www.w3.org/2000/svg}"
+    defs = root.find(f"{namespace}defs")
+    root.remove(defs)
+    definitions = {element.get("id"): element for element in defs}
+
+    def expand(parent: ElementTree.Element) -> None:
+        for position, child in enumerate(parent):
+            if child.tag == f"{namespace}use":
+                definition = copy.deepcopy(definitions[child.get("href")[1:]])
+                del definition.attrib["id"]
+                if child.get("transform"):
+                    definition.set("transform", child.get("transform"))
+                parent[position] = child = definition
+            expand(child)
+
+    expand(root)
+    return root
+
+
+def test_write_use_defs():
+    canvas = SvgCanvas(width=400, height=200)
+    canvas.add_element(SvgBackground(400, 200))
+    for x in (0, 120, 240):
+        task = SvgTask("task", ["a", "b"], ["c"])
+        task.translate(x=x, y=20)
+        canvas.add_element(task)
+    canvas.add_element(SvgTask("other", ["a"], []))
+
+    stream = StringIO()
+    canvas.write(stream, indent=None, use_defs=True)
+    content = stream.getvalue()
+    root = ElementTree.fromstring(content.split("?>", 1)[1])
+
+    uses = root.findall("{http://www.w3.org/2000/svg}use")
+    # SVG 2 references, and xlink ones for SVG 1.1 renderers
+    for use in uses:
+        assert use.get("{http://www.w3.org/1999/xlink}href") == use.get("href")
+    assert [use.get("transform") for use in uses] == [
+        "translate(0,20)",
+        "translate(120,20)",
+        "translate(240,20)",
+    ]
+    # The anchors of all the tasks share one circle
+    assert content.count("<circle") == 1
+    assert len(content) < 0.6 * len(canvas._get_svg_string(indent=None))
+
+    expected = ElementTree.fromstring(canvas._get_svg_string(indent=None)[22:])
+    assert ElementTree.tostring(_expand_uses(root)) == ElementTree.tostring(expected)
+
+
+def test_write_minified():
+    canvas = _create_canvas()
+    canvas.elements[1].translate(x=0.123456, y=0.5)
+    stream = StringIO()
+    canvas.write(stream, precision=2, minify=True)
+
+    content = stream.getvalue()
+    assert content.startswith("<svg ")
+    assert "\n" not in content
+    assert 'text-anchor="start"' not in content
+    assert 'transform="translate(10.12,20.5)"' in content
+    assert 'class="task_title"' not in content
+    assert content.count("<style>") == 1
+    assert len(content) < 0.7 * len(canvas._get_svg_string(indent=None))
+
+    root = ElementTree.fromstring(content)
+    style = root.find("{http://www.w3.org/2000/svg}style").text
+    title = root.find(".//{http://www.w3.org/2000/svg}text")
+    assert f".{title.get('class')}{{font-family:Helvetica,sans-serif;" in style
+    assert title.text == "task & <name>"
+
+
+def test_draw_svgz(tmp_path):
+    canvas = _create_canvas()
+    filename = tmp_path / "test.svgz"
+    canvas.draw(filename, minify=True)
+    content = gzip.decompress(filename.read_bytes()).decode("utf-8")
+
+    assert content == canvas._get_svg_string(minify=True)
+    canvas.draw(tmp_path / "same.svgz", minify=True)
+    assert (tmp_path / "same.svgz").read_bytes() == filename.read_bytes()
+
+
+def test_iter_svg():
+    canvas = _create_canvas()
+    for _ in range(3):
+        canvas.add_element(SvgTask("task", ["a"], ["b"]))
+
+    chunks = list(canvas.iter_svg(chunk_size=10, minify=True))
+    # The styles, one chunk per top-level element and the end of the document
+    assert len(chunks) == len(canvas.elements) + 2
+    assert chunks[-1] == "</svg>"
+    assert "".join(chunks) == canvas._get_svg_string(minify=True)
+    # From the cached document
+    assert "".join(canvas.iter_svg(chunk_size=100, minify=True)) == "".join(chunks)
+    assert len(list(canvas.iter_svg())) == 1
+
+
+def test_dict():
+    canvas = _create_canvas()
+    svg_dict = canvas.dict
+
+    assert svg_dict == xmltodict.parse(canvas._get_svg_string())
+    assert canvas.dict is svg_dict
+
+
+def test_render_cache_shared(tmp_path):
+    canvas = _create_canvas()
+    with profile() as profiler:
+        canvas.draw(tmp_path / "first.svg")
+        canvas.draw(tmp_path / "second.svg")
+        assert canvas.dict == xmltodict.parse(canvas._get_svg_string())
+        canvas.xml
+
+    timers = profiler.timers
+    # The files are written from the same document, the dictionary is built
+    # from the XML element
+    assert timers["serialize.svg"].calls == 1
+    assert timers["serialize.xml"].calls == 1
+    assert timers["serialize.dict"].calls == 1
+    assert (tmp_path / "first.svg").read_text() == (tmp_path / "second.svg").read_text()
+
+
+def test_render_cache_invalidated_on_change():
+    canvas = _create_canvas()
+    svg_dict = canvas.dict
+    svg_string = canvas._get_svg_string()
+
+    task = canvas.elements[1]
+    task.translate(x=5)
+
+    assert canvas.dict is not svg_dict
+    assert canvas._get_svg_string() != svg_string
+    assert canvas.dict == xmltodict.parse(canvas._get_svg_string())
+
+
+def _create_wide_canvas() -> SvgCanvas:
+    canvas = SvgCanvas(width=1000, height=100)
+    canvas.add_element(SvgBackground(1000, 100))
+    for i in range(4):
+        task = SvgTask(f"task{i}", ["a"], ["b"])
+        task.translate(x=10 + 250 * i, y=20)
+        canvas.add_element(task)
+    return canvas
+
+
+def _task_titles(content: str) -> list:
+    root = ElementTree.fromstring(content.split("?>", 1)[1])
+    return [
+        text.text
+        for text in root.iter("{http://www.w3.org/2000/svg}text")
+        if text.get("class") == "task_title"
+    ]
+
+
+def test_write_viewport():
+    canvas = _create_wide_canvas()
+    stream = StringIO()
+    canvas.write_viewport(stream, BoundingBox(250, 0, 500, 100), scale=2)
+
+    content = stream.getvalue()
+    assert 'width="500" height="200" viewBox="250 0 250 100"' in content
+    assert _task_titles(content) == ["task1"]
+    assert 'class="background"' in content
+
+
+def test_draw_tiles(tmp_path):
+    canvas = _create_wide_canvas()
+    filenames = canvas.draw_tiles(tmp_path, 500, 100)
+
+    assert [filename.name for filename in filenames] == ["tile_0_0.svg", "tile_0_1.svg"]
+    titles = [_task_titles(filename.read_text()) for filename in filenames]
+    assert titles == [["task0", "task1"], ["task2", "task3"]]
+
+
+def test_viewport_level_of_detail():
+    canvas = _create_wide_canvas()
+    viewport = BoundingBox(0, 0, 1000, 100)
+
+    def io_labels(**options) -> int:
+        stream = StringIO()
+        canvas.write_viewport(stream, viewport, **options)
+        return stream.getvalue().count('class="task_text_io"')
+
+    assert io_labels(scale=1) == 8
+    assert io_labels(scale=0.25) == 0
+    assert io_labels(scale=0.25, level_of_detail=False) == 8
+
+
+def test_elements_at_after_move():
+    canvas = _create_wide_canvas()
+    task = canvas.elements[1]
+    assert canvas.elements_at(20, 30) == [task, canvas.elements[0]]
+
+    task.set_translation(x=610, y=20)
+    assert canvas.elements_at(20, 30) == [canvas.elements[0]]
+    assert canvas.elements_at(620, 30)[0] is task
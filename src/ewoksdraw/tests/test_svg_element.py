@@ -0,0 +1,43 @@
+import pytest
+
+from ewoksdraw.svg import SvgTask, SvgTaskAnchorLink, SvgTaskBox, SvgText
+
+
+@pytest.mark.parametrize(
+    "element",
+    [
+        SvgTaskBox(x=0, y=0),
+        SvgTaskAnchorLink(cx=0, cy=0, radius=2),
+        SvgText("text", x=0, y=0, css_class="task_text_io"),
+        SvgTask("task", ["a"], ["b"]),
+    ],
+    ids=["box", "anchor", "text", "task"],
+)
+def test_no_instance_dict(element):
+    assert not hasattr(element, "__dict__")
+
+
+def test_numeric_attributes():
+    box = SvgTaskBox(x=0, y=1.5)
+    box.set_width(20.25)
+
+    assert box.get_attr("y") == "1.5"
+    assert box.get_number("width") == 20.25
+    assert box.width == 20.25
+    assert box.attributes == {
+        "x": "0",
+        "y": "1.5",
+        "width": "20.25",
+        "class": "task_box",
+    }
+
+
+def test_shared_attributes():
+    anchor1 = SvgTaskAnchorLink(cx=0, cy=0, radius=2)
+    anchor2 = SvgTaskAnchorLink(cx=0, cy=0, radius=2)
+    assert anchor1._attr is anchor2._attr
+    assert anchor1.style is anchor2.style
+
+    anchor1.set_position(x=5)
+    assert anchor1.get_attr("cx") == "5"
+    assert anchor2.get_attr("cx") == "0"
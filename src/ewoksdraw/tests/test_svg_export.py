@@ -0,0 +1,143 @@
+import io
+import json
+import re
+import zlib
+
+import pytest
+
+from ewoksdraw.main import main
+from ewoksdraw.render import render_workflow
+from ewoksdraw.svg import SvgBackground, SvgCanvas, SvgTask
+from ewoksdraw.svg import svg_export
+from ewoksdraw.svg.svg_export import parse_color, parse_path_data
+
+WORKFLOW = {
+    "graph": {"id": "export"},
+    "nodes": [
+        {"id": "task1", "default_inputs": [{"name": "a", "value": 1}]},
+        {"id": "task2"},
+    ],
+    "links": [
+        {
+            "source": "task1",
+            "target": "task2",
+            "data_mapping": [{"source_output": "result", "target_input": "b"}],
+        }
+    ],
+}
+
+
+def test_parse_color():
+    assert parse_color("#000000") == (0, 0, 0, 1)
+    assert parse_color("#fff") == (1, 1, 1, 1)
+    assert parse_color("rgb(255, 0, 0)") == (1, 0, 0, 1)
+    assert parse_color("rgba(0, 0, 255, 0.5)") == (0, 0, 1, 0.5)
+    assert parse_color("#00000000") is None
+    assert parse_color("none") is None
+    with pytest.raises(ValueError):
+        parse_color("hsl(0, 0%, 0%)")
+
+
+def test_parse_path_data():
+    assert parse_path_data("M0,0 L10,0 10,5") == [
+        ("M", (0, 0)),
+        ("L", (10, 0)),
+        ("L", (10, 5)),
+    ]
+    # Quadratic curves become cubic curves with the same end points
+    _, (_, _, _, _, x, y) = parse_path_data("M0,0 Q3,0 3,3")[1]
+    assert (x, y) == (3, 3)
+    with pytest.raises(ValueError):
+        parse_path_data("M0,0 A1,1 0 0 1 2,2")
+
+
+def test_incomplete_painter():
+    class Painter(svg_export._Painter):
+        def rect(self, x, y, width, height, radius, paint):
+            pass
+
+    # Fails when created, not when drawing the first text
+    with pytest.raises(TypeError, match="abstract"):
+        Painter(100, 100)
+
+
+def test_write_pdf():
+    canvas = render_workflow(WORKFLOW, links="spline")
+    stream = io.BytesIO()
+    canvas.write_pdf(stream)
+
+    pdf = stream.getvalue()
+    assert pdf.startswith(b"%PDF-")
+    assert f"/MediaBox [ 0 0 {canvas.width} {canvas.height} ]".encode() in pdf
+    assert b"/BaseFont /Helvetica " in pdf
+
+    # The cross-reference table gives the position of each object
+    xref = int(re.search(rb"startxref\n(\d+)\n%%EOF\n$", pdf).group(1))
+    header, _, free, *entries = pdf[xref:].split(b"\n")[:-6]
+    assert (header, free) == (b"xref", b"0000000000 65535 f ")
+    for number, entry in enumerate(entries, 1):
+        assert pdf[int(entry[:10]) :].startswith(f"{number} 0 obj".encode())
+
+    match = re.search(rb"/Length (\d+) /Filter /FlateDecode >>\nstream\n", pdf)
+    compressed = pdf[match.end() : match.end() + int(match.group(1))]
+    content = zlib.decompress(compressed)
+    assert b"(task1) Tj" in content
+
+
+def test_write_pdf_spooled(monkeypatch):
+    canvas = render_workflow(WORKFLOW)
+    expected = io.BytesIO()
+    canvas.write_pdf(expected)
+
+    # The page content is written to a temporary file
+    monkeypatch.setattr(svg_export, "PDF_SPOOL_SIZE", 1)
+    stream = io.BytesIO()
+    canvas.write_pdf(stream)
+    assert stream.getvalue() == expected.getvalue()
+
+
+def test_write_png():
+    Image = pytest.importorskip("PIL.Image")
+    canvas = SvgCanvas(width=120, height=80)
+    canvas.add_element(SvgBackground(120, 80))
+    task = SvgTask(task_name="task", input_names=["a"], output_names=["b"])
+    task.translate(10, 10)
+    canvas.add_element(task)
+
+    stream = io.BytesIO()
+    canvas.write_png(stream, scale=2, strip_height=16)
+    stream.seek(0)
+    image = Image.open(stream)
+    image.load()
+
+    assert image.size == (240, 160)
+    assert image.mode == "RGBA"
+    # Background, then the white border of the task box
+    assert image.getpixel((2, 2)) == (0, 0, 0, 255)
+    assert image.getpixel((20, 40))[:3] == (255, 255, 255)
+
+
+def test_png_strips_match_whole_image():
+    Image = pytest.importorskip("PIL.Image")
+    canvas = render_workflow(WORKFLOW)
+
+    images = []
+    for strip_height in (7, 10000):
+        stream = io.BytesIO()
+        canvas.write_png(stream, strip_height=strip_height)
+        stream.seek(0)
+        images.append(Image.open(stream).tobytes())
+    assert images[0] == images[1]
+
+
+@pytest.mark.parametrize("suffix", [".pdf", ".png"])
+def test_main_export(tmp_path, suffix):
+    if suffix == ".png":
+        pytest.importorskip("PIL")
+    workflow_file = tmp_path / "workflow.json"
+    workflow_file.write_text(json.dumps(WORKFLOW))
+    output = tmp_path / f"workflow{suffix}"
+
+    assert main([str(output), "--workflow", str(workflow_file)]) == 0
+    header = output.read_bytes()[:8]
+    assert header.startswith(b"%PDF-" if suffix == ".pdf" else b"\x89PNG")
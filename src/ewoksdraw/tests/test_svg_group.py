@@ -0,0 +1,73 @@
+from ewoksdraw.geometry import BoundingBox
+from ewoksdraw.svg import SvgCanvas, SvgElement, SvgGroup, SvgTask, SvgText
+
+
+def _rect(x, y, width, height):
+    attr = {"x": str(x), "y": str(y), "width": str(width), "height": str(height)}
+    return SvgElement(tag="rect", attr=attr)
+
+
+def test_translation():
+    group = SvgGroup()
+    assert group.attributes == {}
+
+    group.translate(x=10)
+    group.translate(y=5)
+    assert group.translation == (10, 5)
+    assert group.attributes == {"transform": "translate(10,5)"}
+
+    group.set_translation(x=1.5, y=2)
+    assert group.translation == (1.5, 2)
+    assert group.attributes == {"transform": "translate(1.5,2)"}
+
+
+def test_absolute_position_and_bbox():
+    canvas = SvgCanvas(100, 100)
+    outer, inner = SvgGroup(), SvgGroup()
+    rect = _rect(1, 2, 10, 20)
+    inner.add_elements([rect])
+    outer.add_elements([inner])
+    canvas.add_element(outer)
+    outer.set_translation(100, 200)
+    inner.set_translation(10, 20)
+
+    assert inner.absolute_position == (110, 220)
+    assert rect.absolute_position == (111, 222)
+    assert rect.bbox == BoundingBox(1, 2, 11, 22)
+    assert rect.absolute_bbox == BoundingBox(111, 222, 121, 242)
+    assert inner.bbox == BoundingBox(11, 22, 21, 42)
+    assert outer.absolute_bbox == BoundingBox(111, 222, 121, 242)
+
+    # Moving a container moves the cached absolute positions of its content
+    outer.translate(x=-100)
+    assert rect.absolute_position == (11, 222)
+
+    # Changing an element updates the cached boxes of its containers
+    rect.set_attr("width", "50")
+    assert outer.bbox == BoundingBox(11, 222, 61, 242)
+
+    assert canvas.elements_at(30, 230) == [outer]
+    assert canvas.elements_at(0, 0) == []
+
+
+def test_text_bbox():
+    text = SvgText("abc", x=10, y=20, css_class="task_text_io")
+    width = text.width
+    assert text.bbox == BoundingBox(10, 17, 10 + width, 23)
+
+    text.set_text_anchor("end")
+    assert text.bbox == BoundingBox(10 - width, 17, 10, 23)
+
+
+def test_task_anchor_positions():
+    task = SvgTask("task", ["in"], ["out"])
+    task.set_translation(50, 60)
+
+    x, y = task.input_anchor_position("in")
+    assert x == 50
+    assert 60 < y < 60 + task.height
+    assert task.output_anchor_position("out")[0] == 50 + task.width
+    assert task.box.absolute_bbox == BoundingBox.from_size(
+        50, 60, task.width, task.height
+    )
+    assert task.absolute_bbox.contains(x, y)
@@ -0,0 +1,23 @@
+from ewoksdraw.svg import SvgCanvas, SvgTask
+from ewoksdraw.svg.svg_style import get_css_style
+
+
+def test_css_style_is_shared(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    style = get_css_style("task_title")
+
+    assert style is not None
+    assert style is get_css_style("task_title")
+    assert style.font_family == "Helvetica"
+    assert style.font_families == ("Helvetica", "sans-serif")
+    assert style.declarations["fill"] == "rgb(255, 255, 255)"
+    assert get_css_style("not_a_css_class") is None
+
+
+def test_canvas_styles_deduplicated_by_class():
+    canvas = SvgCanvas(width=100, height=100)
+    for _ in range(3):
+        canvas.add_element(SvgTask("task", ["a", "b"], ["c"]))
+
+    styles = canvas.xml.findall("style")
+    assert len(styles) == 5
@@ -0,0 +1,79 @@
+from io import StringIO
+
+import pytest
+
+from ewoksdraw.svg import SvgCanvas, SvgTask
+from ewoksdraw.svg.svg_writer import SvgWriter
+from ewoksdraw.svg.task_layout_cache import get_task_layout_cache
+
+LONG_NAME = "a_very_long_name_that_does_not_fit_in_the_task_box_" * 3
+
+
+def _serialize(node) -> str:
+    stream = StringIO()
+    SvgWriter(stream).write_node(node)
+    return stream.getvalue()
+
+
+@pytest.mark.parametrize(
+    "title,inputs,outputs",
+    [
+        ("renamed", ["a", "b"], ["result"]),
+        (LONG_NAME, ["a"], []),
+        ("task", [LONG_NAME, "b"], ["result"]),
+        ("task", ["a"], [LONG_NAME, "c", "d"]),
+        ("t", [], []),
+    ],
+)
+def test_task_edit(title, inputs, outputs):
+    task = SvgTask("task", [LONG_NAME, "x"], ["result"])
+    task.set_title(title)
+    task.set_input_names(inputs)
+    task.set_output_names(outputs)
+
+    assert (task.title, task.input_names, task.output_names) == (
+        title,
+        inputs,
+        outputs,
+    )
+    assert _serialize(task) == _serialize(SvgTask(title, inputs, outputs))
+
+
+def test_incremental_canvas():
+    canvas = SvgCanvas(500, 500, incremental=True)
+    tasks = [SvgTask(f"task{i}", ["a"], ["b"]) for i in range(3)]
+    for i, task in enumerate(tasks):
+        task.set_translation(x=10, y=100 * i)
+        canvas.add_element(task)
+    canvas.write(StringIO())
+    fragments = [task._fragment for task in tasks]
+
+    tasks[1].set_input_names(["a", "renamed"])
+    stream = StringIO()
+    canvas.write(stream)
+
+    assert tasks[0]._fragment is fragments[0]
+    assert tasks[2]._fragment is fragments[2]
+    assert tasks[1]._fragment is not fragments[1]
+
+    reference = SvgCanvas(500, 500)
+    for task in tasks:
+        reference.add_element(task)
+    assert stream.getvalue() == reference._get_svg_string()
+    assert "renamed" in stream.getvalue()
+
+
+def test_task_layout_cache():
+    cache = get_task_layout_cache()
+    cache.clear()
+
+    task = SvgTask(LONG_NAME, ["a", LONG_NAME], ["b"])
+    assert cache.cache_info().misses == 1
+    same_task = SvgTask(LONG_NAME, ["a", LONG_NAME], ["b"])
+    assert cache.cache_info().hits == 1
+
+    assert _serialize(same_task) == _serialize(task)
+    assert same_task._title.text is task._title.text
+
+    cache.clear()
+    assert _serialize(SvgTask(LONG_NAME, ["a", LONG_NAME], ["b"])) == _serialize(task)
@@ -0,0 +1,47 @@
+import pytest
+
+from ewoksdraw.svg import SvgTaskTitle, SvgText
+from ewoksdraw.svg.svg_task_io import SvgTaskIOGroup
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "short",
+        "a_very_long_task_name_that_does_not_fit_in_the_task_box_at_all",
+        "words  with   spaces and … ellipsis " * 4,
+    ],
+)
+@pytest.mark.parametrize("target_width", [30, 60, 120])
+def test_truncation_matches_one_by_one(text, target_width):
+    reference = SvgText(text, x=0, y=0, css_class="task_title")
+    while reference.width > target_width:
+        reference.truncate_text_by_one()
+
+    svg_text = SvgText(text, x=0, y=0, css_class="task_title")
+    svg_text.truncate_text_to_fit_width(target_width)
+
+    assert svg_text.text == reference.text
+
+
+def test_title_fit_font_size_then_truncate():
+    title = SvgTaskTitle("task_" * 5, x=0, y=0)
+    title.modify_text_to_fit_width(100)
+    assert title.font_size == 8
+    assert title.text == "task_" * 5
+
+    title = SvgTaskTitle("task_" * 40, x=0, y=0)
+    title.modify_text_to_fit_width(60)
+    assert title.font_size == 7
+    assert title.text.endswith("…")
+    assert title.width <= 60
+
+
+def test_io_group_fit():
+    group = SvgTaskIOGroup(["a", "input_" * 30], io_type="input")
+    group.decrease_size_to_fit_width(100)
+
+    assert group.font_size == 5
+    assert group.width <= 100
+    assert group.elements[0].txt.text == "a"
+    assert group.elements[1].txt.text.endswith("…")
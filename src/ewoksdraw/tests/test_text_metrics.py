@@ -0,0 +1,26 @@
+import pytest
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from ewoksdraw.svg.text_metrics import TextMetrics
+
+
+@pytest.mark.parametrize("text", ["", "task_name", "a & <b>…", "éàü€"])
+@pytest.mark.parametrize("font_size", [5, 7.0, 8.5])
+def test_text_width_matches_reportlab(text, font_size):
+    metrics = TextMetrics()
+    assert metrics.text_width(text, "Helvetica", font_size) == stringWidth(
+        text, "Helvetica", font_size
+    )
+
+
+def test_text_width_cached():
+    metrics = TextMetrics()
+    metrics.text_width("input_name", "Helvetica", 8)
+    metrics.text_width("input_name", "Helvetica", 6)
+
+    info = metrics.cache_info()
+    assert info.misses == 1
+    assert info.hits == 1
+    assert metrics.prefix_units("ab", "Helvetica")[-1] == metrics.text_units(
+        "ab", "Helvetica"
+    )
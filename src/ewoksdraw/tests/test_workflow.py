@@ -0,0 +1,113 @@
+import gzip
+import json
+import subprocess
+from io import StringIO
+
+import pytest
+
+from ewoksdraw.render import draw_workflow, render_workflow, write_workflow
+from ewoksdraw.svg import SvgTask
+from ewoksdraw.workflow import load_workflow
+
+WORKFLOW = {
+    "graph": {"id": "test"},
+    "nodes": [
+        {
+            "id": "task1",
+            "task_type": "class",
+            "task_identifier": "tasks.SumTask",
+            "default_inputs": [{"name": "a", "value": 1}],
+        },
+        {"id": "task2", "label": "Sum again", "task_type": "class"},
+    ],
+    "links": [
+        {
+            "source": "task1",
+            "target": "task2",
+            "data_mapping": [
+                {"source_output": "result", "target_input": "a"},
+                {"source_output": "result", "target_input": "b"},
+            ],
+        }
+    ],
+}
+
+
+def test_load_workflow():
+    workflow = load_workflow(WORKFLOW)
+
+    assert list(workflow.nodes) == ["task1", "task2"]
+    task1 = workflow.nodes["task1"]
+    assert task1.label == "task1"
+    assert task1.input_names == ["a"]
+    assert task1.output_names == ["result"]
+    task2 = workflow.nodes["task2"]
+    assert task2.label == "Sum again"
+    assert task2.input_names == ["a", "b"]
+    assert task2.output_names == []
+
+
+def test_load_workflow_unknown_node():
+    graph = {"nodes": [{"id": "task1"}], "links": [{"source": "task1", "target": "x"}]}
+    with pytest.raises(ValueError):
+        load_workflow(graph)
+
+
+def test_load_workflow_yaml(tmp_path):
+    yaml = pytest.importorskip("yaml")
+    filename = tmp_path / "workflow.yml"
+    filename.write_text(yaml.safe_dump(WORKFLOW))
+
+    assert list(load_workflow(filename).nodes) == ["task1", "task2"]
+
+
+def test_render_workflow():
+    canvas = render_workflow(WORKFLOW)
+
+    tasks = [element for element in canvas.elements if isinstance(element, SvgTask)]
+    assert len(tasks) == 2
+    assert canvas.width >= sum(task.width for task in tasks)
+
+
+@pytest.mark.parametrize("layout", ["layered", "grid"])
+@pytest.mark.parametrize("links", ["orthogonal", "spline", None])
+def test_write_workflow(layout, links):
+    stream = StringIO()
+    write_workflow(WORKFLOW, stream, layout=layout, links=links, minify=True)
+
+    canvas = render_workflow(WORKFLOW, layout=layout, links=links)
+    assert stream.getvalue() == canvas._get_svg_string(minify=True)
+
+
+def test_write_empty_workflow():
+    stream = StringIO()
+    write_workflow({"graph": {"id": "empty"}, "nodes": [], "links": []}, stream)
+
+    assert stream.getvalue() == render_workflow({"nodes": []})._get_svg_string()
+
+
+def test_draw_workflow(tmp_path):
+    draw_workflow(WORKFLOW, tmp_path / "workflow.svgz", precision=1)
+
+    content = gzip.decompress((tmp_path / "workflow.svgz").read_bytes())
+    expected = render_workflow(WORKFLOW)._get_svg_string(precision=1)
+    assert content.decode("utf-8") == expected
+    with pytest.raises(ValueError):
+        draw_workflow(WORKFLOW, tmp_path / "workflow.pdf")
+
+
+def test_cli_workflow(tmp_path):
+    workflow_path = tmp_path / "workflow.json"
+    workflow_path.write_text(json.dumps(WORKFLOW))
+    output_path = tmp_path / "workflow.svg"
+    subprocess.run(("ewoksdraw", str(output_path), "--workflow", str(workflow_path)))
+
+    assert "Sum again" in output_path.read_text(encoding="utf-8")
+
+    streamed_path = tmp_path / "streamed.svg"
+    subprocess.run(
+        ("ewoksdraw", str(streamed_path), "--workflow", str(workflow_path), "--stream")
+    )
+    assert streamed_path.read_text(encoding="utf-8") == output_path.read_text(
+        encoding="utf-8"
+    )
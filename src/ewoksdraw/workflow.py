@@ -0,0 +1,154 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+
+class WorkflowNode:
+    """
+    Represents a node of an Ewoks workflow with the input and output names to
+    draw.
+
+    :param node_id: The node identifier, unique in the workflow.
+    :param label: The displayed name of the node.
+    :param task_identifier: The Ewoks task identifier of the node, if any.
+    """
+
+    def __init__(self, node_id: str, label: str, task_identifier: Optional[str] = None):
+        self.id = node_id
+        self.label = label
+        self.task_identifier = task_identifier
+        self._input_names: Dict[str, None] = {}
+        self._output_names: Dict[str, None] = {}
+
+    @property
+    def input_names(self) -> List[str]:
+        """
+        Returns the input names of the node, in order of first appearance.
+        """
+        return list(self._input_names)
+
+    @property
+    def output_names(self) -> List[str]:
+        """
+        Returns the output names of the node, in order of first appearance.
+        """
+        return list(self._output_names)
+
+    def add_input(self, name: str) -> None:
+        self._input_names[name] = None
+
+    def add_output(self, name: str) -> None:
+        self._output_names[name] = None
+
+
+class WorkflowLink:
+    """
+    Represents a link between two nodes of an Ewoks workflow.
+
+    :param source: The identifier of the source node.
+    :param target: The identifier of the target node.
+    :param data_mapping: The (source output, target input) name pairs.
+    """
+
+    def __init__(
+        self, source: str, target: str, data_mapping: Iterable[Tuple[str, str]] = ()
+    ):
+        self.source = source
+        self.target = target
+        self.data_mapping = list(data_mapping)
+
+
+class Workflow:
+    """
+    Represents the nodes and links of an Ewoks workflow.
+
+    :param workflow_id: The identifier of the workflow.
+    :param nodes: The nodes of the workflow.
+    :param links: The links between the nodes.
+    """
+
+    def __init__(
+        self,
+        workflow_id: str,
+        nodes: Iterable[WorkflowNode],
+        links: Iterable[WorkflowLink],
+    ):
+        self.id = workflow_id
+        self.nodes: Dict[str, WorkflowNode] = {node.id: node for node in nodes}
+        self.links = list(links)
+
+    @classmethod
+    def from_dict(cls, graph: Mapping[str, Any]) -> "Workflow":
+        """
+        Creates a workflow from an Ewoks workflow description.
+
+        The input names of a node are its default inputs and the target inputs of
+        its incoming data mappings. The output names are the source outputs of its
+        outgoing data mappings. Runs in linear time in the number of nodes and
+        data mappings.
+
+        :param graph: The Ewoks workflow description, with "graph", "nodes" and
+                      "links" keys.
+        """
+        graph_attrs = graph.get("graph") or {}
+        workflow_id = str(graph_attrs.get("id", ""))
+
+        nodes: Dict[str, WorkflowNode] = {}
+        for node_attrs in graph.get("nodes") or []:
+            node_id = str(node_attrs["id"])
+            if node_id in nodes:
+                raise ValueError(f"Duplicate node '{node_id}' in workflow")
+            node = WorkflowNode(
+                node_id,
+                label=str(node_attrs.get("label") or node_id),
+                task_identifier=node_attrs.get("task_identifier"),
+            )
+            for default_input in node_attrs.get("default_inputs") or []:
+                node.add_input(str(default_input["name"]))
+            nodes[node_id] = node
+
+        links: List[WorkflowLink] = []
+        for link_attrs in graph.get("links") or []:
+            source = str(link_attrs["source"])
+            target = str(link_attrs["target"])
+            for node_id in (source, target):
+                if node_id not in nodes:
+                    raise ValueError(f"Link refers to unknown node '{node_id}'")
+
+            data_mapping = [
+                (str(item["source_output"]), str(item["target_input"]))
+                for item in link_attrs.get("data_mapping") or []
+            ]
+            for source_output, target_input in data_mapping:
+                nodes[source].add_output(source_output)
+                nodes[target].add_input(target_input)
+            links.append(WorkflowLink(source, target, data_mapping))
+
+        return cls(workflow_id, nodes.values(), links)
+
+
+def load_workflow(source: Union[str, Path, Mapping[str, Any]]) -> Workflow:
+    """
+    Loads an Ewoks workflow from a JSON or YAML file, or from a workflow
+    description dictionary.
+
+    :param source: The file name or the workflow description.
+    """
+    if isinstance(source, Mapping):
+        return Workflow.from_dict(source)
+
+    filename = Path(source)
+    with open(filename, "r", encoding="utf-8") as file:
+        if filename.suffix.lower() in (".yml", ".yaml"):
+            try:
+                import yaml
+            except ImportError as e:
+                raise ImportError(
+                    "Loading YAML workflows requires 'pyyaml', install "
+                    "'ewoksdraw[yaml]'"
+                ) from e
+            graph = yaml.safe_load(file)
+        else:
+            graph = json.load(file)
+
+    return Workflow.from_dict(graph)